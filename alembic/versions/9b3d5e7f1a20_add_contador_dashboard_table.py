@@ -0,0 +1,33 @@
+"""Add contador_dashboard table
+
+Revision ID: 9b3d5e7f1a20
+Revises: 4a1e33009369
+Create Date: 2026-10-18 11:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3d5e7f1a20'
+down_revision: Union[str, Sequence[str], None] = '4a1e33009369'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('contador_dashboard',
+    sa.Column('metrica', sa.String(length=64), nullable=False),
+    sa.Column('periodo', sa.String(length=10), nullable=False),
+    sa.Column('valor', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('metrica', 'periodo')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('contador_dashboard')
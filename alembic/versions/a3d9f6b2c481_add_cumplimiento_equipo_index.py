@@ -0,0 +1,56 @@
+"""Add cumplimiento_equipo compliance index
+
+Revision ID: a3d9f6b2c481
+Revises: f1a7c3e9b254
+Create Date: 2026-10-18 18:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9f6b2c481'
+down_revision: Union[str, Sequence[str], None] = 'f1a7c3e9b254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_calibracion_equipo_fecha', 'calibracion_calificacion_equipo',
+                    ['equipo_instrumento_id', 'fecha'], unique=False)
+    op.create_table('cumplimiento_equipo',
+    sa.Column('equipo_instrumento_id', sa.Integer(), nullable=False),
+    sa.Column('calibracion_calificacion_equipo_id', sa.Integer(), nullable=False),
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('vence', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['calibracion_calificacion_equipo_id'], ['calibracion_calificacion_equipo.calibracion_calificacion_equipo_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['equipo_instrumento_id'], ['equipo_instrumento.equipo_instrumento_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('equipo_instrumento_id')
+    )
+    op.create_index('idx_cumplimiento_equipo_vence', 'cumplimiento_equipo', ['vence'], unique=False)
+
+    # Backfill: última calibración (por fecha) de cada equipo
+    op.execute(
+        """
+        INSERT INTO cumplimiento_equipo (equipo_instrumento_id, calibracion_calificacion_equipo_id, fecha, vence)
+        SELECT equipo_instrumento_id, calibracion_calificacion_equipo_id, fecha, vence
+        FROM (
+            SELECT equipo_instrumento_id, calibracion_calificacion_equipo_id, fecha, vence,
+                   ROW_NUMBER() OVER (PARTITION BY equipo_instrumento_id
+                                      ORDER BY fecha DESC, calibracion_calificacion_equipo_id) AS orden
+            FROM calibracion_calificacion_equipo
+        ) ultimas
+        WHERE orden = 1
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_cumplimiento_equipo_vence', table_name='cumplimiento_equipo')
+    op.drop_table('cumplimiento_equipo')
+    op.drop_index('idx_calibracion_equipo_fecha', table_name='calibracion_calificacion_equipo')
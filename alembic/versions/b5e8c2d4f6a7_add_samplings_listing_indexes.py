@@ -0,0 +1,45 @@
+"""Add samplings listing indexes and status counters
+
+Revision ID: b5e8c2d4f6a7
+Revises: a3d9f6b2c481
+Create Date: 2026-10-18 19:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e8c2d4f6a7'
+down_revision: Union[str, Sequence[str], None] = 'a3d9f6b2c481'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Filtros del listado + orden de keyset (start_datetime DESC, id DESC)
+INDEXES = [
+    ('idx_samplings_status_start', ['status', 'start_datetime', 'id']),
+    ('idx_samplings_inspector_start', ['inspector_id', 'start_datetime', 'id']),
+    ('idx_samplings_start', ['start_datetime', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, columns in INDEXES:
+        op.create_index(name, 'samplings', columns, unique=False)
+
+    # Backfill de los contadores por estado que mantiene el router de inspección
+    op.execute(
+        "INSERT INTO contador_dashboard (metrica, periodo, valor) "
+        "SELECT 'samplings_estado:' || status, 'total', COUNT(*) FROM samplings GROUP BY status"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM contador_dashboard WHERE metrica LIKE 'samplings_estado:%'")
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='samplings')
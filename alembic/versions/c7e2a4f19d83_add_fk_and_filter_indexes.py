@@ -0,0 +1,71 @@
+"""Add indexes on FK and filter columns
+
+Revision ID: c7e2a4f19d83
+Revises: 9b3d5e7f1a20
+Create Date: 2026-10-18 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a4f19d83'
+down_revision: Union[str, Sequence[str], None] = '9b3d5e7f1a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (índice, tabla, columnas). Los compuestos terminan en la PK para servir
+# también el ORDER BY (fk, pk) de los reportes sin ordenar en memoria.
+INDEXES = [
+    ('idx_usuario_nombre', 'usuario', ['nombre']),
+    ('idx_usuario_rol_usuario', 'usuario_rol', ['usuario_id']),
+    ('idx_usuario_laboratorio_usuario', 'usuario_laboratorio', ['usuario_id']),
+    ('idx_solicitud_muestreo_fecha', 'solicitud_muestreo', ['fecha']),
+    ('idx_solicitud_muestreo_equipo_solicitud', 'solicitud_muestreo_equipo', ['solicitud_muestreo_id']),
+    ('idx_muestreo_solicitud', 'muestreo', ['solicitud_muestreo_id']),
+    ('idx_muestra_muestreo', 'muestra', ['muestreo_id', 'muestra_id']),
+    ('idx_envio_muestra_muestra', 'envio_muestra', ['muestra_id', 'envio_muestra_id']),
+    ('idx_recepcion_envio', 'recepcion', ['envio_muestra_id', 'recepcion_id']),
+    ('idx_analisis_muestra', 'analisis', ['muestra_id', 'analisis_id']),
+    ('idx_analisis_estado', 'analisis', ['estado_analisis_id']),
+    ('idx_uso_equipo_analisis_analisis', 'uso_equipo_analisis', ['analisis_id']),
+    ('idx_historial_estado_analisis_analisis', 'historial_estado_analisis', ['analisis_id']),
+    ('idx_incubacion_analisis', 'incubacion', ['analisis_id', 'incubacion_id']),
+    ('idx_resultado_analisis', 'resultado', ['analisis_id', 'resultado_id']),
+    ('idx_samplings_status', 'samplings', ['status']),
+    ('idx_samplings_batch_status', 'samplings', ['batch_id', 'status']),
+    ('idx_audit_logs_fecha', 'audit_logs', ['fecha']),
+    ('idx_audit_logs_tabla_registro', 'audit_logs', ['tabla_nombre', 'registro_id']),
+]
+
+
+def _existing_indexes():
+    """{tabla: nombres de índices}. audit_logs puede no existir todavía: la crea
+    ``create_all`` o la migración e4b8d2c6a915 (ya con sus índices)."""
+    if context.is_offline_mode():
+        return {table: set() for _, table, _ in INDEXES if table != 'audit_logs'}
+    inspector = sa.inspect(op.get_bind())
+    return {
+        table: {ix['name'] for ix in inspector.get_indexes(table)}
+        for table in inspector.get_table_names()
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = _existing_indexes()
+    for name, table, columns in INDEXES:
+        if table in existing and name not in existing[table]:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    existing = _existing_indexes()
+    for name, table, _ in reversed(INDEXES):
+        if name in existing.get(table, ()):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,102 @@
+"""Add tables missing from migrations
+
+Revision ID: e4b8d2c6a915
+Revises: c7e2a4f19d83
+Create Date: 2026-10-18 15:10:00.000000
+
+Tablas y columnas que solo creaba ``create_all`` al arrancar la app. Con
+ellas una base nueva (p. ej. PostgreSQL) queda completa con
+``alembic upgrade head``. En las bases existentes se omite lo que ya está.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8d2c6a915'
+down_revision: Union[str, Sequence[str], None] = 'c7e2a4f19d83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existing():
+    """{tabla: columnas} actuales; en modo offline (script SQL) la base es nueva."""
+    if context.is_offline_mode():
+        return {'samplings': set()}
+    inspector = sa.inspect(op.get_bind())
+    return {
+        table: {column['name'] for column in inspector.get_columns(table)}
+        for table in inspector.get_table_names()
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = _existing()
+
+    if 'audit_logs' not in existing:
+        op.create_table('audit_logs',
+        sa.Column('audit_log_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('tabla_nombre', sa.String(length=100), nullable=False),
+        sa.Column('registro_id', sa.Integer(), nullable=False),
+        sa.Column('operacion', sa.String(length=20), nullable=False),
+        sa.Column('valor_anterior', sa.JSON(), nullable=True),
+        sa.Column('valor_nuevo', sa.JSON(), nullable=True),
+        sa.Column('usuario_id', sa.Integer(), nullable=True),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('fecha', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuario.usuario_id'], ),
+        sa.PrimaryKeyConstraint('audit_log_id')
+        )
+        op.create_index('idx_audit_logs_fecha', 'audit_logs', ['fecha'], unique=False)
+        op.create_index('idx_audit_logs_tabla_registro', 'audit_logs', ['tabla_nombre', 'registro_id'], unique=False)
+
+    if 'documento' not in existing:
+        op.create_table('documento',
+        sa.Column('documento_id', sa.Integer(), nullable=False),
+        sa.Column('nombre', sa.String(length=255), nullable=False),
+        sa.Column('tipo_mime', sa.String(length=100), nullable=False),
+        sa.Column('tamano_bytes', sa.Integer(), nullable=False),
+        sa.Column('ruta_archivo', sa.String(length=500), nullable=False),
+        sa.Column('entidad_tipo', sa.String(length=50), nullable=False),
+        sa.Column('entidad_id', sa.Integer(), nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('fecha_subida', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuario.usuario_id'], ),
+        sa.PrimaryKeyConstraint('documento_id')
+        )
+        op.create_index('idx_documento_entidad', 'documento', ['entidad_tipo', 'entidad_id'], unique=False)
+        op.create_index('ix_documento_documento_id', 'documento', ['documento_id'], unique=False)
+
+    if 'uso_material_manufactura' not in existing:
+        op.create_table('uso_material_manufactura',
+        sa.Column('uso_material_manufactura_id', sa.Integer(), nullable=False),
+        sa.Column('manufactura_id', sa.Integer(), nullable=False),
+        sa.Column('stock_polvo_suplemento_id', sa.Integer(), nullable=False),
+        sa.Column('cantidad', sa.Float(), nullable=False),
+        sa.Column('unidad', sa.String(), nullable=False),
+        sa.Column('fecha_uso', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['manufactura_id'], ['manufactura.manufactura_id'], ),
+        sa.ForeignKeyConstraint(['stock_polvo_suplemento_id'], ['stock_polvo_suplemento.stock_polvo_suplemento_id'], ),
+        sa.PrimaryKeyConstraint('uso_material_manufactura_id')
+        )
+
+    if 'tyvek_wash_number' not in existing.get('samplings', set()):
+        with op.batch_alter_table('samplings', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('tyvek_wash_number', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('samplings', schema=None) as batch_op:
+        batch_op.drop_column('tyvek_wash_number')
+
+    op.drop_table('uso_material_manufactura')
+    op.drop_index('ix_documento_documento_id', table_name='documento')
+    op.drop_index('idx_documento_entidad', table_name='documento')
+    op.drop_table('documento')
+    op.drop_index('idx_audit_logs_tabla_registro', table_name='audit_logs')
+    op.drop_index('idx_audit_logs_fecha', table_name='audit_logs')
+    op.drop_table('audit_logs')
@@ -0,0 +1,32 @@
+"""Add sha256 (indexed) to documento
+
+Revision ID: f1a7c3e9b254
+Revises: e4b8d2c6a915
+Create Date: 2026-10-18 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7c3e9b254'
+down_revision: Union[str, Sequence[str], None] = 'e4b8d2c6a915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('documento', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sha256', sa.String(length=64), nullable=True))
+        batch_op.create_index('idx_documento_sha256', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('documento', schema=None) as batch_op:
+        batch_op.drop_index('idx_documento_sha256')
+        batch_op.drop_column('sha256')
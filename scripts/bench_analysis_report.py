@@ -0,0 +1,86 @@
+"""
+Benchmark de AnalysisService.get_analysis_report.
+
+Genera solicitudes sintéticas de distinto tamaño (muestras × análisis) en una
+base SQLite en memoria y reporta cantidad de consultas SQL y tiempo por
+reporte. La cantidad de consultas debe mantenerse constante.
+
+Uso:
+    python -m scripts.bench_analysis_report
+"""
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.backend.models.base import Base
+import src.backend.models  # noqa: F401  (registra todos los modelos)
+from src.backend.models.auth import Usuario
+from src.backend.models.fact import (SolicitudMuestreo, Muestreo, Muestra, EnvioMuestra, Recepcion,
+                                     Analisis, Incubacion, Resultado)
+from src.backend.api.dependencies import get_analysis_service
+
+SIZES = [(1, 1), (10, 5), (30, 5), (100, 5), (300, 5)]
+
+
+def seed_report_tree(db, n_muestras: int, n_analisis: int) -> int:
+    """Crea una solicitud con su árbol completo y retorna su ID."""
+    usuario = db.query(Usuario).first()
+    if not usuario:
+        usuario = Usuario(nombre="bench", password_hash="x", activo=True)
+        db.add(usuario)
+        db.flush()
+    ahora = datetime.now()
+    sol = SolicitudMuestreo(usuario_id=usuario.usuario_id, tipo="PRODUCTO", estado_solicitud_id=1)
+    db.add(sol)
+    db.flush()
+    muestreo = Muestreo(solicitud_muestreo_id=sol.solicitud_muestreo_id, operario_id=1)
+    db.add(muestreo)
+    db.flush()
+    for i in range(n_muestras):
+        m = Muestra(muestreo_id=muestreo.muestreo_id, tipo_muestra="Producto",
+                    codigo_etiqueta=f"S{sol.solicitud_muestreo_id}-M{i}")
+        db.add(m)
+        db.flush()
+        envio = EnvioMuestra(muestra_id=m.muestra_id, fecha=ahora, operario_id=1)
+        db.add(envio)
+        db.flush()
+        rec = Recepcion(envio_muestra_id=envio.envio_muestra_id, operario_id=1, decision="Aceptar")
+        db.add(rec)
+        db.flush()
+        for _ in range(n_analisis):
+            a = Analisis(muestra_id=m.muestra_id, recepcion_id=rec.recepcion_id, metodo_version_id=1,
+                         estado_analisis_id=1, operario_id=1, ultimo_cambio=ahora)
+            db.add(a)
+            db.flush()
+            db.add(Incubacion(analisis_id=a.analisis_id, equipo_instrumento_id=1, entrada=ahora))
+            db.add(Resultado(analisis_id=a.analisis_id, operario_id=1, valor="<1"))
+    db.commit()
+    return sol.solicitud_muestreo_id
+
+
+def main():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(1))
+
+    Session = sessionmaker(bind=engine)
+    service = get_analysis_service()
+    print(f"{'muestras':>8} {'analisis':>8} {'filas':>7} {'queries':>8} {'ms':>8}")
+    for n_muestras, n_analisis in SIZES:
+        with Session() as db:
+            sol_id = seed_report_tree(db, n_muestras, n_analisis)
+        with Session() as db:
+            queries.clear()
+            t0 = time.perf_counter()
+            report = service.get_analysis_report(db, sol_id)
+            elapsed = (time.perf_counter() - t0) * 1000
+            filas = sum(len(v) for v in report.values() if isinstance(v, list))
+            print(f"{n_muestras:>8} {n_analisis:>8} {filas:>7} {len(queries):>8} {elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
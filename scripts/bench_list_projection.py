@@ -0,0 +1,116 @@
+"""
+Benchmark de los listados por proyección (list_areas, list_equipos).
+
+Compara, sobre una base SQLite en memoria con datos sintéticos, la ruta
+anterior (instancias ORM + validación Pydantic ``from_attributes`` /
+``from_orm_extended``) con la ruta por proyección (dicts de columnas +
+ProjectionResponse). Ambos tiempos incluyen la serialización a JSON.
+
+Uso:
+    python -m scripts.bench_list_projection [areas] [equipos]
+"""
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import joinedload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.backend.models.base import Base
+import src.backend.models  # noqa: F401  (registra todos los modelos)
+from src.backend.models.dim import (Area, CalibracionCalificacionEquipo, EquipoInstrumento, EstadoEquipo,
+                                    TipoEquipo, ZonaArea, ZonaEquipo)
+from src.backend.api.dependencies import get_equipment_service
+from src.backend.api.responses import ProjectionResponse
+from src.backend.api.routers.locations import _AREA_COLUMNS, _with_zonas
+from src.backend.api.schemas.dim import AreaResponse, EquipoDetalleResponse
+from src.backend.repositories.dim import AreaRepository
+
+REPEATS = 5
+
+
+def seed(db, n_areas: int, n_equipos: int) -> None:
+    hoy = date.today()
+    db.add_all([TipoEquipo(tipo_equipo_id=1, nombre="Incubadora"), EstadoEquipo(estado_equipo_id=1, nombre="Operativo")])
+    db.execute(insert(Area), [{"area_id": i, "codigo": f"A{i}", "nombre": f"Área {i}", "planta_id": 1}
+                              for i in range(1, n_areas + 1)])
+    db.execute(insert(ZonaArea), [{"area_id": i, "nombre": f"Zona {z}"}
+                                  for i in range(1, n_areas + 1) for z in range(2)])
+    db.execute(insert(EquipoInstrumento), [
+        {"equipo_instrumento_id": i, "codigo": f"EQ{i}", "nombre": f"Equipo {i}", "tipo_equipo_id": 1,
+         "estado_equipo_id": 1, "area_id": 1 + i % n_areas}
+        for i in range(1, n_equipos + 1)
+    ])
+    db.execute(insert(ZonaEquipo), [{"equipo_instrumento_id": i, "nombre": f"Zona {z}"}
+                                    for i in range(1, n_equipos + 1) for z in range(2)])
+    db.execute(insert(CalibracionCalificacionEquipo), [
+        {"tipo": "CAL", "equipo_instrumento_id": i, "fecha": hoy - timedelta(days=365 * k),
+         "vence": hoy - timedelta(days=365 * k - 300), "operario_id": 1}
+        for i in range(1, n_equipos + 1) for k in range(3)
+    ])
+    db.commit()
+
+
+def areas_orm(db, limit: int) -> bytes:
+    adapter = TypeAdapter(List[AreaResponse])
+    return adapter.dump_json(adapter.validate_python(AreaRepository().get_all(db, limit=limit), from_attributes=True))
+
+
+def areas_projection(db, limit: int) -> bytes:
+    rows = AreaRepository().get_all_projection(db, _AREA_COLUMNS, limit=limit)
+    return ProjectionResponse(_with_zonas(db, rows)).body
+
+
+def equipos_orm(db, limit: int) -> bytes:
+    equipos = db.query(EquipoInstrumento).options(
+        joinedload(EquipoInstrumento.tipo_equipo),
+        joinedload(EquipoInstrumento.estado),
+        joinedload(EquipoInstrumento.area),
+        joinedload(EquipoInstrumento.calibraciones),
+        joinedload(EquipoInstrumento.zonas),
+    ).limit(limit).all()
+    return TypeAdapter(List[EquipoDetalleResponse]).dump_json(
+        [EquipoDetalleResponse.from_orm_extended(e) for e in equipos])
+
+
+def equipos_projection(db, limit: int) -> bytes:
+    return ProjectionResponse(get_equipment_service().get_equipment_rows(db, limit=limit)).body
+
+
+def measure(Session, fn, limit: int, queries: list):
+    times = []
+    for _ in range(REPEATS):
+        with Session() as db:
+            queries.clear()
+            t0 = time.perf_counter()
+            body = fn(db, limit)
+            times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times), len(queries), len(body)
+
+
+def main():
+    n_areas = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    n_equipos = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(1))
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        seed(db, n_areas, n_equipos)
+
+    print(f"{'listado':<10} {'ruta':<11} {'filas':>6} {'queries':>8} {'ms':>8} {'bytes':>9}")
+    for nombre, filas, orm, proyeccion in (("areas", n_areas, areas_orm, areas_projection),
+                                           ("equipos", n_equipos, equipos_orm, equipos_projection)):
+        for ruta, fn in (("orm", orm), ("proyección", proyeccion)):
+            ms, n_queries, size = measure(Session, fn, filas, queries)
+            print(f"{nombre:<10} {ruta:<11} {filas:>6} {n_queries:>8} {ms:>8.1f} {size:>9}")
+
+
+if __name__ == "__main__":
+    main()
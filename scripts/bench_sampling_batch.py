@@ -0,0 +1,111 @@
+"""
+Benchmark de la revisión y el envío por lote de muestreos (inspección).
+
+Compara, sobre una base SQLite en memoria con un lote sintético, la ruta
+anterior (cargar cada Sampling como instancia ORM, mutar el estado en
+Python y confirmar: un UPDATE por fila en el flush) con el UPDATE
+condicional único de SamplingRepository (``... WHERE status = ... RETURNING id``).
+Cada medición parte de un lote recién creado e incluye el commit.
+
+Uso:
+    python -m scripts.bench_sampling_batch [n_muestreos]
+"""
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, delete, event, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.backend.models.base import Base
+import src.backend.models  # noqa: F401  (registra todos los modelos)
+from src.backend.models.inspection import Sampling
+from src.backend.repositories.inspection import SamplingRepository
+
+REPEATS = 3
+
+
+def seed(db, n: int, status: str) -> tuple:
+    batch_id = str(uuid.uuid4())
+    ids = [str(uuid.uuid4()) for _ in range(n)]
+    inicio = datetime(2031, 1, 1, 8, 0)
+    db.execute(delete(Sampling))
+    db.execute(insert(Sampling), [
+        {"id": id, "batch_id": batch_id, "inspector_id": 1, "start_datetime": inicio, "end_datetime": inicio,
+         "destination": "Retén", "status": status, "sample_type": "Agua"}
+        for id in ids
+    ])
+    db.commit()
+    return batch_id, ids
+
+
+def review_orm(db, batch_id, ids) -> int:
+    samplings = db.query(Sampling).filter(Sampling.batch_id == batch_id, Sampling.status == "PENDING_REVIEW").all()
+    ahora = datetime.now(timezone.utc)
+    for sampling in samplings:
+        sampling.status = "PENDING_SUBMISSION"
+        sampling.reviewer_id = 1
+        sampling.review_timestamp = ahora
+    db.commit()
+    return len(samplings)
+
+
+def review_set(db, batch_id, ids) -> int:
+    revisados = SamplingRepository().review_batch(db, batch_id, 1, datetime.now(timezone.utc))
+    db.commit()
+    return len(revisados)
+
+
+def submit_orm(db, batch_id, ids) -> int:
+    samplings = db.query(Sampling).filter(Sampling.id.in_(ids)).all()
+    submission_id, ahora = str(uuid.uuid4()), datetime.now(timezone.utc)
+    for sampling in samplings:
+        sampling.status = "SUBMITTED"
+        sampling.submission_id = submission_id
+        sampling.submission_timestamp = ahora
+    db.commit()
+    return len(samplings)
+
+
+def submit_set(db, batch_id, ids) -> int:
+    enviados = SamplingRepository().submit(db, ids, str(uuid.uuid4()), datetime.now(timezone.utc))
+    db.commit()
+    return len(enviados)
+
+
+def measure(Session, fn, n: int, status: str, queries: list):
+    times = []
+    for _ in range(REPEATS):
+        with Session() as db:
+            batch_id, ids = seed(db, n, status)
+        with Session() as db:
+            queries.clear()
+            t0 = time.perf_counter()
+            count = fn(db, batch_id, ids)
+            times.append((time.perf_counter() - t0) * 1000)
+        assert count == n, (fn.__name__, count)
+    return statistics.median(times), len(queries)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(1))
+    Session = sessionmaker(bind=engine)
+
+    print(f"{'operación':<10} {'ruta':<10} {'filas':>6} {'queries':>8} {'ms':>9}")
+    for nombre, status, orm, conjunto in (("review", "PENDING_REVIEW", review_orm, review_set),
+                                          ("submit", "PENDING_SUBMISSION", submit_orm, submit_set)):
+        for ruta, fn in (("orm", orm), ("update", conjunto)):
+            ms, n_queries = measure(Session, fn, n, status, queries)
+            print(f"{nombre:<10} {ruta:<10} {n:>6} {n_queries:>8} {ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark de lectura/escritura concurrente sobre SQLite por perfil de motor.
+
+Simula varios workers de uvicorn (procesos) sobre la misma base: los
+escritores insertan solicitudes de a una con commit (como un POST) y los
+lectores listan las últimas solicitudes y cuentan análisis por estado
+(como los GET del dashboard). Compara ``DB_PROFILE=dev`` (sin ajustes) con
+``production`` (WAL + pragmas + pool de solo lectura) y reporta
+operaciones/seg y errores "database is locked".
+
+Uso:
+    python -m scripts.bench_sqlite_profile [segundos] [escritores] [lectores]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from src.backend.database.db_manager import DataBaseManager
+import src.backend.models  # noqa: F401  (registra todos los modelos)
+from src.backend.models.auth import Usuario
+from src.backend.models.fact import Analisis, SolicitudMuestreo
+
+PROFILES = ["dev", "production"]
+SEED_ROWS = 5000
+
+
+def _seed(manager: DataBaseManager) -> int:
+    manager.init_db()
+    db = manager.SessionLocal()
+    usuario = Usuario(nombre="bench", password_hash="x", activo=True)
+    db.add(usuario)
+    db.flush()
+    db.execute(SolicitudMuestreo.__table__.insert(), [
+        {"usuario_id": usuario.usuario_id, "tipo": "PRODUCTO", "estado_solicitud_id": 1}
+        for _ in range(SEED_ROWS)
+    ])
+    db.commit()
+    usuario_id = usuario.usuario_id
+    db.close()
+    return usuario_id
+
+
+def _worker(args):
+    profile, db_url, role, seconds, usuario_id = args
+    manager = DataBaseManager(db_url, profile=profile)
+    session_factory = manager.SessionLocal if role == "write" else manager.ReadSessionLocal
+    ops = locked = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        db = session_factory()
+        try:
+            if role == "write":
+                db.add(SolicitudMuestreo(usuario_id=usuario_id, tipo="PRODUCTO", estado_solicitud_id=1))
+                db.commit()
+            else:
+                db.execute(
+                    select(SolicitudMuestreo.solicitud_muestreo_id, SolicitudMuestreo.fecha)
+                    .order_by(SolicitudMuestreo.solicitud_muestreo_id.desc()).limit(50)
+                ).all()
+                db.execute(select(Analisis.estado_analisis_id, func.count()).group_by(Analisis.estado_analisis_id)).all()
+            ops += 1
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            db.rollback()
+            locked += 1
+        finally:
+            db.close()
+    manager.dispose()
+    return role, ops, locked
+
+
+def run_profile(profile: str, seconds: float, writers: int, readers: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        manager = DataBaseManager(db_url, profile=profile)
+        usuario_id = _seed(manager)
+        manager.dispose()
+
+        jobs = [(profile, db_url, "write", seconds, usuario_id)] * writers
+        jobs += [(profile, db_url, "read", seconds, usuario_id)] * readers
+        with multiprocessing.Pool(len(jobs)) as pool:
+            results = pool.map(_worker, jobs)
+
+    totals = {"write": [0, 0], "read": [0, 0]}
+    for role, ops, locked in results:
+        totals[role][0] += ops
+        totals[role][1] += locked
+    return totals
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    print(f"{seconds:.0f}s | {writers} escritores | {readers} lectores")
+    print(f"{'perfil':<12} {'escrituras/s':>13} {'lecturas/s':>11} {'locked':>7}")
+    for profile in PROFILES:
+        totals = run_profile(profile, seconds, writers, readers)
+        print(f"{profile:<12} {totals['write'][0] / seconds:>13.0f} {totals['read'][0] / seconds:>11.0f} "
+              f"{totals['write'][1] + totals['read'][1]:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+Elimina los blobs de documentos que ya no referencia ningún Documento.
+
+Respeta ``DOCUMENT_GC_GRACE_S``: un blob recién escrito o reutilizado no
+se borra aunque todavía no tenga fila (subida en curso). Programar
+periódicamente (cron):
+    python -m scripts.gc_documents
+"""
+from src.backend.database.db_manager import db_manager
+from src.backend.storage import collect_garbage, get_document_storage
+
+
+def gc():
+    db = db_manager.SessionLocal()
+    try:
+        removed = collect_garbage(db, get_document_storage())
+        print(f"Blobs eliminados: {removed}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    gc()
@@ -0,0 +1,124 @@
+"""
+Asesor de índices sobre las consultas reales del ORM.
+
+Corre la suite de tests (``tests/``) con un listener en ``Engine`` que
+ejecuta ``EXPLAIN QUERY PLAN`` sobre cada SELECT/UPDATE/DELETE con filtro
+o join y registra las tablas que SQLite recorre completas (``SCAN tabla``
+sin índice). Al terminar reporta por tabla la cantidad de consultas, las
+columnas filtradas (candidatas a índice) y un ejemplo de SQL.
+
+Uso:
+    python -m scripts.index_advisor [args extra de pytest]
+"""
+import re
+import sys
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_SCAN = re.compile(r"^SCAN (\w+)$")
+_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)\s+AS\s+(\w+)", re.IGNORECASE)
+_FILTER = re.compile(r"\b(?:WHERE|JOIN)\b", re.IGNORECASE)
+_COLUMN = re.compile(r"\b(\w+)\.(\w+)\s*(?:=|!=|<>|<=|>=|<|>|\bIN\b|\bIS\b|\bLIKE\b)", re.IGNORECASE)
+_COLUMN_RHS = re.compile(r"(?:=|<|>)\s*(\w+)\.(\w+)\b")
+# Recorridos esperados: catálogo de SQLite y subconsultas materializadas
+_IGNORED = re.compile(r"^(?:sqlite_\w+|anon_\d+|CONSTANT)$")
+
+
+def full_scans(plan_rows: Iterable[Sequence], aliases: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    Tablas recorridas completas según las filas de ``EXPLAIN QUERY PLAN``
+    (id, parent, notused, detail). ``SCAN t USING INDEX`` no cuenta: recorre
+    el índice en orden (p. ej. para un ORDER BY).
+    """
+    aliases = aliases or {}
+    tables = []
+    for row in plan_rows:
+        match = _SCAN.match(row[-1])
+        if match and not _IGNORED.match(match.group(1)):
+            tables.append(aliases.get(match.group(1), match.group(1)))
+    return tables
+
+
+def statement_aliases(statement: str) -> Dict[str, str]:
+    """{alias: tabla} de los ``FROM/JOIN tabla AS alias`` del statement."""
+    return {alias: table for table, alias in _ALIAS.findall(statement)}
+
+
+def filtered_columns(statement: str, table: str, aliases: Dict[str, str]) -> List[str]:
+    """Columnas de ``table`` comparadas en el statement (candidatas a índice)."""
+    names = {table} | {alias for alias, t in aliases.items() if t == table}
+    pairs = _COLUMN.findall(statement) + _COLUMN_RHS.findall(statement)
+    return sorted({column for owner, column in pairs if owner in names})
+
+
+class IndexAdvisor:
+    """Plugin de pytest: registra los SCAN completos de cada test."""
+
+    def __init__(self):
+        self.current_test = "<fuera de tests>"
+        self.statements = 0
+        self.scans: Dict[str, Counter] = defaultdict(Counter)
+        self.columns: Dict[str, Counter] = defaultdict(Counter)
+        self.examples: Dict[str, str] = {}
+        self.tests: Dict[str, set] = defaultdict(set)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or conn.dialect.name != "sqlite":
+            return
+        if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            return
+        if not _FILTER.search(statement):
+            return
+        try:
+            plan_cursor = cursor.connection.cursor()
+            plan_cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+            plan = plan_cursor.fetchall()
+            plan_cursor.close()
+        except Exception:
+            return
+        self.statements += 1
+        aliases = statement_aliases(statement)
+        for table in full_scans(plan, aliases):
+            self.scans[table][statement] += 1
+            self.columns[table].update(filtered_columns(statement, table, aliases))
+            self.examples.setdefault(table, " ".join(statement.split()))
+            self.tests[table].add(self.current_test)
+
+    def pytest_sessionstart(self, session):
+        event.listen(Engine, "before_cursor_execute", self._before_cursor_execute)
+
+    def pytest_runtest_setup(self, item):
+        self.current_test = item.nodeid
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        event.remove(Engine, "before_cursor_execute", self._before_cursor_execute)
+
+    def report(self) -> None:
+        print(f"\nConsultas con filtro analizadas: {self.statements}")
+        if not self.scans:
+            print("Sin recorridos completos de tabla.")
+            return
+        print(f"{'tabla':<28} {'consultas':>9} {'ejecuciones':>11} {'tests':>6}  columnas filtradas")
+        ordered = sorted(self.scans.items(), key=lambda kv: -sum(kv[1].values()))
+        for table, statements in ordered:
+            columns = ", ".join(f"{c} ({n})" for c, n in self.columns[table].most_common(4)) or "-"
+            print(f"{table:<28} {len(statements):>9} {sum(statements.values()):>11} "
+                  f"{len(self.tests[table]):>6}  {columns}")
+        print("\nEjemplos:")
+        for table, _ in ordered:
+            print(f"  {table}: {self.examples[table][:200]}")
+
+
+def main():
+    advisor = IndexAdvisor()
+    exit_code = pytest.main(["tests", "-q", "-p", "no:cacheprovider", *sys.argv[1:]], plugins=[advisor])
+    advisor.report()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
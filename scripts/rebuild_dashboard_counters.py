@@ -0,0 +1,22 @@
+"""
+Recalcula la tabla contador_dashboard desde las tablas de hechos.
+
+Ejecutar una vez al habilitar DASHBOARD_COUNTERS=true (o si se sospecha
+que los contadores divergieron):
+    python -m scripts.rebuild_dashboard_counters
+"""
+from src.backend.database.db_manager import db_manager
+from src.backend.repositories.dashboard import ContadorDashboardRepository
+
+
+def rebuild():
+    db = db_manager.SessionLocal()
+    try:
+        ContadorDashboardRepository().rebuild(db)
+        print("Contadores del dashboard reconstruidos.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild()
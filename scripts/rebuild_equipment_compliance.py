@@ -0,0 +1,22 @@
+"""
+Recalcula el índice cumplimiento_equipo desde las calibraciones.
+
+La migración que crea la tabla ya hace el backfill; ejecutar si se cargaron
+calibraciones sin pasar por EquipmentService.register_calibracion:
+    python -m scripts.rebuild_equipment_compliance
+"""
+from src.backend.database.db_manager import db_manager
+from src.backend.repositories.dim import CumplimientoEquipoRepository
+
+
+def rebuild():
+    db = db_manager.SessionLocal()
+    try:
+        CumplimientoEquipoRepository().rebuild(db)
+        print("Índice de cumplimiento de equipos reconstruido.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild()
@@ -1,12 +1,29 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.backend.api.routers import auth, equipment, locations, manufacturing, samples, analysis, inventory, dashboard, documents, exports, products, master, inspection
+from src.backend.api.routers import auth, equipment, locations, manufacturing, samples, analysis, inventory, dashboard, documents, exports, products, master, inspection, debug
 from src.backend.core.logging import setup_logging, get_logger
+from src.backend.core.audit_writer import get_audit_writer, shutdown_audit_writer
+from src.backend.core.uploads import UploadLimitMiddleware
+from src.backend.core.profiling import PROFILING_ENABLED, ProfilingMiddleware
+from src.backend.services.calibration_scheduler import start_calibration_scheduler, shutdown_calibration_scheduler
 
 logger = get_logger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Con AUDIT_MODE=async: recupera el journal de auditoría y arranca el writer
+    get_audit_writer()
+    # Con CALIBRATION_SCHEDULER=true: hilo que marca los equipos con la calibración vencida
+    start_calibration_scheduler()
+    yield
+    shutdown_calibration_scheduler()
+    shutdown_audit_writer()
+
+
 def create_app() -> FastAPI:
     """Factory function to create and configure the FastAPI application."""
     setup_logging()
@@ -19,12 +36,16 @@ def create_app() -> FastAPI:
         Permite la gestión de equipos, plantas, procesos de manufactura, muestreo y análisis técnico.
         """,
         version="0.1.0",
+        lifespan=lifespan,
         contact={
             "name": "Soporte Técnico LIMS",
             "email": "soporte@urufarma.com.uy",
         },
     )
 
+    # Rechaza subidas que exceden UPLOAD_MAX_BYTES antes de leer el cuerpo
+    app.add_middleware(UploadLimitMiddleware, paths=["/api/documentos/upload"])
+
     # CORS – permitir orígenes específicos para habilitar el envío de credenciales (JWT)
     app.add_middleware(
         CORSMiddleware,
@@ -32,8 +53,15 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Permite al frontend leer los tiempos de Server-Timing
+        expose_headers=["Server-Timing"],
     )
 
+    # Perfilado por request (Server-Timing, log de requests lentas, /api/_debug/profile).
+    # Se agrega último para ser el más externo y medir la request completa.
+    if PROFILING_ENABLED:
+        app.add_middleware(ProfilingMiddleware)
+
     # Routers
     app.include_router(auth.router, prefix="/api/auth", tags=["Seguridad & Autenticación"])
     app.include_router(master.router, prefix="/api/master", tags=["Maestros - Catálogos Generales"])
@@ -48,6 +76,7 @@ def create_app() -> FastAPI:
     app.include_router(documents.router, prefix="/api/documentos", tags=["Documentos y Adjuntos"])
     app.include_router(exports.router, prefix="/api/exports", tags=["Exportaciones CSV"])
     app.include_router(inspection.router, prefix="/api/inspection", tags=["Inspección y Muestreo (Módulo Inspector)"])
+    app.include_router(debug.router, prefix="/api/_debug", tags=["Debug"])
 
     # Global Exception Handlers
     from fastapi.exceptions import RequestValidationError
@@ -5,12 +5,15 @@ Provides database sessions, repositories, and service instances
 to route handlers via FastAPI's Depends() mechanism.
 """
 
-from typing import Generator
+from typing import TYPE_CHECKING, AsyncGenerator, Generator, Optional
 from sqlalchemy.orm import Session
-from fastapi import Depends
+from fastapi import Depends, Request
 
 from src.backend.database.db_manager import db_manager
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 # ─── Repositories ───────────────────────────────────────────────
 from src.backend.repositories.auth import (
     UsuarioRepository, RolRepository, UsuarioRolRepository,
@@ -20,7 +23,7 @@ from src.backend.repositories.audit import AuditLogRepository
 from src.backend.repositories.dim import (
     SistemaRepository, PlantaRepository, AreaRepository,
     TipoEquipoRepository, EstadoEquipoRepository, EquipoInstrumentoRepository,
-    ZonaEquipoRepository, CalibracionCalificacionEquipoRepository,
+    ZonaEquipoRepository, CalibracionCalificacionEquipoRepository, CumplimientoEquipoRepository,
     HistoricoEstadoEquipoRepository, PuntoMuestreoRepository,
 )
 from src.backend.repositories.master import (
@@ -43,6 +46,7 @@ from src.backend.repositories.inventory import (
     EstadoQCRepository, StockMediosRepository, AprobacionMediosRepository,
     UsoMediosRepository, UsoCepaRepository,
 )
+from src.backend.repositories.dashboard import ContadorDashboardRepository, DASHBOARD_COUNTERS_ENABLED
 
 # ─── Services ───────────────────────────────────────────────────
 from src.backend.services.auth_service import AuthService
@@ -55,9 +59,28 @@ from src.backend.services.inventory_service import InventoryService
 
 # ─── Database Session ──────────────────────────────────────────
 
-def get_db() -> Generator[Session, None, None]:
-    """Yield a database session per request."""
-    yield from db_manager.get_session()
+_READ_METHODS = {"GET", "HEAD"}
+
+
+def get_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Yield a database session per request. GET/HEAD requests use the
+    read-only pool (``DB_PROFILE=production``; otherwise the same engine).
+    """
+    if request.method in _READ_METHODS:
+        yield from db_manager.get_read_session()
+    else:
+        yield from db_manager.get_session()
+
+
+async def get_async_db() -> AsyncGenerator["AsyncSession", None]:
+    """
+    Yield an AsyncSession for read-heavy routes (requires asyncpg or
+    aiosqlite). Existing repositories run on it through ``run_sync``:
+    ``await db.run_sync(lambda s: repo.get_all(s))``.
+    """
+    async for db in db_manager.get_async_session():
+        yield db
 
 
 # ─── Service Factories ─────────────────────────────────────────
@@ -74,6 +97,8 @@ def get_equipment_service() -> EquipmentService:
         equipo_repo=EquipoInstrumentoRepository(),
         historico_repo=HistoricoEstadoEquipoRepository(),
         estado_repo=EstadoEquipoRepository(),
+        calibracion_repo=CalibracionCalificacionEquipoRepository(),
+        cumplimiento_repo=CumplimientoEquipoRepository(),
     )
 
 
@@ -88,6 +113,11 @@ def get_manufacturing_service() -> ManufacturingService:
     )
 
 
+def get_contador_repo() -> Optional[ContadorDashboardRepository]:
+    """Repositorio de contadores del dashboard, solo si están habilitados."""
+    return ContadorDashboardRepository() if DASHBOARD_COUNTERS_ENABLED else None
+
+
 def get_analysis_service() -> AnalysisService:
     from src.backend.repositories.inventory import UsoMediosRepository, UsoCepaRepository
     return AnalysisService(
@@ -99,6 +129,7 @@ def get_analysis_service() -> AnalysisService:
         especificacion_repo=EspecificacionRepository(),
         uso_medios_repo=UsoMediosRepository(),
         uso_cepa_repo=UsoCepaRepository(),
+        contador_repo=get_contador_repo(),
     )
 
 
@@ -111,6 +142,7 @@ def get_sample_service() -> SampleService:
         envio_repo=EnvioMuestraRepository(),
         recepcion_repo=RecepcionRepository(),
         analysis_service=get_analysis_service(),
+        contador_repo=get_contador_repo(),
     )
 
 
@@ -0,0 +1,36 @@
+"""
+Respuesta JSON para listados por proyección.
+
+Los listados que se arman como dicts de columnas (``get_all_projection``)
+se devuelven directamente con ``ProjectionResponse``: FastAPI no vuelve a
+validarlos contra el ``response_model`` (que queda solo para la
+documentación) y se serializan con ``json.dumps`` en lugar de
+``jsonable_encoder``, que recorre cada valor en Python.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+class ProjectionResponse(JSONResponse):
+    """JSONResponse para dicts/listas de tipos simples (fechas como ISO 8601)."""
+
+    def render(self, content: Any) -> bytes:
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+            default=_default,
+        ).encode("utf-8")
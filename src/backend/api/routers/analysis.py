@@ -1,5 +1,5 @@
 """Analysis router – analyses, incubations, results."""
-from typing import List
+from typing import List, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
@@ -9,9 +9,10 @@ from src.backend.api.schemas.fact import (
     AnalisisCreate, AnalisisBulkCreate, AnalisisResponse, AnalisisUpdate,
     CambioEstadoAnalisisRequest,
     IncubacionCreate, IncubacionResponse, IncubacionUpdate,
-    ResultadoCreate, ResultadoResponse,
+    ResultadoCreate, ResultadoBulkCreate, ResultadoBulkResponse, ResultadoResponse,
     UsoMediosCreate, UsoCepaCreate, ReporteConsolidadoResponse
 )
+from src.backend.api.schemas.pagination import CursorPage
 from src.backend.repositories.fact import AnalisisRepository
 from src.backend.services.analysis_service import AnalysisService
 from src.backend.api.security import get_current_user, require_role
@@ -46,9 +47,12 @@ def create_bulk_analisis(
     return service.create_bulk_analisis(db, body.model_dump())
 
 
-@router.get("/", response_model=List[AnalisisResponse])
-def list_analisis(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/", response_model=Union[List[AnalisisResponse], CursorPage[AnalisisResponse]])
+def list_analisis(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
     repo = AnalisisRepository()
+    if cursor is not None:
+        items, next_cursor = repo.get_page(db, cursor=cursor, limit=limit)
+        return {"items": items, "next_cursor": next_cursor}
     return repo.get_all(db, skip=skip, limit=limit)
 
 
@@ -67,12 +71,12 @@ def update_analisis(
     analisis_id: int,
     body: AnalisisUpdate,
     db: Session = Depends(get_db),
+    service: AnalysisService = Depends(get_analysis_service),
 ):
-    repo = AnalisisRepository()
-    analisis = repo.get(db, analisis_id)
-    if not analisis:
+    try:
+        return service.update_analisis(db, analisis_id, body.model_dump(exclude_unset=True))
+    except ValueError:
         raise HTTPException(status_code=404, detail="Análisis no encontrado")
-    return repo.update(db, analisis, body.model_dump(exclude_unset=True))
 
 
 @router.post("/{analisis_id}/estado", response_model=AnalisisResponse,
@@ -91,12 +95,15 @@ def change_analisis_state(
 
 @router.delete("/{analisis_id}", status_code=status.HTTP_204_NO_CONTENT,
                dependencies=[Depends(require_role(*_ESCRITURA))])
-def delete_analisis(analisis_id: int, db: Session = Depends(get_db)):
-    repo = AnalisisRepository()
-    analisis = repo.get(db, analisis_id)
-    if not analisis:
+def delete_analisis(
+    analisis_id: int,
+    db: Session = Depends(get_db),
+    service: AnalysisService = Depends(get_analysis_service),
+):
+    try:
+        service.delete_analisis(db, analisis_id)
+    except ValueError:
         raise HTTPException(status_code=404, detail="Análisis no encontrado")
-    repo.delete(db, analisis_id)
     return None
 
 
@@ -136,6 +143,20 @@ def register_resultado(
     return service.register_resultado(db, body.model_dump(), is_final=is_final)
 
 
+@router.post("/resultados/bulk", response_model=ResultadoBulkResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(require_role(*_OPERATIVOS))])
+def register_resultados_bulk(
+    body: ResultadoBulkCreate,
+    is_final: bool = False,
+    db: Session = Depends(get_db),
+    service: AnalysisService = Depends(get_analysis_service),
+):
+    """Registra el lote con un único commit; los ítems inválidos se informan en ``errores``."""
+    registrados, errores = service.register_resultados_bulk(
+        db, [r.model_dump() for r in body.resultados], is_final=is_final)
+    return {"registrados": registrados, "errores": errores}
+
+
 # ─── Recursos ────────────────────────────────────────────────
 
 @router.post("/uso-equipos", status_code=status.HTTP_201_CREATED,
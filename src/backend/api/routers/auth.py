@@ -1,5 +1,5 @@
 """Auth router – login, register, users, roles, operators."""
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -23,6 +23,7 @@ from src.backend.api.schemas.auth import (
     LoginRequest, TokenResponse, SignatureRequest,
     UserRolesSync, UserLaboratoriosSync
 )
+from src.backend.api.schemas.pagination import CursorPage
 from src.backend.models.auth import Usuario, UsuarioRol, Rol, Laboratorio, UsuarioLaboratorio
 from src.backend.repositories.auth import (
     UsuarioRepository, RolRepository, UsuarioRolRepository, OperarioRepository,
@@ -105,9 +106,12 @@ def create_usuario(
     return nuevo
 
 
-@router.get("/usuarios", response_model=List[UsuarioResponse])
-def list_usuarios(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/usuarios", response_model=Union[List[UsuarioResponse], CursorPage[UsuarioResponse]])
+def list_usuarios(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
     repo = UsuarioRepository()
+    if cursor is not None:
+        items, next_cursor = repo.get_page(db, cursor=cursor, limit=limit)
+        return {"items": items, "next_cursor": next_cursor}
     return repo.get_all(db, skip=skip, limit=limit)
 
 
@@ -182,9 +186,12 @@ def create_operario(body: OperarioCreate, db: Session = Depends(get_db)):
     return repo.create(db, body.model_dump())
 
 
-@router.get("/operarios", response_model=List[OperarioResponse])
-def list_operarios(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/operarios", response_model=Union[List[OperarioResponse], CursorPage[OperarioResponse]])
+def list_operarios(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
     repo = OperarioRepository()
+    if cursor is not None:
+        items, next_cursor = repo.get_page(db, cursor=cursor, limit=limit)
+        return {"items": items, "next_cursor": next_cursor}
     return repo.get_all(db, skip=skip, limit=limit)
 
 
@@ -199,9 +206,12 @@ def get_operario(operario_id: int, db: Session = Depends(get_db)):
 
 # ─── Audit Trail ─────────────────────────────────────────────
 
-@router.get("/audit-trail", response_model=List[AuditLogResponse])
-def list_audit_trail(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/audit-trail", response_model=Union[List[AuditLogResponse], CursorPage[AuditLogResponse]])
+def list_audit_trail(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
     repo = AuditLogRepository()
+    if cursor is not None:
+        items, next_cursor = repo.get_page(db, cursor=cursor, limit=limit)
+        return {"items": items, "next_cursor": next_cursor}
     return repo.get_all(db, skip=skip, limit=limit)
 
 
@@ -1,65 +1,95 @@
 """Dashboard router – aggregated stats for the main panel."""
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 import sqlalchemy as sa
 from sqlalchemy.orm import Session
 
 from src.backend.api.dependencies import get_db
 from src.backend.api.security import get_current_user
+from src.backend.core.response_cache import response_cache
 from src.backend.models.dim import EquipoInstrumento
 from src.backend.models.fact import Analisis, SolicitudMuestreo, EstadoAnalisis
+from src.backend.repositories.dashboard import (ContadorDashboardRepository, DASHBOARD_COUNTERS_ENABLED,
+                                                METRICA_SOLICITUDES, metrica_analisis_estado)
 
 router = APIRouter(dependencies=[Depends(get_current_user)])
 
 
+DIAS_GRAFICO = 7
+
+# Tablas cuyas escrituras invalidan la respuesta cacheada de /stats
+_STATS_TABLES = ("equipo_instrumento", "analisis", "estado_analisis", "solicitud_muestreo", "contador_dashboard")
+
+
+def _dia_range(desde: date, hasta: date):
+    """Rango semiabierto [desde 00:00, hasta+1 00:00) usable por un índice sobre fecha."""
+    return datetime.combine(desde, time.min), datetime.combine(hasta + timedelta(days=1), time.min)
+
+
 @router.get("/stats")
-def get_dashboard_stats(db: Session = Depends(get_db)):
+def get_dashboard_stats(request: Request, db: Session = Depends(get_db)):
     """
     Retorna conteos reales y datos para gráficos:
     - equipos_activos, analisis_pendientes, muestras_hoy (KPIs)
     - analisis_por_estado: [{estado, count}] para gráfico de barras
     - muestras_semana: [{fecha, count}] últimos 7 días para line chart
+
+    La respuesta se cachea (TTL + ETag/304) y se invalida al escribir en las
+    tablas de _STATS_TABLES.
     """
-    equipos_activos = db.query(sa.func.count(EquipoInstrumento.equipo_instrumento_id)).scalar() or 0
+    return response_cache.respond(request, "dashboard_stats", _STATS_TABLES, lambda: _compute_stats(db))
 
-    analisis_pendientes = db.query(sa.func.count(Analisis.analisis_id)).scalar() or 0
 
+def _compute_stats(db: Session) -> dict:
+    """
+    Con DASHBOARD_COUNTERS=true se lee la tabla contador_dashboard (costo
+    independiente del histórico); si no, se agrega con consultas agrupadas.
+    """
     hoy = date.today()
-    muestras_hoy = (
-        db.query(sa.func.count(SolicitudMuestreo.solicitud_muestreo_id))
-        .filter(sa.func.date(SolicitudMuestreo.fecha) == hoy)
-        .scalar()
-        or 0
-    )
-
-    # ─── Chart data: Análisis agrupados por estado ────────────
-    analisis_por_estado_rows = (
-        db.query(EstadoAnalisis.nombre, sa.func.count(Analisis.analisis_id))
-        .outerjoin(Analisis, Analisis.estado_analisis_id == EstadoAnalisis.estado_analisis_id)
-        .group_by(EstadoAnalisis.nombre)
-        .all()
-    )
-    analisis_por_estado = [
-        {"estado": row[0], "count": row[1]} for row in analisis_por_estado_rows
-    ]
+    dias = [hoy - timedelta(days=i) for i in range(DIAS_GRAFICO - 1, -1, -1)]
+    equipos_activos = db.query(sa.func.count(EquipoInstrumento.equipo_instrumento_id)).scalar() or 0
+    estados = db.query(EstadoAnalisis.estado_analisis_id, EstadoAnalisis.nombre).order_by(EstadoAnalisis.nombre).all()
 
-    # ─── Chart data: Muestras por día (últimos 7 días) ────────
-    muestras_semana = []
-    for i in range(6, -1, -1):
-        dia = hoy - timedelta(days=i)
-        count = (
-            db.query(sa.func.count(SolicitudMuestreo.solicitud_muestreo_id))
-            .filter(sa.func.date(SolicitudMuestreo.fecha) == dia)
-            .scalar()
-            or 0
+    if DASHBOARD_COUNTERS_ENABLED:
+        repo = ContadorDashboardRepository()
+        por_dia = repo.get_valores(db, METRICA_SOLICITUDES, [d.isoformat() for d in dias])
+        por_estado = repo.get_totales(db, metrica_analisis_estado(""))
+        analisis_por_estado_ids = {
+            estado_id: por_estado.get(metrica_analisis_estado(estado_id), 0) for estado_id, _ in estados
+        }
+        analisis_pendientes = sum(por_estado.values())
+    else:
+        # ─── Chart data: Muestras por día, un GROUP BY sobre un rango de fechas ──
+        desde, hasta = _dia_range(dias[0], hoy)
+        dia = sa.func.date(SolicitudMuestreo.fecha)
+        por_dia = {
+            str(fecha): count
+            for fecha, count in (
+                db.query(dia, sa.func.count(SolicitudMuestreo.solicitud_muestreo_id))
+                .filter(SolicitudMuestreo.fecha >= desde, SolicitudMuestreo.fecha < hasta)
+                .group_by(dia)
+                .all()
+            )
+        }
+
+        # ─── Chart data: Análisis agrupados por estado ────────────
+        analisis_por_estado_ids = dict(
+            db.query(Analisis.estado_analisis_id, sa.func.count(Analisis.analisis_id))
+            .group_by(Analisis.estado_analisis_id)
+            .all()
         )
-        muestras_semana.append({"fecha": dia.isoformat(), "count": count})
+        analisis_pendientes = sum(analisis_por_estado_ids.values())
+
+    analisis_por_estado = [
+        {"estado": nombre, "count": analisis_por_estado_ids.get(estado_id, 0)} for estado_id, nombre in estados
+    ]
+    muestras_semana = [{"fecha": d.isoformat(), "count": por_dia.get(d.isoformat(), 0)} for d in dias]
 
     return {
         "equipos_activos": equipos_activos,
         "analisis_pendientes": analisis_pendientes,
-        "muestras_hoy": muestras_hoy,
+        "muestras_hoy": muestras_semana[-1]["count"],
         "analisis_por_estado": analisis_por_estado,
         "muestras_semana": muestras_semana,
     }
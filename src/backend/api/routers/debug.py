@@ -0,0 +1,25 @@
+"""Debug router – perfiles de request recientes (solo administradores)."""
+from fastapi import APIRouter, Depends, Query
+
+from src.backend.api.security import require_role
+from src.backend.core.profiling import PROFILING_ENABLED, SLOW_REQUEST_MS, profile_history
+
+router = APIRouter(dependencies=[Depends(require_role("administrador"))])
+
+
+@router.get("/profile")
+def get_profile(
+    limit: int = Query(50, ge=1, le=1000),
+    slow_only: bool = False,
+):
+    """
+    Últimas requests perfiladas en este proceso (cantidad de consultas,
+    tiempo de BD, sentencias más lentas y repetidas) y el agregado por ruta,
+    ordenado por consultas promedio: las rutas con N+1 quedan arriba.
+    """
+    return {
+        "enabled": PROFILING_ENABLED,
+        "slow_request_ms": SLOW_REQUEST_MS,
+        "routes": profile_history.by_route(),
+        "requests": profile_history.recent(limit, slow_only=slow_only),
+    }
@@ -1,22 +1,19 @@
 import os
-import shutil
-import uuid
 from typing import List
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, status
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Request, status
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from src.backend.api.dependencies import get_db
 from src.backend.api.security import get_current_user, require_role
 from src.backend.models.auth import Usuario
 from src.backend.models.documents import Documento
 from src.backend.api.schemas.documents import DocumentoResponse
+from src.backend.storage import DocumentStorage, collect_blob, get_document_storage
 
 router = APIRouter()
 
-UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
 
 @router.post("/upload", response_model=DocumentoResponse, status_code=status.HTTP_201_CREATED)
 async def upload_documento(
@@ -25,71 +22,70 @@ async def upload_documento(
     entidad_id: int = Form(...),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user),
+    storage: DocumentStorage = Depends(get_document_storage),
 ):
-    """Sube un archivo y lo asocia a una entidad."""
+    """
+    Sube un archivo y lo asocia a una entidad. El contenido se guarda por
+    SHA-256: el mismo archivo adjunto a varias entidades se almacena una vez.
+    """
     
     # Validaciones básicas
     if not file.filename:
         raise HTTPException(status_code=400, detail="Archivo sin nombre.")
 
-    # Generar ruta única
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-    # Guardar archivo en disco
+    # Guardar por chunks (tamaño y SHA-256 calculados al vuelo; deduplicado por contenido)
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        storage_key, file_size, sha256 = await storage.save(file)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al guardar el archivo: {str(e)}")
-    
-    # Obtener tamaño
-    file_size = os.path.getsize(file_path)
 
     # Crear registro en BD
     nuevo_doc = Documento(
         nombre=file.filename,
         tipo_mime=file.content_type or "application/octet-stream",
         tamano_bytes=file_size,
-        ruta_archivo=file_path,
+        sha256=sha256,
+        ruta_archivo=storage_key,
         entidad_tipo=entidad_tipo,
         entidad_id=entidad_id,
         usuario_id=current_user.usuario_id,
     )
-    db.add(nuevo_doc)
-    db.commit()
-    db.refresh(nuevo_doc)
 
-    return nuevo_doc
+    def _persist():
+        db.add(nuevo_doc)
+        db.commit()
+        db.refresh(nuevo_doc)
 
+    await run_in_threadpool(_persist)
 
-@router.get("/{entidad_tipo}/{entidad_id}", response_model=List[DocumentoResponse])
-def get_documentos_by_entidad(
-    entidad_tipo: str,
-    entidad_id: int,
-    db: Session = Depends(get_db),
-    current_user: Usuario = Depends(get_current_user),
-):
-    """Devuelve los documentos asociados a una entidad."""
-    docs = db.query(Documento).filter(
-        Documento.entidad_tipo == entidad_tipo,
-        Documento.entidad_id == entidad_id
-    ).all()
-    return docs
+    return nuevo_doc
 
 
+# Declarada antes que /{entidad_tipo}/{entidad_id}, que de lo contrario la captura
 @router.get("/descargar/{documento_id}")
 def descargar_documento(
     documento_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user),
+    storage: DocumentStorage = Depends(get_document_storage),
 ):
-    """Permite descargar un archivo subido."""
+    """
+    Permite descargar un archivo subido. Soporta ``Range`` (206 Partial
+    Content) para reanudar descargas de adjuntos grandes.
+    """
     doc = db.query(Documento).filter(Documento.documento_id == documento_id).first()
     if not doc:
         raise HTTPException(status_code=404, detail="Documento no encontrado")
 
+    if doc.sha256:
+        if not storage.exists(doc.ruta_archivo):
+            raise HTTPException(status_code=404, detail="El archivo físico no existe en el servidor")
+        return storage.response(doc.ruta_archivo, doc.nombre, doc.tipo_mime, request.headers.get("range"))
+
+    # Documentos anteriores al almacenamiento por contenido: ruta en disco
     if not os.path.exists(doc.ruta_archivo):
         raise HTTPException(status_code=404, detail="El archivo físico no existe en el servidor")
 
@@ -100,18 +96,44 @@ def descargar_documento(
     )
 
 
+@router.get("/{entidad_tipo}/{entidad_id}", response_model=List[DocumentoResponse])
+def get_documentos_by_entidad(
+    entidad_tipo: str,
+    entidad_id: int,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user),
+):
+    """Devuelve los documentos asociados a una entidad."""
+    docs = db.query(Documento).filter(
+        Documento.entidad_tipo == entidad_tipo,
+        Documento.entidad_id == entidad_id
+    ).all()
+    return docs
+
+
 @router.delete("/{documento_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_documento(
     documento_id: int,
     db: Session = Depends(get_db),
-    current_user: Usuario = Depends(require_role(["administrador"])),
+    current_user: Usuario = Depends(require_role("administrador")),
+    storage: DocumentStorage = Depends(get_document_storage),
 ):
-    """Elimina un documento de la base de datos y su archivo físico."""
+    """
+    Elimina un documento de la base de datos. El blob se borra cuando
+    ningún otro documento lo referencia (ver ``storage.collect_blob``).
+    """
     doc = db.query(Documento).filter(Documento.documento_id == documento_id).first()
     if not doc:
         raise HTTPException(status_code=404, detail="Documento no encontrado")
 
-    # Borrar archivo físico si existe
+    sha256 = doc.sha256
+    if sha256:
+        db.delete(doc)
+        db.commit()
+        collect_blob(db, storage, sha256)
+        return None
+
+    # Borrar archivo físico si existe (documentos anteriores al almacenamiento por contenido)
     if os.path.exists(doc.ruta_archivo):
         try:
             os.remove(doc.ruta_archivo)
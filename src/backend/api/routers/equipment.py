@@ -1,22 +1,25 @@
 """Equipment router – CRUD, state changes, calibrations."""
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from src.backend.api.responses import ProjectionResponse
 from src.backend.api.dependencies import get_db, get_equipment_service
 from src.backend.api.schemas.dim import (
     EquipoInstrumentoCreate, EquipoInstrumentoUpdate, EquipoInstrumentoResponse,
     EquipoDetalleResponse,
     CambioEstadoEquipoRequest,
     ZonaEquipoCreate, ZonaEquipoUpdate, ZonaEquipoResponse,
-    CalibracionCreate, CalibracionResponse,
+    CalibracionCreate, CalibracionResponse, VencimientoEquipoResponse,
 )
+from src.backend.api.schemas.pagination import CursorPage
 from src.backend.repositories.dim import (
     EquipoInstrumentoRepository, ZonaEquipoRepository,
     CalibracionCalificacionEquipoRepository,
 )
 from src.backend.services.equipment_service import EquipmentService
+from src.backend.services.calibration_scheduler import calibration_scheduler
 from src.backend.api.security import get_current_user, require_role
 from src.backend.models.auth import Usuario
 
@@ -39,32 +42,46 @@ def create_equipo(
     return service.create_equipo(db, body.model_dump(), usuario_id=current_user.usuario_id)
 
 
-@router.get("/", response_model=List[EquipoDetalleResponse])
+@router.get("/", response_model=Union[List[EquipoDetalleResponse], CursorPage[EquipoDetalleResponse]])
 def list_equipos(
     skip: int = 0, 
     limit: int = 100, 
     area_id: Optional[int] = None,
     tipo_id: Optional[int] = None,
     estado_id: Optional[int] = None,
+    compliance: Optional[bool] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     service: EquipmentService = Depends(get_equipment_service)
 ):
-    equipos = service.get_equipment_with_details(db, skip, limit, area_id, tipo_id, estado_id)
-    return [EquipoDetalleResponse.from_orm_extended(e) for e in equipos]
+    # Proyección a dicts con la forma de EquipoDetalleResponse (sin instancias ORM ni re-validación)
+    if cursor is not None:
+        equipos, next_cursor = service.get_equipment_rows_page(db, cursor, limit, area_id, tipo_id, estado_id, compliance)
+        return ProjectionResponse({"items": equipos, "next_cursor": next_cursor})
+    equipos = service.get_equipment_rows(db, skip, limit, area_id, tipo_id, estado_id, compliance)
+    return ProjectionResponse(equipos)
+
+
+@router.get("/vencimientos", response_model=List[VencimientoEquipoResponse])
+def list_vencimientos(
+    dias: int = Query(30, ge=0, description="Ventana de días desde hoy"),
+    vencidos: bool = Query(False, description="Incluir las calibraciones ya vencidas"),
+    db: Session = Depends(get_db),
+):
+    # Desde la lista ordenada en memoria del scheduler (una consulta por invalidación)
+    return ProjectionResponse(calibration_scheduler.upcoming(db, dias, incluir_vencidos=vencidos))
 
 
 @router.get("/{equipo_id}", response_model=EquipoDetalleResponse)
-def get_equipo(equipo_id: int, db: Session = Depends(get_db)):
-    from sqlalchemy.orm import joinedload
-    repo = EquipoInstrumentoRepository()
-    equipo = repo.get(db, equipo_id, options=[
-        joinedload(repo.model.tipo_equipo),
-        joinedload(repo.model.estado),
-        joinedload(repo.model.area)
-    ])
+def get_equipo(
+    equipo_id: int,
+    db: Session = Depends(get_db),
+    service: EquipmentService = Depends(get_equipment_service),
+):
+    equipo = service.get_equipment_detail(db, equipo_id)
     if not equipo:
         raise HTTPException(status_code=404, detail="Equipo no encontrado")
-    return EquipoDetalleResponse.from_orm_extended(equipo)
+    return ProjectionResponse(equipo)
 
 
 @router.put("/{equipo_id}", response_model=EquipoInstrumentoResponse,
@@ -117,13 +134,15 @@ def create_zona(body: ZonaEquipoCreate, db: Session = Depends(get_db)):
 
 @router.post("/calibraciones", response_model=CalibracionResponse, status_code=status.HTTP_201_CREATED,
              dependencies=[Depends(require_role(*_ESCRITURA))])
-def create_calibracion(body: CalibracionCreate, db: Session = Depends(get_db)):
-    repo = CalibracionCalificacionEquipoRepository()
-    return repo.create(db, body.model_dump())
+def create_calibracion(
+    body: CalibracionCreate,
+    db: Session = Depends(get_db),
+    service: EquipmentService = Depends(get_equipment_service),
+    current_user: Usuario = Depends(get_current_user),
+):
+    return service.register_calibracion(db, body.model_dump(), usuario_id=current_user.usuario_id)
 
 
 @router.get("/{equipo_id}/calibraciones", response_model=List[CalibracionResponse])
 def list_calibraciones(equipo_id: int, db: Session = Depends(get_db)):
-    repo = CalibracionCalificacionEquipoRepository()
-    all_cals = repo.get_all(db, limit=1000)
-    return [c for c in all_cals if c.equipo_instrumento_id == equipo_id]
+    return CalibracionCalificacionEquipoRepository().get_by_equipo(db, equipo_id)
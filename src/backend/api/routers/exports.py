@@ -1,8 +1,10 @@
 import io
+import os
 import csv
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Iterable, Iterator
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.backend.api.dependencies import get_db
@@ -17,6 +19,16 @@ from src.backend.models.audit import AuditLog
 
 router = APIRouter()
 
+# Bytes de CSV acumulados antes de enviar un chunk al cliente
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", str(64 * 1024)))
+# Filas leídas por fetch del cursor (server-side en PostgreSQL)
+EXPORT_YIELD_PER = int(os.getenv("EXPORT_YIELD_PER", "1000"))
+
+
+def _stream_rows(db: Session, stmt) -> Iterator[Any]:
+    """Itera el resultado por lotes de EXPORT_YIELD_PER sin materializar la tabla."""
+    return db.execute(stmt.execution_options(yield_per=EXPORT_YIELD_PER))
+
 
 @router.get("/audit.csv")
 def export_audit_csv(
@@ -24,11 +36,13 @@ def export_audit_csv(
     current_user: Usuario = Depends(get_current_user),
 ):
     """Descarga el registro de auditoría (Audit Trail) en formato CSV."""
-    logs = db.query(AuditLog).order_by(AuditLog.fecha.desc()).all()
-    
-    data = []
-    for log in logs:
-        data.append({
+    stmt = select(
+        AuditLog.audit_log_id, AuditLog.tabla_nombre, AuditLog.registro_id, AuditLog.operacion,
+        AuditLog.usuario_id, AuditLog.fecha, AuditLog.valor_anterior, AuditLog.valor_nuevo,
+    ).order_by(AuditLog.fecha.desc())
+
+    data = (
+        {
             "ID Log": log.audit_log_id,
             "Tabla": log.tabla_nombre,
             "Registro ID": log.registro_id,
@@ -37,7 +51,9 @@ def export_audit_csv(
             "Fecha": log.fecha.strftime("%Y-%m-%d %H:%M:%S"),
             "Valor Anterior": str(log.valor_anterior)[:100] + "..." if log.valor_anterior else "",
             "Valor Nuevo": str(log.valor_nuevo)[:100] + "..." if log.valor_nuevo else ""
-        })
+        }
+        for log in _stream_rows(db, stmt)
+    )
 
     fieldnames = ["ID Log", "Tabla", "Registro ID", "Operacion", "Usuario ID", "Fecha", "Valor Anterior", "Valor Nuevo"]
     
@@ -48,23 +64,25 @@ def export_audit_csv(
     )
 
 
-def _generate_csv(data: List[Dict[str, Any]], fieldnames: List[str]) -> str:
-    """Helper generator to stream CSV rows."""
+def _generate_csv(data: Iterable[Dict[str, Any]], fieldnames: List[str],
+                  chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """Helper generator to stream CSV in chunks of ~``chunk_size`` bytes."""
     output = io.StringIO()
     writer = csv.DictWriter(output, fieldnames=fieldnames, delimiter=';')
-    
+
     # Write header
     writer.writeheader()
-    yield output.getvalue()
-    output.seek(0)
-    output.truncate(0)
 
     # Write data
     for row in data:
         writer.writerow(row)
+        if output.tell() >= chunk_size:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+
+    if output.tell():
         yield output.getvalue()
-        output.seek(0)
-        output.truncate(0)
 
 
 @router.get("/equipos.csv")
@@ -73,18 +91,22 @@ def export_equipos_csv(
     current_user: Usuario = Depends(get_current_user),
 ):
     """Descarga lista de equipos en formato CSV."""
-    equipos = db.query(EquipoInstrumento).all()
-    
-    data = []
-    for eq in equipos:
-        data.append({
+    stmt = select(
+        EquipoInstrumento.equipo_instrumento_id, EquipoInstrumento.codigo, EquipoInstrumento.nombre,
+        EquipoInstrumento.area_id, EquipoInstrumento.tipo_equipo_id, EquipoInstrumento.estado_equipo_id,
+    ).order_by(EquipoInstrumento.equipo_instrumento_id)
+
+    data = (
+        {
             "ID": eq.equipo_instrumento_id,
             "Codigo": eq.codigo,
             "Nombre": eq.nombre,
             "Area ID": eq.area_id,
             "Tipo ID": eq.tipo_equipo_id,
             "Estado ID": eq.estado_equipo_id
-        })
+        }
+        for eq in _stream_rows(db, stmt)
+    )
 
     fieldnames = ["ID", "Codigo", "Nombre", "Area ID", "Tipo ID", "Estado ID"]
     
@@ -101,17 +123,20 @@ def export_plantas_csv(
     current_user: Usuario = Depends(get_current_user),
 ):
     """Descarga lista de plantas en formato CSV."""
-    plantas = db.query(Planta).all()
-    
-    data = []
-    for pl in plantas:
-        data.append({
+    stmt = select(
+        Planta.planta_id, Planta.codigo, Planta.nombre, Planta.sistema_id, Planta.activo,
+    ).order_by(Planta.planta_id)
+
+    data = (
+        {
             "ID": pl.planta_id,
             "Codigo": pl.codigo,
             "Nombre": pl.nombre,
             "Sistema ID": pl.sistema_id,
             "Activo": "Sí" if pl.activo else "No"
-        })
+        }
+        for pl in _stream_rows(db, stmt)
+    )
 
     fieldnames = ["ID", "Codigo", "Nombre", "Sistema ID", "Activo"]
     
@@ -128,11 +153,14 @@ def export_ordenes_csv(
     current_user: Usuario = Depends(get_current_user),
 ):
     """Descarga lista de órdenes de manufactura en formato CSV."""
-    ordenes = db.query(OrdenManufactura).all()
-    
-    data = []
-    for ord in ordenes:
-        data.append({
+    stmt = select(
+        OrdenManufactura.orden_manufactura_id, OrdenManufactura.codigo, OrdenManufactura.lote,
+        OrdenManufactura.fecha, OrdenManufactura.producto_id, OrdenManufactura.cantidad,
+        OrdenManufactura.unidad, OrdenManufactura.operario_id,
+    ).order_by(OrdenManufactura.orden_manufactura_id)
+
+    data = (
+        {
             "ID": ord.orden_manufactura_id,
             "Codigo": ord.codigo,
             "Lote Salida": ord.lote,
@@ -141,7 +169,9 @@ def export_ordenes_csv(
             "Cantidad": ord.cantidad,
             "Unidad": ord.unidad,
             "Operario Asignado ID": ord.operario_id
-        })
+        }
+        for ord in _stream_rows(db, stmt)
+    )
 
     fieldnames = ["ID", "Codigo", "Lote Salida", "Fecha", "Producto ID", "Cantidad", "Unidad", "Operario Asignado ID"]
     
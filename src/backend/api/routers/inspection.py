@@ -1,17 +1,30 @@
 import uuid
 from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from sqlalchemy.orm import Session
+from typing import List, Optional, Union
 
 from src.backend.api.dependencies import get_db
 from src.backend.api.security import get_current_user, require_role, get_user_roles
-from src.backend.api.schemas.inspection import SamplingCreate, SamplingResponse, SamplingUpdate, SamplingBatchSubmit
+from src.backend.api.schemas.inspection import (SamplingCreate, SamplingResponse, SamplingUpdate, SamplingBatchSubmit,
+                                                SamplingSummary)
+from src.backend.api.schemas.pagination import CursorPage
+from src.backend.core.exceptions import ConcurrencyConflictException
 from src.backend.models.inspection import Sampling
 from src.backend.models.auth import Usuario
+from src.backend.repositories.dashboard import ContadorDashboardRepository, PERIODO_TOTAL, metrica_sampling_estado
+from src.backend.repositories.inspection import SamplingRepository
 
 router = APIRouter(prefix="/samplings", tags=["Inspection"])
 
+
+def _mover_contador(db: Session, desde: Optional[str], hacia: str, n: int = 1) -> None:
+    """Ajusta los contadores por estado (se confirman con la transacción del llamador)."""
+    repo = ContadorDashboardRepository()
+    if desde:
+        repo.incrementar(db, metrica_sampling_estado(desde), PERIODO_TOTAL, -n)
+    repo.incrementar(db, metrica_sampling_estado(hacia), PERIODO_TOTAL, n)
+
 @router.post("/", response_model=SamplingResponse, status_code=status.HTTP_201_CREATED)
 def create_sampling(
     sampling_in: SamplingCreate,
@@ -50,21 +63,47 @@ def create_sampling(
     )
     
     db.add(nuevo_muestreo)
+    _mover_contador(db, None, nuevo_muestreo.status)
     db.commit()
     db.refresh(nuevo_muestreo)
     return nuevo_muestreo
 
-@router.get("/", response_model=List[SamplingResponse])
+@router.get("/", response_model=Union[List[SamplingResponse], CursorPage[SamplingResponse]])
 def list_samplings(
     status_filter: Optional[str] = None,
+    batch_id: Optional[str] = None,
+    inspector_id: Optional[int] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """
+    Lista los muestreos, más recientes primero (start_datetime DESC).
+    Filtros: estado, lote (batch_id), inspector y rango [start_from, start_to).
+    Con ``cursor`` (vacío para la primera página) responde paginado por keyset.
+    """
+    repo = SamplingRepository()
+    filters = dict(status=status_filter, batch_id=batch_id, inspector_id=inspector_id,
+                   start_from=start_from, start_to=start_to)
+    if cursor is not None:
+        items, next_cursor = repo.page_filtered(db, cursor=cursor, limit=limit, **filters)
+        return {"items": items, "next_cursor": next_cursor}
+    return repo.list_filtered(db, skip=skip, limit=limit, **filters)
+
+@router.get("/summary", response_model=SamplingSummary)
+def samplings_summary(
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """Lista todos los muestreos registrados, permitiendo filtrar por estado."""
-    query = db.query(Sampling).options(joinedload(Sampling.sampling_point))
-    if status_filter:
-        query = query.filter(Sampling.status == status_filter)
-    return query.all()
+    """Cantidad de muestreos por estado, desde los contadores mantenidos en cada transición."""
+    prefijo = metrica_sampling_estado("")
+    totales = ContadorDashboardRepository().get_totales(db, prefijo)
+    por_estado = {metrica[len(prefijo):]: valor for metrica, valor in totales.items()}
+    return {"por_estado": por_estado, "total": sum(por_estado.values())}
 
 @router.get("/{sampling_id}", response_model=SamplingResponse)
 def get_sampling(
@@ -87,24 +126,23 @@ def review_sampling(
     """
     Marca un muestreo como revisado.
     Extrae automáticamente la identidad del revisor desde el contexto.
+    El UPDATE es condicional al estado PENDING_REVIEW: de dos revisiones
+    concurrentes solo una mueve los contadores.
     """
-    sampling = db.query(Sampling).filter(Sampling.id == sampling_id).first()
-    if not sampling:
-        raise HTTPException(status_code=404, detail="Muestreo no encontrado")
-    
-    if sampling.status != "PENDING_REVIEW":
+    revisados = SamplingRepository().review(db, sampling_id, current_user.usuario_id, datetime.now(timezone.utc))
+    if not revisados:
+        db.rollback()
+        sampling = db.get(Sampling, sampling_id)
+        if not sampling:
+            raise HTTPException(status_code=404, detail="Muestreo no encontrado")
         raise HTTPException(
             status_code=400, 
             detail=f"No se puede revisar un muestreo en estado {sampling.status}"
         )
-    
-    sampling.status = "PENDING_SUBMISSION"
-    sampling.reviewer_id = current_user.usuario_id
-    sampling.review_timestamp = datetime.now(timezone.utc)
+    _mover_contador(db, "PENDING_REVIEW", "PENDING_SUBMISSION", len(revisados))
     
     db.commit()
-    db.refresh(sampling)
-    return sampling
+    return db.get(Sampling, sampling_id, populate_existing=True)
 
 @router.patch("/batch/{batch_id}/review", status_code=status.HTTP_200_OK)
 def review_batch(
@@ -113,24 +151,19 @@ def review_batch(
     current_user: Usuario = Depends(require_role("inspector", "administrador"))
 ):
     """
-    Marca todos los muestreos de un lote (batch_id) como revisados.
+    Marca todos los muestreos de un lote (batch_id) como revisados, con un
+    único UPDATE condicional sobre los que siguen en PENDING_REVIEW.
     """
-    samplings = db.query(Sampling).filter(
-        Sampling.batch_id == batch_id,
-        Sampling.status == "PENDING_REVIEW"
-    ).all()
+    review_timestamp = datetime.now(timezone.utc)
+    revisados = SamplingRepository().review_batch(db, batch_id, current_user.usuario_id, review_timestamp)
     
-    if not samplings:
+    if not revisados:
+        db.rollback()
         raise HTTPException(
             status_code=404, 
             detail=f"No se encontraron muestreos pendientes de revisión para el lote {batch_id}"
         )
-    
-    review_timestamp = datetime.now(timezone.utc)
-    for sampling in samplings:
-        sampling.status = "PENDING_SUBMISSION"
-        sampling.reviewer_id = current_user.usuario_id
-        sampling.review_timestamp = review_timestamp
+    _mover_contador(db, "PENDING_REVIEW", "PENDING_SUBMISSION", len(revisados))
         
     try:
         db.commit()
@@ -139,9 +172,9 @@ def review_batch(
         raise HTTPException(status_code=500, detail=f"Error al procesar la revisión por lote: {str(e)}")
         
     return {
-        "message": f"Se han validado exitosamente {len(samplings)} muestreos del lote",
+        "message": f"Se han validado exitosamente {len(revisados)} muestreos del lote",
         "batch_id": batch_id,
-        "count": len(samplings)
+        "count": len(revisados)
     }
 
 @router.post("/batch-submit", status_code=status.HTTP_200_OK)
@@ -152,39 +185,37 @@ def batch_submit_samplings(
 ):
     """
     Envía múltiples muestreos en un solo lote.
-    Garantiza atomicidad mediante una transacción.
+    Un único UPDATE condicional (status = PENDING_SUBMISSION) en una
+    transacción: si no pasan todos, no pasa ninguno. Un segundo envío
+    concurrente de los mismos muestreos no encuentra filas que actualizar.
     """
     if not batch_in.sampling_ids:
         raise HTTPException(status_code=400, detail="Debe proporcionar al menos un ID de muestreo")
     
-    # Iniciar transacción explícita
-    # SQLAlchemy Session ya maneja una transacción, usaremos db.commit() al final.
-    
-    samplings = db.query(Sampling).filter(Sampling.id.in_(batch_in.sampling_ids)).all()
-    
-    if len(samplings) != len(batch_in.sampling_ids):
-        # Encontrar IDs faltantes
-        found_ids = [s.id for s in samplings]
-        missing_ids = [id for id in batch_in.sampling_ids if id not in found_ids]
-        raise HTTPException(
-            status_code=404, 
-            detail=f"Algunos muestreos no fueron encontrados: {missing_ids}"
-        )
-    
+    solicitados = list(dict.fromkeys(batch_in.sampling_ids))
     submission_id = str(uuid.uuid4())
     submission_timestamp = datetime.now(timezone.utc)
     
-    for sampling in samplings:
-        if sampling.status != "PENDING_SUBMISSION":
-            db.rollback()
+    enviados = SamplingRepository().submit(db, solicitados, submission_id, submission_timestamp)
+    
+    if len(enviados) != len(solicitados):
+        db.rollback()
+        # Diagnóstico (solo en el camino de error): faltantes o en otro estado
+        estados = dict(db.query(Sampling.id, Sampling.status).filter(Sampling.id.in_(solicitados)).all())
+        missing_ids = [id for id in solicitados if id not in estados]
+        if missing_ids:
             raise HTTPException(
-                status_code=400, 
-                detail=f"El muestreo {sampling.id} no está listo para envío (Estado: {sampling.status})"
+                status_code=404, 
+                detail=f"Algunos muestreos no fueron encontrados: {missing_ids}"
             )
-        
-        sampling.status = "SUBMITTED"
-        sampling.submission_id = submission_id
-        sampling.submission_timestamp = submission_timestamp
+        no_listo = next((id for id in solicitados if estados[id] != "PENDING_SUBMISSION"), None)
+        if no_listo is None:
+            raise ConcurrencyConflictException()
+        raise HTTPException(
+            status_code=400, 
+            detail=f"El muestreo {no_listo} no está listo para envío (Estado: {estados[no_listo]})"
+        )
+    _mover_contador(db, "PENDING_SUBMISSION", "SUBMITTED", len(enviados))
         
     try:
         db.commit()
@@ -193,7 +224,7 @@ def batch_submit_samplings(
         raise HTTPException(status_code=500, detail=f"Error al procesar el lote: {str(e)}")
         
     return {
-        "message": f"Se han enviado exitosamente {len(samplings)} muestreos",
+        "message": f"Se han enviado exitosamente {len(enviados)} muestreos",
         "submission_id": submission_id,
-        "count": len(samplings)
+        "count": len(enviados)
     }
@@ -1,7 +1,8 @@
-from typing import List
+from typing import List, Optional, Union
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from src.backend.api.responses import ProjectionResponse
 from src.backend.api.dependencies import get_db
 from src.backend.api.schemas.dim import (
     SistemaCreate, SistemaUpdate, SistemaResponse,
@@ -12,6 +13,7 @@ from src.backend.api.schemas.dim import (
 )
 from src.backend.repositories.dim import (SistemaRepository, PlantaRepository, AreaRepository, 
                                           PuntoMuestreoRepository, ZonaAreaRepository)
+from src.backend.api.schemas.pagination import CursorPage
 from src.backend.api.security import get_current_user, require_role
 
 router = APIRouter(dependencies=[Depends(get_current_user)])
@@ -26,9 +28,12 @@ def create_sistema(body: SistemaCreate, db: Session = Depends(get_db)):
     repo = SistemaRepository()
     return repo.create(db, body.model_dump())
 
-@router.get("/sistemas", response_model=List[SistemaResponse])
-def list_sistemas(skip: int = 0, limit: int = 100, only_active: bool = True, db: Session = Depends(get_db)):
+@router.get("/sistemas", response_model=Union[List[SistemaResponse], CursorPage[SistemaResponse]])
+def list_sistemas(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, only_active: bool = True, db: Session = Depends(get_db)):
     repo = SistemaRepository()
+    if cursor is not None:
+        items, next_cursor = repo.get_page(db, cursor=cursor, limit=limit, only_active=only_active)
+        return {"items": items, "next_cursor": next_cursor}
     return repo.get_all(db, skip=skip, limit=limit, only_active=only_active)
 
 @router.get("/sistemas/{sistema_id}", response_model=SistemaResponse)
@@ -65,9 +70,12 @@ def create_planta(body: PlantaCreate, db: Session = Depends(get_db)):
     repo = PlantaRepository()
     return repo.create(db, body.model_dump())
 
-@router.get("/plantas", response_model=List[PlantaResponse])
-def list_plantas(skip: int = 0, limit: int = 100, only_active: bool = True, db: Session = Depends(get_db)):
+@router.get("/plantas", response_model=Union[List[PlantaResponse], CursorPage[PlantaResponse]])
+def list_plantas(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, only_active: bool = True, db: Session = Depends(get_db)):
     repo = PlantaRepository()
+    if cursor is not None:
+        items, next_cursor = repo.get_page(db, cursor=cursor, limit=limit, only_active=only_active)
+        return {"items": items, "next_cursor": next_cursor}
     return repo.get_all(db, skip=skip, limit=limit, only_active=only_active)
 
 @router.get("/plantas/{planta_id}", response_model=PlantaResponse)
@@ -104,10 +112,25 @@ def create_area(body: AreaCreate, db: Session = Depends(get_db)):
     repo = AreaRepository()
     return repo.create(db, body.model_dump())
 
-@router.get("/areas", response_model=List[AreaResponse])
-def list_areas(skip: int = 0, limit: int = 5000, only_active: bool = True, db: Session = Depends(get_db)):
+# Columnas que necesita AreaResponse: el listado se arma por proyección, sin instancias ORM
+_AREA_COLUMNS = AreaRepository().schema_columns(AreaResponse)
+_ZONA_AREA_COLUMNS = ZonaAreaRepository().schema_columns(ZonaAreaResponse)
+
+def _with_zonas(db: Session, areas: List[dict]) -> List[dict]:
+    zonas = ZonaAreaRepository().get_related_projection(
+        db, _ZONA_AREA_COLUMNS, "area_id", [a["area_id"] for a in areas])
+    for area in areas:
+        area["zonas"] = zonas.get(area["area_id"], [])
+    return areas
+
+@router.get("/areas", response_model=Union[List[AreaResponse], CursorPage[AreaResponse]])
+def list_areas(skip: int = 0, limit: int = 5000, cursor: Optional[str] = None, only_active: bool = True, db: Session = Depends(get_db)):
     repo = AreaRepository()
-    return repo.get_all(db, skip=skip, limit=limit, only_active=only_active)
+    if cursor is not None:
+        items, next_cursor = repo.get_page_projection(db, _AREA_COLUMNS, cursor=cursor, limit=limit, only_active=only_active)
+        return ProjectionResponse({"items": _with_zonas(db, items), "next_cursor": next_cursor})
+    areas = repo.get_all_projection(db, _AREA_COLUMNS, skip=skip, limit=limit, only_active=only_active)
+    return ProjectionResponse(_with_zonas(db, areas))
 
 @router.get("/debug-areas")
 def debug_areas(db: Session = Depends(get_db)):
@@ -154,9 +177,12 @@ def create_punto_muestreo(body: PuntoMuestreoCreate, db: Session = Depends(get_d
     repo = PuntoMuestreoRepository()
     return repo.create(db, body.model_dump())
 
-@router.get("/puntos-muestreo", response_model=List[PuntoMuestreoResponse])
-def list_puntos_muestreo(skip: int = 0, limit: int = 100, only_active: bool = True, db: Session = Depends(get_db)):
+@router.get("/puntos-muestreo", response_model=Union[List[PuntoMuestreoResponse], CursorPage[PuntoMuestreoResponse]])
+def list_puntos_muestreo(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, only_active: bool = True, db: Session = Depends(get_db)):
     repo = PuntoMuestreoRepository()
+    if cursor is not None:
+        items, next_cursor = repo.get_page(db, cursor=cursor, limit=limit, only_active=only_active)
+        return {"items": items, "next_cursor": next_cursor}
     return repo.get_all(db, skip=skip, limit=limit, only_active=only_active)
 
 @router.get("/puntos-muestreo/{punto_id}", response_model=PuntoMuestreoResponse)
@@ -193,9 +219,14 @@ def create_zona_area(body: ZonaAreaCreate, db: Session = Depends(get_db)):
     repo = ZonaAreaRepository()
     return repo.create(db, body.model_dump())
 
-@router.get("/zonas-area", response_model=List[ZonaAreaResponse])
-def list_zonas_area(area_id: Optional[int] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/zonas-area", response_model=Union[List[ZonaAreaResponse], CursorPage[ZonaAreaResponse]])
+def list_zonas_area(area_id: Optional[int] = None, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                    db: Session = Depends(get_db)):
     repo = ZonaAreaRepository()
+    if cursor is not None:
+        items, next_cursor = repo.get_page(db, cursor=cursor, limit=limit,
+                                           filters={"area_id": area_id} if area_id else None)
+        return {"items": items, "next_cursor": next_cursor}
     if area_id:
         return db.query(repo.model).filter(repo.model.area_id == area_id).offset(skip).limit(limit).all()
     return repo.get_all(db, skip=skip, limit=limit)
@@ -1,5 +1,5 @@
 """Manufacturing router – orders, processes, state transitions and traceability."""
-from typing import List
+from typing import List, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
@@ -14,10 +14,12 @@ from src.backend.api.schemas.fact import (
     ManufacturaOperarioCreate, ManufacturaOperarioResponse, ManufacturaOperarioDetalleResponse,
     UsoMaterialManufacturaCreate, UsoMaterialManufacturaResponse, UsoMaterialManufacturaDetalleResponse,
 )
+from src.backend.api.schemas.pagination import CursorPage
 from src.backend.repositories.fact import (
     OrdenManufacturaRepository, ManufacturaRepository, EstadoManufacturaRepository,
 )
 from src.backend.services.manufacturing_service import ManufacturingService
+from src.backend.core.pagination import keyset_paginate
 from src.backend.api.security import get_current_user, require_role
 from src.backend.models.auth import Usuario
 
@@ -45,9 +47,12 @@ def create_orden(body: OrdenManufacturaCreate, db: Session = Depends(get_db)):
     return repo.create(db, body.model_dump())
 
 
-@router.get("/ordenes", response_model=List[OrdenManufacturaResponse])
-def list_ordenes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/ordenes", response_model=Union[List[OrdenManufacturaResponse], CursorPage[OrdenManufacturaResponse]])
+def list_ordenes(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
     repo = OrdenManufacturaRepository()
+    if cursor is not None:
+        items, next_cursor = repo.get_page(db, cursor=cursor, limit=limit)
+        return {"items": items, "next_cursor": next_cursor}
     return repo.get_all(db, skip=skip, limit=limit)
 
 
@@ -116,16 +121,17 @@ def create_manufactura(
     return service.create_manufacture_process(db, body.model_dump(), current_user.usuario_id)
 
 
-@router.get("/procesos", response_model=List[ManufacturaDetalleResponse])
-def list_manufacturas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista procesos enriquecidos con nombre del estado."""
+@router.get("/procesos", response_model=Union[List[ManufacturaDetalleResponse], CursorPage[ManufacturaDetalleResponse]])
+def list_manufacturas(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    """Lista procesos enriquecidos con nombre del estado (``cursor`` para paginar por keyset)."""
     from sqlalchemy.orm import joinedload
     from src.backend.models.fact import Manufactura
-    procesos = (
-        db.query(Manufactura)
-        .options(joinedload(Manufactura.estado))
-        .offset(skip).limit(limit).all()
-    )
+    query = db.query(Manufactura).options(joinedload(Manufactura.estado))
+    if cursor is not None:
+        procesos, next_cursor = keyset_paginate(query, [Manufactura.manufactura_id], cursor, limit)
+        return {"items": [ManufacturaDetalleResponse.from_orm_extended(p) for p in procesos],
+                "next_cursor": next_cursor}
+    procesos = query.offset(skip).limit(limit).all()
     return [ManufacturaDetalleResponse.from_orm_extended(p) for p in procesos]
 
 
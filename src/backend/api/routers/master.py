@@ -1,5 +1,5 @@
-from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Dict, Any, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from src.backend.api.dependencies import get_db
@@ -8,7 +8,9 @@ from src.backend.repositories.fact import EstadoManufacturaRepository, EstadoSol
 from src.backend.repositories.master import CepaReferenciaRepository
 from src.backend.api.schemas.master import CepaReferenciaCreate, CepaReferenciaResponse
 from src.backend.api.schemas.dim import TipoSolicitudMuestreoCreate, TipoSolicitudMuestreoResponse, TipoSolicitudMuestreoUpdate
+from src.backend.api.schemas.pagination import CursorPage
 from src.backend.api.security import get_current_user, require_role
+from src.backend.core.response_cache import response_cache
 
 router = APIRouter(dependencies=[Depends(get_current_user)])
 
@@ -16,11 +18,21 @@ _ESCRITURA = ["administrador", "supervisor"]
 
 # ─── Catálogos ──────────────────────────────────────────────────
 
+# Tablas cuyas escrituras invalidan la respuesta cacheada de /catalogos
+_CATALOG_TABLES = ("tipo_equipo", "estado_equipo", "estado_manufactura", "estado_solicitud",
+                   "estado_analisis", "tipo_solicitud_muestreo")
+
+
 @router.get("/catalogos", response_model=Dict[str, List[Dict[str, Any]]])
-def get_all_catalogs(db: Session = Depends(get_db)):
+def get_all_catalogs(request: Request, db: Session = Depends(get_db)):
     """
     Returns all lookup tables (catalogs) in a single call to minimize frontend latency.
+    Served from the response cache (TTL + ETag/304), invalidated on catalog writes.
     """
+    return response_cache.respond(request, "catalogos", _CATALOG_TABLES, lambda: _build_catalogs(db))
+
+
+def _build_catalogs(db: Session) -> Dict[str, List[Dict[str, Any]]]:
     tipo_equipo_repo = TipoEquipoRepository()
     estado_equipo_repo = EstadoEquipoRepository()
     estado_m_repo = EstadoManufacturaRepository()
@@ -108,9 +120,12 @@ def create_cepa(body: CepaReferenciaCreate, db: Session = Depends(get_db)):
     repo = CepaReferenciaRepository()
     return repo.create(db, body.model_dump())
 
-@router.get("/cepas", response_model=List[CepaReferenciaResponse])
-def list_cepas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/cepas", response_model=Union[List[CepaReferenciaResponse], CursorPage[CepaReferenciaResponse]])
+def list_cepas(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
     repo = CepaReferenciaRepository()
+    if cursor is not None:
+        items, next_cursor = repo.get_page(db, cursor=cursor, limit=limit)
+        return {"items": items, "next_cursor": next_cursor}
     return repo.get_all(db, skip=skip, limit=limit)
 
 @router.get("/cepas/{cepa_id}", response_model=CepaReferenciaResponse)
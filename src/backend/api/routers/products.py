@@ -1,5 +1,5 @@
 """Products router – management of laboratory products."""
-from typing import List
+from typing import List, Optional, Union
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
@@ -7,15 +7,19 @@ from src.backend.database.db_manager import db_manager
 from src.backend.models.master import Producto
 from src.backend.repositories.master import ProductoRepository
 from src.backend.api.schemas.master import ProductoCreate, ProductoResponse, ProductoUpdate
+from src.backend.api.schemas.pagination import CursorPage
 from src.backend.api.security import require_role
 
 router = APIRouter()
 
 _ESCRITURA = ["administrador", "supervisor"]
 
-@router.get("", response_model=List[ProductoResponse])
-def list_productos(skip: int = 0, limit: int = 100, only_active: bool = True, db: Session = Depends(db_manager.get_session)):
+@router.get("", response_model=Union[List[ProductoResponse], CursorPage[ProductoResponse]])
+def list_productos(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, only_active: bool = True, db: Session = Depends(db_manager.get_session)):
     repo = ProductoRepository()
+    if cursor is not None:
+        items, next_cursor = repo.get_page(db, cursor=cursor, limit=limit, only_active=only_active)
+        return {"items": items, "next_cursor": next_cursor}
     return repo.get_all(db, skip=skip, limit=limit, only_active=only_active)
 
 @router.get("/{producto_id}", response_model=ProductoResponse)
@@ -1,5 +1,5 @@
 """Samples router – requests, sampling sessions, shipments, reception."""
-from typing import List
+from typing import List, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session, joinedload
@@ -11,6 +11,7 @@ from src.backend.api.schemas.fact import (
     EnvioMuestraCreate, EnvioMuestraResponse, EnvioMuestraUpdate,
     RecepcionCreate, RecepcionResponse, RecepcionUpdate,
 )
+from src.backend.api.schemas.pagination import CursorPage
 from src.backend.repositories.fact import SolicitudMuestreoRepository, EnvioMuestraRepository, RecepcionRepository
 from src.backend.services.sample_service import SampleService
 from src.backend.api.security import get_current_user, require_role
@@ -36,14 +37,17 @@ def create_solicitud(
     return service.create_sampling_request(db, body.model_dump(), body.usuario_id)
 
 
-@router.get("/solicitudes", response_model=List[SolicitudMuestreoResponse])
-def list_solicitudes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/solicitudes", response_model=Union[List[SolicitudMuestreoResponse], CursorPage[SolicitudMuestreoResponse]])
+def list_solicitudes(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
     repo = SolicitudMuestreoRepository()
     options = [
         joinedload(SolicitudMuestreo.usuario),
         joinedload(SolicitudMuestreo.orden_manufactura),
         joinedload(SolicitudMuestreo.punto_muestreo)
     ]
+    if cursor is not None:
+        items, next_cursor = repo.get_page(db, cursor=cursor, limit=limit, options=options)
+        return {"items": items, "next_cursor": next_cursor}
     return repo.get_all(db, skip=skip, limit=limit, options=options)
 
 
@@ -53,27 +57,30 @@ def update_solicitud(
     solicitud_id: int,
     body: SolicitudMuestreoUpdate,
     db: Session = Depends(get_db),
+    service: SampleService = Depends(get_sample_service),
 ):
-    repo = SolicitudMuestreoRepository()
     options = [
         joinedload(SolicitudMuestreo.usuario),
         joinedload(SolicitudMuestreo.orden_manufactura),
         joinedload(SolicitudMuestreo.punto_muestreo)
     ]
-    obj = repo.get(db, solicitud_id, options=options)
-    if not obj:
+    try:
+        return service.update_sampling_request(db, solicitud_id, body.model_dump(exclude_unset=True), options=options)
+    except ValueError:
         raise HTTPException(status_code=404, detail="Solicitud no encontrada")
-    return repo.update(db, obj, body.model_dump(exclude_unset=True))
 
 
 @router.delete("/solicitudes/{solicitud_id}", status_code=status.HTTP_204_NO_CONTENT,
                dependencies=[Depends(require_role(*_ESCRITURA))])
-def delete_solicitud(solicitud_id: int, db: Session = Depends(get_db)):
-    repo = SolicitudMuestreoRepository()
-    obj = repo.get(db, solicitud_id)
-    if not obj:
+def delete_solicitud(
+    solicitud_id: int,
+    db: Session = Depends(get_db),
+    service: SampleService = Depends(get_sample_service),
+):
+    try:
+        service.delete_sampling_request(db, solicitud_id)
+    except ValueError:
         raise HTTPException(status_code=404, detail="Solicitud no encontrada")
-    repo.delete(db, solicitud_id)
     return None
 
 
@@ -58,8 +58,10 @@ class AreaCreate(AreaBase):
     pass
 
 class AreaResponse(AreaBase):
+    # area.codigo admite NULL en la BD (áreas previas al código); el alta sí lo exige
+    codigo: Optional[str] = Field(None, description="Código de identificación del área", json_schema_extra={"example": "PA036"})
     area_id: int
-    zonas: List[ZonaAreaResponse] = []
+    zonas: List["ZonaAreaResponse"] = []
     model_config = ConfigDict(from_attributes=True)
 
 class AreaUpdate(BaseModel):
@@ -119,7 +121,7 @@ class EquipoDetalleResponse(EquipoInstrumentoResponse):
     tipo_nombre: Optional[str] = None
     estado_nombre: Optional[str] = None
     area_nombre: Optional[str] = None
-    zonas: List[ZonaEquipoResponse] = []
+    zonas: List["ZonaEquipoResponse"] = []
     is_compliant: bool = True
 
     @classmethod
@@ -208,6 +210,14 @@ class CalibracionResponse(CalibracionBase):
     calibracion_calificacion_equipo_id: int
     model_config = ConfigDict(from_attributes=True)
 
+class VencimientoEquipoResponse(BaseModel):
+    equipo_instrumento_id: int
+    codigo: str
+    nombre: str
+    estado_equipo_id: int
+    vence: date = Field(..., description="Vencimiento de la última calibración")
+    dias_restantes: int = Field(..., description="Días hasta el vencimiento (negativo si ya venció)")
+
 
 # ─── PuntoMuestreo ───────────────────────────────────────────
 
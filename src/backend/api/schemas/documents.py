@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel, ConfigDict
 
 
@@ -18,6 +19,7 @@ class DocumentoCreate(DocumentoBase):
 class DocumentoResponse(DocumentoBase):
     documento_id: int
     usuario_id: int
+    sha256: Optional[str] = None
     fecha_subida: datetime
 
     model_config = ConfigDict(from_attributes=True)
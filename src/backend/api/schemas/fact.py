@@ -281,7 +281,7 @@ class MuestraResponse(MuestraBase):
 class MuestreoConMuestrasCreate(BaseModel):
     session: MuestreoCreate
     muestras: List[MuestraCreate]
-    envios: Optional[List[EnvioMuestraCreate]] = None
+    envios: Optional[List["EnvioMuestraCreate"]] = None
 
 
 # ─── EnvioMuestra ────────────────────────────────────────────
@@ -366,10 +366,16 @@ class AnalisisBase(BaseModel):
 class AnalisisCreate(AnalisisBase):
     pass
 
-class AnalisisBulkCreate(BaseModel):
+class AnalisisBulkMuestra(BaseModel):
     muestra_id: int
     recepcion_id: int
-    metodos_versions_ids: List[int]
+
+class AnalisisBulkCreate(BaseModel):
+    # Una muestra (forma original) y/o varias en ``muestras``: se crea un análisis por muestra × método
+    muestra_id: Optional[int] = None
+    recepcion_id: Optional[int] = None
+    muestras: List[AnalisisBulkMuestra] = Field(default_factory=list, description="Muestras (con su recepción) a analizar")
+    metodos_versions_ids: List[int] = Field(..., min_length=1)
     operario_id: int
     estado_analisis_id: int = 1 # Por defecto Programado
 
@@ -427,11 +433,23 @@ class ResultadoBase(BaseModel):
 class ResultadoCreate(ResultadoBase):
     pass
 
+class ResultadoBulkCreate(BaseModel):
+    resultados: List[ResultadoCreate] = Field(..., min_length=1, description="Resultados a registrar (uno por análisis)")
+
 class ResultadoResponse(ResultadoBase):
     resultado_id: int
     conforme: Optional[bool] = None
     model_config = ConfigDict(from_attributes=True)
 
+class ResultadoBulkError(BaseModel):
+    indice: int = Field(..., description="Posición del resultado en la solicitud")
+    analisis_id: int
+    error: str
+
+class ResultadoBulkResponse(BaseModel):
+    registrados: List[ResultadoResponse] = []
+    errores: List[ResultadoBulkError] = []
+
 
 # ─── Uso de Recursos (Step 7) ────────────────────────────────
 
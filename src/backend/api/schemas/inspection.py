@@ -1,6 +1,6 @@
 from enum import Enum
 from datetime import datetime
-from typing import Optional, List, Union
+from typing import Dict, Optional, List, Union
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 from decimal import Decimal
 from src.backend.api.schemas.dim import PuntoMuestreoResponse
@@ -93,7 +93,8 @@ class SamplingResponse(SamplingBase):
     model_config = ConfigDict(from_attributes=True)
 
 class SamplingBatchSubmit(BaseModel):
-    sampling_ids: List[str]
+    # Un solo UPDATE ... WHERE id IN (...): SQLite admite hasta 32766 parámetros por sentencia
+    sampling_ids: List[str] = Field(..., max_length=20000)
 
 class SamplingUpdate(BaseModel):
     start_datetime: Optional[datetime] = None
@@ -111,3 +112,7 @@ class SamplingUpdate(BaseModel):
     tyvek_wash_number: Optional[int] = None
     destination: Optional[SamplingDestination] = None
 
+
+class SamplingSummary(BaseModel):
+    por_estado: Dict[str, int] = Field(..., description="Cantidad de muestreos por estado")
+    total: int
@@ -0,0 +1,11 @@
+"""Pydantic schemas for keyset (cursor) pagination."""
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = Field(None, description="Cursor de la página siguiente (null en la última)")
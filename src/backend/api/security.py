@@ -13,10 +13,11 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from src.backend.api.dependencies import get_db
-from src.backend.models.auth import Usuario, UsuarioRol
+from src.backend.models.auth import Usuario, UsuarioRol, UsuarioLaboratorio
+from src.backend.core.principal_cache import principal_cache
 
 # ─── Configuration ────────────────────────────────────────────
 
@@ -52,13 +53,45 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+# ─── Principal Resolution ─────────────────────────────────────
+
+def load_principal(db: Session, usuario_id: int) -> Optional[Usuario]:
+    """
+    Return the Usuario (roles and laboratorios loaded) for ``usuario_id`` from the
+    principal cache, querying the database only on a miss. Cached instances are
+    detached and fully loaded, so they can be shared across requests read-only.
+    """
+    usuario = principal_cache.get(usuario_id)
+    if usuario is not None:
+        return usuario
+
+    # Sesión propia: al cerrarla las instancias quedan detached sin expirar
+    with Session(bind=db.get_bind()) as session:
+        usuario = (
+            session.query(Usuario)
+            .options(
+                selectinload(Usuario.roles).joinedload(UsuarioRol.rol),
+                selectinload(Usuario.laboratorios).joinedload(UsuarioLaboratorio.laboratorio),
+            )
+            .filter(Usuario.usuario_id == usuario_id)
+            .first()
+        )
+    if usuario is not None:
+        principal_cache.put(usuario_id, usuario)
+    return usuario
+
+
 # ─── FastAPI Dependencies ──────────────────────────────────────
 
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
 ) -> Usuario:
-    """Decode JWT and return the authenticated Usuario (with roles loaded), or raise 401."""
+    """
+    Decode JWT and return the authenticated Usuario (with roles loaded), or raise 401.
+    FastAPI memoizes this dependency per request, so router-level and parameter
+    usages share one resolution; across requests the principal cache is used.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudieron validar las credenciales",
@@ -73,12 +106,7 @@ def get_current_user(
     except (JWTError, ValueError):
         raise credentials_exception
 
-    usuario = (
-        db.query(Usuario)
-        .options(joinedload(Usuario.roles).joinedload(UsuarioRol.rol))
-        .filter(Usuario.usuario_id == usuario_id)
-        .first()
-    )
+    usuario = load_principal(db, usuario_id)
     if usuario is None:
         raise credentials_exception
     return usuario
@@ -96,12 +124,7 @@ def get_current_user_optional(
         sub: Optional[str] = payload.get("sub")
         if sub is None:
             return None
-        return (
-            db.query(Usuario)
-            .options(joinedload(Usuario.roles).joinedload(UsuarioRol.rol))
-            .filter(Usuario.usuario_id == int(sub))
-            .first()
-        )
+        return load_principal(db, int(sub))
     except (JWTError, ValueError, Exception):
         return None
 
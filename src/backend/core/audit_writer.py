@@ -0,0 +1,424 @@
+"""
+Escritor asíncrono y por lotes del Audit Trail (audit_logs).
+
+Con ``AUDIT_MODE=async`` los repositorios no insertan el AuditLog en la
+transacción de la request: antes del commit los eventos se escriben en un
+journal local append-only (fsync) y, confirmado el cambio, se encolan. Si
+el commit falla se anota su descarte en el journal. Un hilo de fondo
+persiste la cola en lotes (por tamaño o por tiempo) con un único INSERT
+por lote y avanza el checkpoint del journal hasta el primer evento aún
+pendiente. Al arrancar, los eventos del journal posteriores al checkpoint
+(y no descartados) se reinsertan, de modo que un crash no pierde
+registros de auditoría. Un crash entre el fsync y el commit deja en el
+journal eventos de un cambio que no llegó a confirmarse: recover() los
+inserta igual (se prefiere un evento de más a perder uno).
+
+Cada proceso (worker de uvicorn) escribe su propio journal
+``<AUDIT_JOURNAL_PATH sin extensión>.<pid>.jsonl`` con su checkpoint y lo
+mantiene bloqueado (lock de archivo) mientras corre. ``recover()`` recorre
+todos los journals de ese prefijo y solo toma los que no tienen dueño vivo
+(el lock se libera al terminar el proceso, incluso por un crash).
+
+Garantías (21 CFR Part 11):
+- Orden: un único escritor consume la cola FIFO, los eventos de un mismo
+  registro se persisten en el orden en que se produjeron.
+- Persistencia antes de responder (``AUDIT_ACK``):
+    * ``journal`` (default): el evento está en disco (journal) al retornar.
+    * ``db``: la llamada espera a que el lote con su evento esté en la BD.
+
+Con ``AUDIT_MODE=sync`` (default) se mantiene el comportamiento original.
+"""
+import json
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from src.backend.models.audit import AuditLog
+from src.backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+AUDIT_MODE = os.getenv("AUDIT_MODE", "sync")
+AUDIT_ACK = os.getenv("AUDIT_ACK", "journal")
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+AUDIT_FLUSH_INTERVAL_MS = int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "200"))
+AUDIT_JOURNAL_PATH = os.getenv("AUDIT_JOURNAL_PATH", os.path.join("logs", "audit_journal.jsonl"))
+AUDIT_JOURNAL_FSYNC = os.getenv("AUDIT_JOURNAL_FSYNC", "true").lower() == "true"
+AUDIT_ACK_TIMEOUT_S = float(os.getenv("AUDIT_ACK_TIMEOUT_S", "10"))
+
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _try_lock(f) -> bool:
+    """Lock exclusivo y no bloqueante sobre el archivo abierto ``f`` (False si otro proceso lo tiene)."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def process_journal_path(base_path: str, pid: int) -> str:
+    """Journal del proceso ``pid``: logs/audit_journal.jsonl → logs/audit_journal.<pid>.jsonl"""
+    root, ext = os.path.splitext(base_path)
+    return f"{root}.{pid}{ext}"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class AuditWriter:
+    """Cola en memoria + journal durable + hilo que persiste por lotes."""
+
+    def __init__(self,
+                 session_factory: Callable[[], Session],
+                 journal_path: str = AUDIT_JOURNAL_PATH,
+                 batch_size: int = AUDIT_BATCH_SIZE,
+                 flush_interval_ms: int = AUDIT_FLUSH_INTERVAL_MS,
+                 ack: str = AUDIT_ACK,
+                 fsync: bool = AUDIT_JOURNAL_FSYNC):
+        if ack not in ("journal", "db"):
+            raise ValueError(f"AUDIT_ACK inválido: {ack}")
+        self.session_factory = session_factory
+        self.base_path = journal_path
+        self.journal_path = process_journal_path(journal_path, os.getpid())
+        self.checkpoint_path = self.journal_path + ".ckpt"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.ack = ack
+        self.fsync = fsync
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._lock = threading.Lock()              # serializa seq + journal
+        self._persisted = threading.Condition()    # protege pending + checkpoint
+        self._seq = 0
+        self._journaled_seq = 0
+        self._pending: Set[int] = set()            # en el journal, ni persistidos ni descartados
+        self._checkpoint = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._journal = None
+
+    # ─── Ciclo de vida ────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        # El pid se resuelve al arrancar (después del fork de los workers)
+        self.journal_path = process_journal_path(self.base_path, os.getpid())
+        self.checkpoint_path = self.journal_path + ".ckpt"
+        journal_dir = os.path.dirname(self.journal_path)
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+        self.recover()
+        with self._persisted:
+            self._seq = self._journaled_seq = self._checkpoint = 0
+            self._pending.clear()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        if not _try_lock(self._journal):
+            self._journal.close()
+            self._journal = None
+            raise RuntimeError(f"El journal de auditoría {self.journal_path} está en uso por otro proceso")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Vacía la cola pendiente y detiene el hilo escritor."""
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+        self._compact_journal()
+
+    # ─── API ──────────────────────────────────────────────────
+
+    def submit(self, events: List[Dict[str, Any]]) -> None:
+        """
+        Registra eventos ya confirmados (columnas de AuditLog). Retorna cuando
+        están en el journal (ack=journal) o en la base de datos (ack=db).
+        """
+        self.enqueue(self.journal(events))
+
+    def journal(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Escribe los eventos en el journal (fsync) sin encolarlos. Se llama
+        antes del commit del cambio; después, ``enqueue`` si se confirmó o
+        ``discard`` si no. Retorna los eventos con su ``seq``.
+        """
+        if not events:
+            return []
+        journaled = []
+        with self._lock:
+            for event in events:
+                self._seq += 1
+                event = {**event, "seq": self._seq}
+                self._journal.write(json.dumps(event, default=_encode) + "\n")
+                journaled.append(event)
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            with self._persisted:
+                self._pending.update(e["seq"] for e in journaled)
+                self._journaled_seq = self._seq
+        return journaled
+
+    def enqueue(self, journaled: List[Dict[str, Any]]) -> None:
+        """Entrega al hilo escritor eventos ya escritos en el journal (cambio confirmado)."""
+        if not journaled:
+            return
+        for event in journaled:
+            self._queue.put(event)
+        if self.ack == "db":
+            self.wait_persisted(journaled[-1]["seq"])
+
+    def discard(self, journaled: List[Dict[str, Any]]) -> None:
+        """Anota en el journal que el cambio de estos eventos no se confirmó."""
+        if not journaled:
+            return
+        seqs = [e["seq"] for e in journaled]
+        with self._lock:
+            self._journal.write(json.dumps({"abort": seqs}) + "\n")
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+        self._mark_done(seqs)
+
+    def wait_persisted(self, seq: int, timeout: float = AUDIT_ACK_TIMEOUT_S) -> None:
+        """Espera a que todos los eventos hasta ``seq`` estén persistidos o descartados."""
+        with self._persisted:
+            if not self._persisted.wait_for(lambda: self._checkpoint >= seq, timeout=timeout):
+                raise TimeoutError(f"El audit trail no se persistió en {timeout}s (seq={seq})")
+
+    def flush(self) -> None:
+        """Bloquea hasta que todo lo encolado hasta ahora esté persistido."""
+        with self._lock:
+            last_seq = self._seq
+        self.wait_persisted(last_seq)
+
+    # ─── Hilo escritor ────────────────────────────────────────
+
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                pass
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline or self._stop.is_set():
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if batch:
+                    if not self._write_batch(batch):
+                        return
+                    batch = []
+                deadline = time.monotonic() + self.flush_interval
+                if self._stop.is_set() and self._queue.empty():
+                    return
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> bool:
+        rows = [{k: v for k, v in event.items() if k != "seq"} for event in batch]
+        backoff = 0.1
+        while True:
+            db = self.session_factory()
+            try:
+                db.execute(insert(AuditLog), rows)
+                db.commit()
+                break
+            except Exception as e:
+                db.rollback()
+                # Los eventos siguen en el journal: se reintenta sin perderlos
+                logger.error(f"Audit batch write failed ({len(rows)} eventos), reintentando: {e}")
+                if self._stop.is_set():
+                    # En el shutdown no se bloquea: recover() los reinserta al arrancar
+                    return False
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 5.0)
+            finally:
+                db.close()
+        self._mark_done(event["seq"] for event in batch)
+        return True
+
+    def _mark_done(self, seqs) -> None:
+        """Quita eventos de pendientes y avanza el checkpoint hasta el primero que siga pendiente."""
+        with self._persisted:
+            self._pending.difference_update(seqs)
+            checkpoint = min(self._pending) - 1 if self._pending else self._journaled_seq
+            if checkpoint > self._checkpoint:
+                self._write_checkpoint(checkpoint)
+                self._checkpoint = checkpoint
+            self._persisted.notify_all()
+
+    # ─── Journal / recuperación ───────────────────────────────
+
+    @staticmethod
+    def _read_checkpoint(checkpoint_path: str) -> int:
+        try:
+            with open(checkpoint_path, encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _write_checkpoint(self, seq: int) -> None:
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(str(seq))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, self.checkpoint_path)
+
+    def _compact_journal(self) -> None:
+        """Descarta el journal propio (ya cerrado) si todo lo escrito está persistido."""
+        if self._checkpoint >= self._journaled_seq:
+            _remove_journal(self.journal_path)
+            self._seq = self._journaled_seq = self._checkpoint = 0
+
+    def journal_paths(self) -> List[str]:
+        """Journals de todos los procesos (y el de nombre base, previo a los journals por proceso)."""
+        directory = os.path.dirname(self.base_path) or "."
+        root, ext = os.path.splitext(os.path.basename(self.base_path))
+        por_proceso = re.compile(re.escape(root) + r"\.\d+" + re.escape(ext))
+        try:
+            names = sorted(os.listdir(directory))
+        except FileNotFoundError:
+            return []
+        return [
+            os.path.join(os.path.dirname(self.base_path), name) for name in names
+            if name == root + ext or por_proceso.fullmatch(name)
+        ]
+
+    def recover(self) -> int:
+        """
+        Reinserta en la BD los eventos pendientes de los journals sin dueño
+        vivo (los de workers terminados y el propio de un pid reutilizado) y
+        los elimina. Los journals bloqueados por otro proceso no se tocan.
+        Retorna la cantidad de eventos recuperados.
+        """
+        recovered = 0
+        for path in self.journal_paths():
+            if path == self.journal_path and self._journal is not None:
+                continue
+            try:
+                f = open(path, "r+", encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            with f:
+                if not _try_lock(f):
+                    continue
+                f.seek(0)
+                recovered += self._recover_journal(f, self._read_checkpoint(path + ".ckpt"))
+            _remove_journal(path)
+        return recovered
+
+    def _recover_journal(self, f, checkpoint: int) -> int:
+        """
+        Inserta los eventos de ``f`` posteriores a ``checkpoint``. Omite los
+        descartados (commit fallido) y los que ya estén en audit_logs (crash
+        entre commit y checkpoint).
+        """
+        pending = []
+        descartados = set()
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                # Última línea truncada por el crash: nunca fue confirmada al caller
+                continue
+            if "abort" in event:
+                descartados.update(event["abort"])
+                continue
+            if event["seq"] > checkpoint:
+                event["fecha"] = datetime.fromisoformat(event["fecha"])
+                pending.append(event)
+        pending = [e for e in pending if e["seq"] not in descartados]
+        if not pending:
+            return 0
+
+        db = self.session_factory()
+        try:
+            existentes = {
+                (r.tabla_nombre, r.registro_id, r.operacion, r.fecha.replace(tzinfo=None))
+                for r in db.query(AuditLog.tabla_nombre, AuditLog.registro_id, AuditLog.operacion, AuditLog.fecha)
+                .filter(AuditLog.fecha >= min(e["fecha"] for e in pending).replace(tzinfo=None))
+            }
+            rows = [
+                {k: v for k, v in e.items() if k != "seq"} for e in pending
+                if (e["tabla_nombre"], e["registro_id"], e["operacion"], e["fecha"].replace(tzinfo=None)) not in existentes
+            ]
+            if rows:
+                db.execute(insert(AuditLog), rows)
+            db.commit()
+        finally:
+            db.close()
+        logger.warning(f"Audit journal: {len(rows)} eventos recuperados tras un cierre inesperado")
+        return len(rows)
+
+
+def _remove_journal(path: str) -> None:
+    for p in (path, path + ".ckpt"):
+        try:
+            os.remove(p)
+        except FileNotFoundError:
+            pass
+
+
+# ─── Singleton de la aplicación ───────────────────────────────
+
+_writer: Optional[AuditWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> Optional[AuditWriter]:
+    """Retorna el escritor asíncrono si AUDIT_MODE=async, si no None (modo síncrono)."""
+    global _writer
+    if AUDIT_MODE != "async":
+        return None
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                from src.backend.database.db_manager import db_manager
+                writer = AuditWriter(db_manager.SessionLocal)
+                writer.start()
+                _writer = writer
+    return _writer
+
+
+def shutdown_audit_writer() -> None:
+    """Persiste lo pendiente y detiene el escritor (shutdown de la app)."""
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.stop()
+            _writer = None
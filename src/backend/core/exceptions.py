@@ -26,3 +26,13 @@ class AuthenticationException(LIMSException):
     """Raised when authentication fails."""
     def __init__(self, message: str = "Credenciales inválidas"):
         super().__init__(message, status_code=401)
+
+class InvalidCursorException(LIMSException):
+    """Raised when a pagination cursor cannot be decoded."""
+    def __init__(self, message: str = "Cursor de paginación inválido"):
+        super().__init__(message, status_code=400)
+
+class ConcurrencyConflictException(LIMSException):
+    """Raised when rows changed concurrently between read and conditional update."""
+    def __init__(self, message: str = "Los registros fueron modificados por otra operación; reintente"):
+        super().__init__(message, status_code=409)
@@ -0,0 +1,84 @@
+"""
+Paginación por keyset (cursor).
+
+En lugar de ``OFFSET n`` (que recorre las n filas previas en cada página)
+se ordena por una o más columnas que terminan en la PK y se filtra por
+las filas posteriores a la última entregada. El costo de cada página es
+el mismo sin importar su profundidad.
+
+El cursor es opaco para el cliente: JSON de los valores de las columnas
+de orden de la última fila, en base64 url-safe.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+from src.backend.core.exceptions import InvalidCursorException
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps(list(values), default=lambda v: v.isoformat(), separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """Valores del cursor convertidos al tipo Python de cada columna."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return [_from_json(col, v) for col, v in zip(columns, values)]
+    except (ValueError, TypeError):
+        raise InvalidCursorException()
+
+
+def _from_json(column, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type in (int, float, str) and not isinstance(value, python_type):
+        raise ValueError
+    return value
+
+
+def _after(columns: Sequence[Any], values: Sequence[Any], descending: bool):
+    """(c1, c2, ...) > (v1, v2, ...) en orden lexicográfico (o < si es descendente)."""
+    col, value = columns[0], values[0]
+    beyond = col < value if descending else col > value
+    if len(columns) == 1:
+        return beyond
+    return or_(beyond, and_(col == value, _after(columns[1:], values[1:], descending)))
+
+
+def keyset_paginate(
+    query: Query,
+    columns: Sequence[Any],
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = False,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Aplica orden + filtro de keyset a ``query`` (de una entidad ORM) y
+    retorna (filas, next_cursor). ``columns`` debe terminar en la PK para
+    que el orden sea total; next_cursor es None en la última página.
+    """
+    query = query.order_by(*(col.desc() if descending else col.asc() for col in columns))
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns), descending))
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([getattr(rows[-1], col.key) for col in columns])
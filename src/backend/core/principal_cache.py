@@ -0,0 +1,66 @@
+"""
+Cache en memoria de los principals autenticados (Usuario + roles + laboratorios).
+
+``get_current_user`` resuelve el JWT en cada request; con este cache la
+consulta a la BD se hace una vez por usuario y TTL, y el resto de las
+requests es un lookup en un dict. Al confirmarse una escritura sobre
+``usuario``, ``usuario_rol`` o ``usuario_laboratorio`` (hook
+``on_tables_committed`` registrado en ``repositories.auth``) se vacía el cache,
+así una transacción aún abierta o revertida nunca lo deja desfasado. El cache
+es por proceso: con varios workers, el TTL acota el tiempo en que otro worker
+puede ver datos previos al cambio.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+AUTH_CACHE_TTL_S = float(os.getenv("AUTH_CACHE_TTL_S", "60"))
+
+
+class PrincipalCache:
+    """Mapa usuario_id → (expira_en, principal) con TTL y contadores hit/miss."""
+
+    def __init__(self, ttl_seconds: float = AUTH_CACHE_TTL_S):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, usuario_id: int) -> Optional[Any]:
+        entry = self._entries.get(usuario_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, usuario_id: int, principal: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[usuario_id] = (time.monotonic() + self.ttl_seconds, principal)
+
+    def invalidate(self, usuario_id: Optional[int] = None) -> None:
+        """Descarta la entrada de ``usuario_id`` (o todas si es None)."""
+        with self._lock:
+            if usuario_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(usuario_id, None)
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+principal_cache = PrincipalCache()
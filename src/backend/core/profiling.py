@@ -0,0 +1,239 @@
+"""
+Perfilado por request: cantidad de consultas, tiempo de BD y handler.
+
+``ProfilingMiddleware`` abre un ``RequestProfile`` por request HTTP en un
+ContextVar. Los hooks ``before/after_cursor_execute`` (registrados sobre la
+clase Engine, valen para todos los engines) suman cada sentencia al
+profile activo; fuera de una request no registran nada. Los endpoints
+síncronos corren en el threadpool con una copia del contexto, por lo que
+ven el mismo profile.
+
+Con cada respuesta se envía ``Server-Timing`` (db y app); las requests que
+superan ``SLOW_REQUEST_MS`` dejan una línea de log con sus sentencias más
+lentas y las repetidas (candidatas a N+1). Los últimos ``PROFILE_HISTORY``
+resúmenes quedan en memoria para /api/_debug/profile.
+"""
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "true").lower() == "true"
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+PROFILE_TOP_STATEMENTS = int(os.getenv("PROFILE_TOP_STATEMENTS", "5"))
+PROFILE_HISTORY = int(os.getenv("PROFILE_HISTORY", "200"))
+
+# Largo máximo del SQL guardado por sentencia
+_SQL_MAX_CHARS = 500
+
+# Rutas que no se guardan en el historial (el propio endpoint de consulta)
+_EXCLUDED_PREFIXES = ("/api/_debug",)
+
+
+class RequestProfile:
+    """Consultas de una request, agrupadas por texto SQL."""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_ms = 0.0
+        # sql → [ejecuciones, ms total, ms máximo]
+        self._statements: Dict[str, List[float]] = {}
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.queries += 1
+        self.db_ms += elapsed_ms
+        stats = self._statements.get(statement)
+        if stats is None:
+            self._statements[statement] = [1, elapsed_ms, elapsed_ms]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed_ms
+            stats[2] = max(stats[2], elapsed_ms)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def slowest(self, n: int = PROFILE_TOP_STATEMENTS) -> List[Dict[str, Any]]:
+        """Sentencias con mayor tiempo total (ejecuciones × duración)."""
+        top = sorted(self._statements.items(), key=lambda item: item[1][1], reverse=True)[:n]
+        return [_statement_dict(sql, stats) for sql, stats in top]
+
+    def repeated(self, n: int = PROFILE_TOP_STATEMENTS) -> List[Dict[str, Any]]:
+        """Sentencias ejecutadas más de una vez, más repetidas primero."""
+        top = sorted(((sql, stats) for sql, stats in self._statements.items() if stats[0] > 1),
+                     key=lambda item: item[1][0], reverse=True)[:n]
+        return [_statement_dict(sql, stats) for sql, stats in top]
+
+    def server_timing(self, total_ms: float) -> str:
+        return (f'db;dur={self.db_ms:.1f};desc="{self.queries} queries", '
+                f'app;dur={total_ms:.1f}')
+
+    def summary(self, status_code: int, total_ms: float) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status_code": status_code,
+            "total_ms": round(total_ms, 2),
+            "db_ms": round(self.db_ms, 2),
+            "queries": self.queries,
+            "slowest": self.slowest(),
+            "repeated": self.repeated(),
+            "at": time.time(),
+        }
+
+
+def _statement_dict(sql: str, stats: List[float]) -> Dict[str, Any]:
+    count, total, maximum = stats
+    return {"sql": sql, "count": int(count), "total_ms": round(total, 2), "max_ms": round(maximum, 2)}
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current.get()
+
+
+# ─── Hooks de SQLAlchemy ──────────────────────────────────────
+
+_T0_KEY = "profile_cursor_t0"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault(_T0_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    started = conn.info.get(_T0_KEY)
+    if profile is None or not started:
+        return
+    profile.record(statement[:_SQL_MAX_CHARS], (time.perf_counter() - started.pop()) * 1000)
+
+
+# ─── Historial ────────────────────────────────────────────────
+
+class ProfileHistory:
+    """Últimos resúmenes de request (ring buffer en memoria, por proceso)."""
+
+    def __init__(self, size: int = PROFILE_HISTORY):
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries.append(entry)
+
+    def recent(self, limit: int = 50, slow_only: bool = False,
+               slow_ms: float = SLOW_REQUEST_MS) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = list(self._entries)
+        if slow_only:
+            entries = [e for e in entries if e["total_ms"] >= slow_ms]
+        return entries[::-1][:limit]
+
+    def by_route(self) -> List[Dict[str, Any]]:
+        """Agregado por método + ruta, las de más consultas promedio primero."""
+        with self._lock:
+            entries = list(self._entries)
+        routes: Dict[tuple, List[Dict[str, Any]]] = {}
+        for e in entries:
+            routes.setdefault((e["method"], e["path"]), []).append(e)
+        result = [
+            {
+                "method": method,
+                "path": path,
+                "requests": len(group),
+                "avg_ms": round(sum(e["total_ms"] for e in group) / len(group), 2),
+                "max_ms": max(e["total_ms"] for e in group),
+                "avg_queries": round(sum(e["queries"] for e in group) / len(group), 2),
+                "max_queries": max(e["queries"] for e in group),
+            }
+            for (method, path), group in routes.items()
+        ]
+        return sorted(result, key=lambda r: r["avg_queries"], reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+profile_history = ProfileHistory()
+
+
+# ─── Middleware ───────────────────────────────────────────────
+
+def _route_template(scope) -> str:
+    """Ruta con los parámetros como {nombre} (/api/equipos/{equipo_id}) para agrupar en el historial."""
+    segmentos = scope["path"].split("/")
+    for nombre, valor in scope.get("path_params", {}).items():
+        valor = str(valor)
+        for i in range(len(segmentos) - 1, -1, -1):
+            if segmentos[i] == valor:
+                segmentos[i] = "{" + nombre + "}"
+                break
+    return "/".join(segmentos)
+
+
+class ProfilingMiddleware:
+    """Middleware ASGI: profile por request, header Server-Timing y log de requests lentas."""
+
+    def __init__(self, app, slow_ms: float = SLOW_REQUEST_MS, history: ProfileHistory = profile_history):
+        self.app = app
+        self.slow_ms = slow_ms
+        self.history = history
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+        token = _current.set(profile)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing(profile.elapsed_ms()).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._finish(scope, profile, status_code)
+
+    def _finish(self, scope, profile: RequestProfile, status_code: int) -> None:
+        total_ms = profile.elapsed_ms()
+        profile.path = _route_template(scope)
+        if profile.path.startswith(_EXCLUDED_PREFIXES):
+            return
+
+        summary = profile.summary(status_code, total_ms)
+        self.history.add(summary)
+        if total_ms >= self.slow_ms:
+            detalle = "; ".join(f"{s['count']}x {s['total_ms']:.1f} ms {s['sql'][:120]!r}"
+                                for s in summary["slowest"][:3])
+            logger.warning(
+                f"Slow request {profile.method} {profile.path} -> {status_code}: {total_ms:.0f} ms, "
+                f"{profile.queries} queries, db {profile.db_ms:.0f} ms. Slowest: {detalle}"
+            )
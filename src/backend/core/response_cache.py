@@ -0,0 +1,120 @@
+"""
+Cache de respuestas JSON para endpoints de lectura muy consultados
+(/api/dashboard/stats, /api/master/catalogos).
+
+Cada entrada guarda el cuerpo serializado y su ETag durante
+``RESPONSE_CACHE_TTL_S`` segundos. Si el cliente envía ``If-None-Match``
+con el ETag vigente se responde 304 sin cuerpo.
+
+Invalidación: los repositorios marcan en la sesión las tablas que
+escriben (``mark_tables_dirty``); al confirmarse la transacción se
+descartan las entradas que dependen de esas tablas. El cache es por
+proceso, con varios workers el TTL acota la ventana de datos previos.
+"""
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+RESPONSE_CACHE_TTL_S = float(os.getenv("RESPONSE_CACHE_TTL_S", "30"))
+
+_DIRTY_KEY = "response_cache_dirty_tables"
+
+
+class ResponseCache:
+    """Mapa clave → (expira_en, body, etag) con dependencias por tabla."""
+
+    def __init__(self, ttl_seconds: float = RESPONSE_CACHE_TTL_S):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, bytes, str]] = {}
+        self._tables: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._version = 0          # se incrementa en cada invalidación
+        self.hits = 0
+        self.misses = 0
+
+    def respond(self, request: Request, key: str, tables: Iterable[str], build: Callable[[], Any]) -> Response:
+        """
+        Retorna la respuesta cacheada de ``key`` (o 304 si el ETag coincide);
+        si no hay entrada vigente la construye con ``build()`` y la guarda.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            _, body, etag = entry
+        else:
+            self.misses += 1
+            version = self._version
+            body = JSONResponse(content=jsonable_encoder(build())).body
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            with self._lock:
+                # Si hubo una escritura mientras se construía, no se cachea
+                if self.ttl_seconds > 0 and version == self._version:
+                    self._entries[key] = (time.monotonic() + self.ttl_seconds, body, etag)
+                    for table in tables:
+                        self._tables.setdefault(table, set()).add(key)
+
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag in _parse_if_none_match(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def invalidate_tables(self, tables: Iterable[str]) -> None:
+        with self._lock:
+            self._version += 1
+            for table in tables:
+                for key in self._tables.pop(table, ()):
+                    self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._tables.clear()
+
+
+def _parse_if_none_match(value: Optional[str]) -> Set[str]:
+    if not value:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in value.split(",")}
+
+
+response_cache = ResponseCache()
+
+
+# ─── Invalidación al confirmar la transacción ────────────────
+
+# Otros caches en memoria que dependen de tablas: (tablas, callback)
+_table_listeners: List[Tuple[Set[str], Callable[[], None]]] = []
+
+
+def on_tables_committed(tables: Iterable[str], callback: Callable[[], None]) -> None:
+    """Registra ``callback`` para cuando se confirme una escritura en alguna de ``tables``."""
+    _table_listeners.append((set(tables), callback))
+
+
+def mark_tables_dirty(db: Session, *tables: str) -> None:
+    """Registra tablas escritas en la transacción actual de ``db``."""
+    db.info.setdefault(_DIRTY_KEY, set()).update(tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    tables = session.info.pop(_DIRTY_KEY, None)
+    if tables:
+        response_cache.invalidate_tables(tables)
+        for watched, callback in _table_listeners:
+            if watched & tables:
+                callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,78 @@
+"""
+Subida de archivos por chunks fuera del event loop.
+
+``save_upload`` copia un ``UploadFile`` a disco de a ``UPLOAD_CHUNK_SIZE``
+bytes: cada chunk se escribe y se agrega al SHA-256 en el threadpool, y el
+límite ``UPLOAD_MAX_BYTES`` se controla mientras se copia.
+
+``UploadLimitMiddleware`` rechaza con 413 las peticiones cuyo
+Content-Length ya excede el límite, antes de que FastAPI lea el multipart.
+"""
+import hashlib
+import os
+from typing import BinaryIO, Iterable, Tuple
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+# Margen para los campos del formulario y los límites del multipart
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"El archivo supera el máximo permitido ({UPLOAD_MAX_BYTES} bytes).",
+    )
+
+
+def _write_chunk(out: BinaryIO, digest, chunk: bytes) -> None:
+    # hashlib libera el GIL con buffers grandes: hash y escritura en el mismo hilo
+    digest.update(chunk)
+    out.write(chunk)
+
+
+async def save_upload(file: UploadFile, path: str) -> Tuple[int, str]:
+    """Copia ``file`` a ``path`` por chunks. Retorna (tamaño en bytes, SHA-256 hex)."""
+    if file.size is not None and file.size > UPLOAD_MAX_BYTES:
+        raise _too_large()
+
+    digest = hashlib.sha256()
+    size = 0
+    out = await run_in_threadpool(open, path, "wb")
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > UPLOAD_MAX_BYTES:
+                raise _too_large()
+            await run_in_threadpool(_write_chunk, out, digest, chunk)
+    except BaseException:
+        await run_in_threadpool(out.close)
+        await run_in_threadpool(os.remove, path)
+        raise
+    await run_in_threadpool(out.close)
+    return size, digest.hexdigest()
+
+
+class UploadLimitMiddleware:
+    """Middleware ASGI: 413 temprano por Content-Length en las rutas de subida."""
+
+    def __init__(self, app, paths: Iterable[str]):
+        self.app = app
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "POST" and scope["path"] in self.paths:
+            length = dict(scope["headers"]).get(b"content-length")
+            if length and length.isdigit() and int(length) > UPLOAD_MAX_BYTES + _MULTIPART_OVERHEAD:
+                response = JSONResponse(
+                    status_code=413,
+                    content={"error": "Error de HTTP", "message": _too_large().detail},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -0,0 +1,278 @@
+"""
+Motor de carga CSV por lotes (misma configuración que ``generic_csv_loader``).
+
+El loader fila a fila normaliza los encabezados, inspecciona los tipos
+SQLAlchemy y consulta la BD en cada fila. Este motor:
+
+- compila una vez por archivo el plan de columnas (mapping, columnas
+  directas, FKs, defaults) y un conversor por tipo de columna;
+- lee el CSV en chunks de ``LOADER_CHUNK_SIZE`` filas y procesa cada
+  chunk por columnas (conversión, defaults y FKs sobre listas completas);
+- resuelve las FKs de todo el chunk con ``FKResolver.get_ids``;
+- inserta/actualiza cada chunk con ``bulk_upsert`` (un statement por
+  chunk, auditoría incluida) y confirma una vez por chunk.
+
+Las etapas están separadas: ``parse_csv`` / ``LoadPlan.parse_chunk`` no
+tocan la BD (el pipeline las ejecuta en un pool de procesos) y
+``ChunkWriter`` resuelve FKs y escribe sobre la sesión.
+"""
+import csv
+import os
+import re
+import unicodedata
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Date, DateTime, Float, Integer
+from sqlalchemy.orm import Session
+
+from src.backend.data_loaders.resolvers import FKResolver
+from src.backend.database.unit_of_work import unit_of_work
+
+LOADER_CHUNK_SIZE = int(os.getenv("LOADER_CHUNK_SIZE", "2000"))
+
+_BOM_CHARS = ('\ufeff', '\xef\xbb\xbf', '\xff\xfe', '\xfe\xff')
+
+
+def normalize_header(s: Optional[str]) -> str:
+    """Sin acentos, en minúsculas y solo alfanuméricos ("Ubicación" → "ubicacion")."""
+    if not s:
+        return ""
+    s = unicodedata.normalize('NFD', str(s))
+    s = ''.join(c for c in s if unicodedata.category(c) != 'Mn')
+    return re.sub(r'[^a-z0-9]', '', s.lower())
+
+
+def clean_header(h: Optional[str]) -> Optional[str]:
+    if not h:
+        return h
+    h = h.strip()
+    for bom in _BOM_CHARS:
+        h = h.replace(bom, '')
+    return h
+
+
+def _caster(column_type) -> Optional[Callable[[str], Any]]:
+    """Conversor de texto para el tipo de la columna (None si se deja como str)."""
+    if isinstance(column_type, Date):
+        return date.fromisoformat
+    if isinstance(column_type, DateTime):
+        return lambda v: datetime.fromisoformat(v.replace("Z", "+00:00"))
+    if isinstance(column_type, Integer):
+        return int
+    if isinstance(column_type, Float):
+        return float
+    return None
+
+
+def _cast_column(values: List[Any], cast: Callable[[str], Any]) -> List[Any]:
+    """Convierte los str no vacíos; si un valor no convierte se conserva tal cual."""
+    out = []
+    for v in values:
+        if isinstance(v, str) and v.strip():
+            try:
+                v = cast(v)
+            except (ValueError, TypeError):
+                pass
+        out.append(v)
+    return out
+
+
+class LoadPlan:
+    """
+    Plan de carga compilado a partir de los encabezados del CSV.
+
+    ``sources``: campo destino → índice de columna CSV.
+    ``fks``: campo destino → (índice de columna CSV, tabla del resolver).
+    ``defaults``: valores por defecto (se aplican si el campo falta o está vacío).
+    ``casters``: campo destino → conversor por tipo de columna.
+    """
+
+    def __init__(self, headers: List[str], config: Dict[str, Any], model):
+        model_columns = {c.name for c in model.__table__.columns}
+        pk_columns = {c.name for c in model.__table__.primary_key}
+
+        # Último encabezado con cada nombre normalizado (igual que el loader fila a fila)
+        norm_index = {normalize_header(h): i for i, h in enumerate(headers)}
+        header_index = {h: i for i, h in enumerate(headers)}
+
+        self.sources: Dict[str, int] = {}
+        for csv_field, targets in config.get("mappings", {}).items():
+            idx = norm_index.get(normalize_header(csv_field))
+            if idx is None:
+                continue
+            for target in ([targets] if isinstance(targets, str) else targets):
+                self.sources[target] = idx
+
+        # Columnas del CSV con el nombre exacto de una columna del modelo (salvo PK)
+        for header, idx in header_index.items():
+            if header in model_columns and header not in self.sources and header not in pk_columns:
+                self.sources[header] = idx
+
+        self.fks: Dict[str, Tuple[int, str]] = {}
+        for csv_field, fk_cfg in config.get("fks", {}).items():
+            idx = norm_index.get(normalize_header(csv_field))
+            if idx is None:
+                continue
+            target = fk_cfg.get("target_field")
+            if not target:
+                target = headers[idx].replace("_codigo", "_id")
+                if target not in model_columns:
+                    target = f"{fk_cfg['table']}_id"
+            self.fks[target] = (idx, fk_cfg["table"])
+
+        self.defaults: Dict[str, Any] = config.get("defaults", {})
+
+        fields = set(self.sources) | set(self.fks) | set(self.defaults)
+        self.fields: List[str] = [f for f in model.__table__.columns.keys() if f in fields]
+        self.casters: Dict[str, Callable[[str], Any]] = {
+            f: cast for f in self.fields
+            if (cast := _caster(model.__table__.c[f].type)) is not None
+        }
+        self.split_nombre = model.__name__ == "Operario" and "nombre" in fields and "apellido" not in fields
+        self.width = len(headers)
+        self.model_columns = model_columns
+
+    def parse_chunk(self, chunk: List[List[str]]) -> "ParsedChunk":
+        """
+        Etapa sin BD (se puede ejecutar en otro proceso): columnas convertidas
+        y valores crudos de las FKs, que se resuelven luego con ``resolve_chunk``.
+        """
+        n = len(chunk)
+        # Filas cortas se completan con None (como csv.DictReader)
+        chunk = [row if len(row) >= self.width else row + [None] * (self.width - len(row)) for row in chunk]
+        csv_columns = list(zip(*chunk)) if chunk else []
+
+        columns: Dict[str, List[Any]] = {}
+        for field, idx in self.sources.items():
+            columns[field] = list(csv_columns[idx])
+        fk_raw = {field: list(csv_columns[idx]) for field, (idx, _) in self.fks.items()}
+
+        for field, def_val in self.defaults.items():
+            if field not in self.fks:
+                columns[field] = _apply_default(columns.get(field), def_val, n)
+        for field, cast in self.casters.items():
+            if field not in self.fks:
+                columns[field] = _cast_column(columns[field], cast)
+
+        if self.split_nombre:
+            partes = [v.split(" ", 1) if isinstance(v, str) else [v] for v in columns["nombre"]]
+            columns["nombre"] = [p[0] for p in partes]
+            columns["apellido"] = [p[1] if len(p) > 1 else "." for p in partes]
+
+        return n, columns, fk_raw
+
+    def resolve_chunk(self, parsed: "ParsedChunk", resolver: Optional[FKResolver]) -> List[Dict[str, Any]]:
+        """Resuelve las FKs del chunk y arma los dicts listos para ``bulk_upsert``."""
+        n, columns, fk_raw = parsed
+        columns = dict(columns)
+        for field, raw in fk_raw.items():
+            ids = resolver.get_ids(self.fks[field][1], raw)
+            previo = columns.get(field)
+            # Un FK vacío no pisa el valor previo del campo (si lo había)
+            values = ids if previo is None else [
+                fk_id if fk_id is not None else p for fk_id, p in zip(ids, previo)
+            ]
+            if field in self.defaults:
+                values = _apply_default(values, self.defaults[field], n)
+            if field in self.casters:
+                values = _cast_column(values, self.casters[field])
+            columns[field] = values
+
+        fields = [f for f in columns if f in self.model_columns]
+        return [dict(zip(fields, values)) for values in zip(*(columns[f] for f in fields))]
+
+    def build_rows(self, chunk: List[List[str]], resolver: Optional[FKResolver]) -> List[Dict[str, Any]]:
+        """Convierte un chunk de filas CSV en dicts listos para ``bulk_upsert``."""
+        return self.resolve_chunk(self.parse_chunk(chunk), resolver)
+
+
+# (filas, columnas convertidas, valores crudos de FKs)
+ParsedChunk = Tuple[int, Dict[str, List[Any]], Dict[str, List[Any]]]
+
+
+def _apply_default(values: Optional[List[Any]], def_val: Any, n: int) -> List[Any]:
+    if values is None:
+        return [def_val] * n
+    return [def_val if v is None or v == "" else v for v in values]
+
+
+def _read_csv(config: Dict[str, Any], csv_path: str, chunk_size: int) -> Iterator[Tuple[List[str], List[List[str]]]]:
+    """Itera (encabezados, chunk de filas) del archivo."""
+    with open(csv_path, newline="", encoding=config.get("encoding", "utf-8")) as f:
+        reader = csv.reader(f, delimiter=config.get("delimiter", ","))
+        headers = [clean_header(h) for h in next(reader, [])]
+        while True:
+            chunk = list(islice(reader, chunk_size))
+            if not chunk:
+                return
+            yield headers, chunk
+
+
+def parse_csv(config: Dict[str, Any], csv_path: str,
+              chunk_size: int = LOADER_CHUNK_SIZE) -> Tuple[List[str], List[ParsedChunk]]:
+    """
+    Etapa de parseo de un archivo completo (lectura, mapeo y conversión de
+    tipos) sin acceso a la BD; la usa el pipeline paralelo en un pool de procesos.
+    """
+    headers: List[str] = []
+    parsed: List[ParsedChunk] = []
+    plan = None
+    for headers, chunk in _read_csv(config, csv_path, chunk_size):
+        if plan is None:
+            plan = LoadPlan(headers, config, config["repo"]().model)
+        parsed.append(plan.parse_chunk(chunk))
+    return headers, parsed
+
+
+class ChunkWriter:
+    """Etapa de escritura: resuelve FKs y hace el upsert de cada chunk en ``db``."""
+
+    def __init__(self, config: Dict[str, Any], headers: List[str], db: Session):
+        self.repo = config["repo"]()
+        self.unique_field = config.get("unique_field", "codigo")
+        self.plan = LoadPlan(headers, config, self.repo.model)
+        self.db = db
+        fks_config = config.get("fks", {})
+        self.resolver = None
+        if fks_config:
+            self.resolver = FKResolver(db, {fk["table"]: fk["repo"] for fk in fks_config.values()})
+        self.total = 0
+
+    def write(self, parsed: ParsedChunk, source: str = "") -> int:
+        n = parsed[0]
+        try:
+            rows = self.plan.resolve_chunk(parsed, self.resolver)
+        except Exception as e:
+            print(f"Error en filas {self.total + 1}-{self.total + n} de {source}: {str(e)}")
+            raise
+
+        sin_clave = [row for row in rows if row.get(self.unique_field) is None]
+        # Última aparición de cada clave (como el upsert fila a fila)
+        con_clave = list({row[self.unique_field]: row for row in rows
+                          if row.get(self.unique_field) is not None}.values())
+        with unit_of_work(self.db):
+            if sin_clave:
+                self.repo.bulk_create(self.db, sin_clave, batch_size=len(sin_clave))
+            if con_clave:
+                self.repo.bulk_upsert(self.db, con_clave, key=self.unique_field, batch_size=len(con_clave))
+        self.total += n
+        return n
+
+
+def bulk_csv_loader(config: Dict[str, Any], chunk_size: int = LOADER_CHUNK_SIZE) -> Callable[[str, Session], int]:
+    """
+    Loader por lotes con la misma configuración de pipeline.json que
+    ``generic_csv_loader``. El loader retorna la cantidad de filas procesadas.
+    """
+
+    def loader(csv_path: str, db: Session) -> int:
+        writer = None
+        for headers, chunk in _read_csv(config, csv_path, chunk_size):
+            if writer is None:
+                writer = ChunkWriter(config, headers, db)
+            writer.write(writer.plan.parse_chunk(chunk), csv_path)
+        return writer.total if writer else 0
+
+    return loader
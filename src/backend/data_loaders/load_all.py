@@ -1,7 +1,7 @@
 import os
 import json
 
-from src.backend.data_loaders.pipeline_runner import run_pipeline
+from src.backend.data_loaders.pipeline_runner import run_pipeline, run_pipeline_dag
 from src.backend.data_loaders.generic_loader import generic_csv_loader
 
 from src.backend.repositories.registry import REPOSITORY_REGISTRY
@@ -9,6 +9,9 @@ from src.backend.repositories.registry import REPOSITORY_REGISTRY
 
 CONFIG_PATH = "src/config/pipeline.json"
 
+# bulk: motor por lotes con DAG paralelo (run_pipeline_dag); row: loader fila a fila secuencial
+LOADER_ENGINE = os.getenv("LOADER_ENGINE", "bulk")
+
 
 def main():
 
@@ -52,17 +55,20 @@ def main():
 
         path = os.path.join(data_dir, item["csv"])
 
-        loader = generic_csv_loader(item)
-
-        jobs.append(
-            (item["name"], loader, path)
-        )
+        if LOADER_ENGINE == "bulk":
+            # El runner paralelo recibe la configuración: parsea en procesos y escribe por nivel
+            jobs.append((item["name"], item, path))
+        else:
+            jobs.append((item["name"], generic_csv_loader(item), path))
 
     # ------------------------
     # Ejecutar
     # ------------------------
 
-    run_pipeline(jobs)
+    if LOADER_ENGINE == "bulk":
+        run_pipeline_dag(jobs)
+    else:
+        run_pipeline(jobs)
 
 
 if __name__ == "__main__":
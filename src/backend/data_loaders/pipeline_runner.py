@@ -1,12 +1,20 @@
-from typing import Callable, List, Tuple
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from sqlalchemy.orm import Session
 
 from src.backend.database.db_manager import db_manager
+from src.backend.database.unit_of_work import unit_of_work
+from src.backend.data_loaders.bulk_loader import LOADER_CHUNK_SIZE, ChunkWriter, parse_csv
 
 
 Loader = Callable[[str, Session], None]
 
+# Procesos para la etapa de parseo del pipeline paralelo (1 = sin pool)
+LOADER_WORKERS = int(os.getenv("LOADER_WORKERS", str(os.cpu_count() or 1)))
+
 
 def run_pipeline(loaders: List[Tuple[str, Loader, str]]):
     """
@@ -17,20 +25,19 @@ def run_pipeline(loaders: List[Tuple[str, Loader, str]]):
 
     try:
 
-        for name, loader, file_path in loaders:
+        # Los repositorios solo hacen flush: un único commit al final
+        with unit_of_work(db):
 
-            print(f"Cargando {name}...")
+            for name, loader, file_path in loaders:
 
-            loader(file_path, db)
+                print(f"Cargando {name}...")
 
-        db.commit()
+                loader(file_path, db)
 
         print("Pipeline completado correctamente.")
 
     except Exception as e:
 
-        db.rollback()
-
         print("ERROR: Rollback global ejecutado.")
         print(str(e))
 
@@ -39,3 +46,146 @@ def run_pipeline(loaders: List[Tuple[str, Loader, str]]):
     finally:
 
         db.close()
+
+
+# =========================
+# PIPELINE PARALELO (DAG)
+# =========================
+
+def build_dependencies(jobs: List[Tuple[str, Dict[str, Any], str]]) -> Dict[str, Set[str]]:
+    """
+    {job: jobs de los que depende}. Un job depende de otro si carga una
+    tabla referenciada por sus ``fks`` o por una ForeignKey de su modelo.
+    """
+    table_job = {config["repo"]().model.__tablename__: name for name, config, _ in jobs}
+    deps: Dict[str, Set[str]] = {}
+    for name, config, _ in jobs:
+        model = config["repo"]().model
+        tables = {fk["repo"]().model.__tablename__ for fk in config.get("fks", {}).values()}
+        tables |= {fk.column.table.name for fk in model.__table__.foreign_keys}
+        deps[name] = {table_job[t] for t in tables if t in table_job and table_job[t] != name}
+    return deps
+
+
+def dependency_levels(deps: Dict[str, Set[str]]) -> List[List[str]]:
+    """Niveles topológicos: cada job queda en el nivel siguiente al de su última dependencia."""
+    levels: List[List[str]] = []
+    done: Set[str] = set()
+    pending = list(deps)
+    while pending:
+        level = [name for name in pending if deps[name] <= done]
+        if not level:
+            raise ValueError(f"Dependencias cíclicas entre: {', '.join(pending)}")
+        levels.append(level)
+        done.update(level)
+        pending = [name for name in pending if name not in done]
+    return levels
+
+
+def _parse_job(config: Dict[str, Any], file_path: str, chunk_size: int):
+    """Etapa de parseo de un job (se ejecuta en un proceso del pool)."""
+    start = time.perf_counter()
+    headers, parsed = parse_csv(config, file_path, chunk_size)
+    return headers, parsed, time.perf_counter() - start
+
+
+def run_pipeline_dag(
+    jobs: List[Tuple[str, Dict[str, Any], str]],
+    db: Optional[Session] = None,
+    workers: int = LOADER_WORKERS,
+    chunk_size: int = LOADER_CHUNK_SIZE,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Ejecuta los jobs de pipeline.json respetando el DAG de dependencias.
+
+    El parseo y la conversión de tipos de todos los archivos arranca en
+    paralelo en un pool de ``workers`` procesos; las escrituras se hacen
+    nivel por nivel en una única sesión y una única transacción (si un
+    job falla se hace rollback de todo). Retorna los tiempos por job:
+    {job: {nivel, filas, parseo, espera, escritura}}.
+    """
+
+    own_session = db is None
+    if own_session:
+        db = db_manager.SessionLocal()
+
+    by_name = {name: (config, path) for name, config, path in jobs}
+    levels = dependency_levels(build_dependencies(jobs))
+    timings: Dict[str, Dict[str, float]] = {}
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    start = time.perf_counter()
+
+    try:
+
+        futures = {
+            name: pool.submit(_parse_job, config, path, chunk_size)
+            for name, (config, path) in by_name.items()
+        } if pool else {}
+
+        with unit_of_work(db):
+
+            for nivel, level in enumerate(levels):
+
+                print(f"Nivel {nivel}: {', '.join(level)}")
+
+                for name in level:
+
+                    config, path = by_name[name]
+
+                    wait_start = time.perf_counter()
+                    if pool:
+                        headers, parsed, parse_time = futures[name].result()
+                    else:
+                        headers, parsed, parse_time = _parse_job(config, path, chunk_size)
+                    wait_time = time.perf_counter() - wait_start
+
+                    write_start = time.perf_counter()
+                    writer = ChunkWriter(config, headers, db)
+                    for chunk in parsed:
+                        writer.write(chunk, path)
+
+                    timings[name] = {
+                        "nivel": nivel,
+                        "filas": writer.total,
+                        "parseo": parse_time,
+                        "espera": wait_time if pool else 0.0,
+                        "escritura": time.perf_counter() - write_start,
+                    }
+
+            commit_start = time.perf_counter()
+
+        # Incluye el insert de la auditoría encolada durante toda la carga
+        commit_time = time.perf_counter() - commit_start
+
+        print("Pipeline completado correctamente.")
+
+    except Exception as e:
+
+        print("ERROR: Rollback global ejecutado.")
+        print(str(e))
+
+        raise
+
+    finally:
+
+        if pool:
+            pool.shutdown(cancel_futures=True)
+        if own_session:
+            db.close()
+
+    _print_timings(timings, commit_time, time.perf_counter() - start)
+
+    return timings
+
+
+def _print_timings(timings: Dict[str, Dict[str, float]], commit_time: float, total: float) -> None:
+    print(f"{'job':<28} {'nivel':>5} {'filas':>9} {'parseo':>8} {'espera':>8} {'escritura':>10}")
+    for name, t in timings.items():
+        print(f"{name:<28} {t['nivel']:>5} {t['filas']:>9} {t['parseo']:>7.2f}s {t['espera']:>7.2f}s {t['escritura']:>9.2f}s")
+    print(
+        f"Etapas: parseo {sum(t['parseo'] for t in timings.values()):.2f}s (suma en workers)"
+        f" | espera {sum(t['espera'] for t in timings.values()):.2f}s"
+        f" | escritura {sum(t['escritura'] for t in timings.values()):.2f}s"
+        f" | commit {commit_time:.2f}s"
+        f" | total {total:.2f}s"
+    )
@@ -1,4 +1,4 @@
-from typing import Dict, Type
+from typing import Dict, Iterable, List, Optional, Type
 
 from sqlalchemy.orm import Session
 
@@ -75,3 +75,38 @@ class FKResolver:
             )
 
         return table_map[key]
+
+    def get_ids(self, table: str, keys: Iterable[Optional[str]]) -> List[Optional[int]]:
+        """
+        Resuelve una columna completa de valores en una pasada.
+        Los valores vacíos (None o "") se devuelven como None.
+
+        Ejemplo:
+        get_ids("planta", ["PL01", "", "PL02"]) → [5, None, 6]
+        """
+
+        if table not in self._maps:
+            raise ValueError(
+                f"Tabla no registrada en FKResolver: {table}"
+            )
+
+        table_map = self._maps[table]
+        ids = []
+        faltantes = []
+
+        for key in keys:
+            if key is None or not key.strip():
+                ids.append(None)
+            elif key in table_map:
+                ids.append(table_map[key])
+            else:
+                faltantes.append(key)
+                ids.append(None)
+
+        if faltantes:
+            raise ValueError(
+                f"Valor '{faltantes[0]}' no existe en '{table}'"
+                + (f" (y {len(faltantes) - 1} más)" if len(faltantes) > 1 else "")
+            )
+
+        return ids
@@ -1,21 +1,114 @@
 #src/backend/database/db_manager.py
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
 
 from src.backend.models.base import Base
 
 
-class DataBaseManager:
+# =========================
+# Perfil de motor SQLite
+# =========================
+
+# dev: SQLite sin ajustes. production: WAL + pragmas de abajo + pool de solo lectura
+DB_PROFILE = os.getenv("DB_PROFILE", "dev").lower()
+
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))
 
-    def __init__(self, db_url: str):
 
-        self.engine = create_engine(
-            db_url,
-            connect_args={"check_same_thread": False},  # Requerido para SQLite
-            pool_pre_ping=True
+def sqlite_pragmas(profile: str) -> dict:
+    """PRAGMAs que se aplican a cada conexión nueva según el perfil."""
+    if profile != "production":
+        return {}
+    return {
+        "journal_mode": "WAL",
+        "synchronous": SQLITE_SYNCHRONOUS,
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": SQLITE_MMAP_SIZE,
+        # Negativo = KiB en lugar de páginas
+        "cache_size": -SQLITE_CACHE_SIZE_KB,
+        "temp_store": "MEMORY",
+    }
+
+
+# =========================
+# Pool para servidores (PostgreSQL)
+# =========================
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE_S = int(os.getenv("DB_POOL_RECYCLE_S", "1800"))
+DB_POOL_TIMEOUT_S = int(os.getenv("DB_POOL_TIMEOUT_S", "30"))
+DB_CONNECT_TIMEOUT_S = int(os.getenv("DB_CONNECT_TIMEOUT_S", "10"))
+# 0 = sin límite
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+DB_APPLICATION_NAME = os.getenv("DB_APPLICATION_NAME", "lims-backend")
+
+# Driver async por dialecto para la ruta AsyncSession
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def connect_args(db_url: str) -> dict:
+    """``connect_args`` según dialecto y driver de la URL."""
+    url = make_url(db_url)
+    backend, driver = url.get_backend_name(), url.get_driver_name()
+    if backend == "sqlite":
+        return {"check_same_thread": False}  # Requerido para SQLite
+    if backend != "postgresql":
+        return {}
+    if driver == "asyncpg":
+        settings = {"application_name": DB_APPLICATION_NAME}
+        if DB_STATEMENT_TIMEOUT_MS:
+            settings["statement_timeout"] = str(DB_STATEMENT_TIMEOUT_MS)
+        return {"timeout": DB_CONNECT_TIMEOUT_S, "server_settings": settings}
+    args = {"connect_timeout": DB_CONNECT_TIMEOUT_S, "application_name": DB_APPLICATION_NAME}
+    if DB_STATEMENT_TIMEOUT_MS:
+        args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+    return args
+
+
+def engine_options(db_url: str) -> dict:
+    """Argumentos de ``create_engine`` (connect_args y tamaño del pool)."""
+    options = {"connect_args": connect_args(db_url)}
+    if make_url(db_url).get_backend_name() != "sqlite":
+        options.update(
+            pool_pre_ping=True,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_recycle=DB_POOL_RECYCLE_S,
+            pool_timeout=DB_POOL_TIMEOUT_S,
         )
+    return options
+
+
+def async_url(db_url: str) -> str:
+    """URL con el driver async del dialecto (``postgresql://`` → ``postgresql+asyncpg://``)."""
+    url = make_url(db_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Sin driver async configurado para '{backend}'")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def _is_sqlite_memory(db_url: str) -> bool:
+    return db_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in db_url
+
+
+class DataBaseManager:
+
+    def __init__(self, db_url: str, profile: str = DB_PROFILE):
+
+        self.db_url = db_url
+        self.profile = profile
+        self.is_sqlite = make_url(db_url).get_backend_name() == "sqlite"
+
+        self.engine = self._create_engine(db_url)
 
         self.SessionLocal = sessionmaker(
             autocommit=False,
@@ -23,6 +116,68 @@ class DataBaseManager:
             bind=self.engine
         )
 
+        # Las lecturas (GET) usan su propio pool: en WAL no esperan a los escritores
+        self.read_engine = self.engine
+        if self.is_sqlite and profile == "production" and not _is_sqlite_memory(db_url):
+            self.read_engine = self._create_engine(db_url, read_only=True)
+
+        self.ReadSessionLocal = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=self.read_engine
+        )
+
+        # Ruta AsyncSession opcional: el engine async se crea al primer uso
+        self._async_engine = None
+        self._async_session_factory = None
+
+    def _create_engine(self, db_url: str, read_only: bool = False) -> Engine:
+
+        options = engine_options(db_url)
+        if self.is_sqlite and read_only:
+            options.update(pool_size=SQLITE_READ_POOL_SIZE, max_overflow=SQLITE_READ_POOL_SIZE)
+
+        engine = create_engine(db_url, **options)
+        self._install_pragmas(engine, read_only)
+        return engine
+
+    def _install_pragmas(self, engine: Engine, read_only: bool) -> None:
+
+        if not self.is_sqlite:
+            return
+
+        pragmas = sqlite_pragmas(self.profile)
+        if pragmas or read_only:
+
+            @event.listens_for(engine, "connect")
+            def _set_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+                if read_only:
+                    cursor.execute("PRAGMA query_only=ON")
+                cursor.close()
+
+    @property
+    def AsyncSessionLocal(self):
+        """
+        ``async_sessionmaker`` sobre el driver async del dialecto (asyncpg /
+        aiosqlite, opcionales). Pensado para routers de solo lectura: con el
+        perfil production de SQLite sus conexiones también son de solo lectura.
+        """
+        if self._async_session_factory is None:
+            from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+            url = async_url(self.db_url)
+            self._async_engine = create_async_engine(url, **engine_options(url))
+            self._install_pragmas(self._async_engine.sync_engine, self.read_engine is not self.engine)
+            self._async_session_factory = async_sessionmaker(
+                self._async_engine,
+                autoflush=False,
+                expire_on_commit=False
+            )
+        return self._async_session_factory
+
     def init_db(self):
         Base.metadata.create_all(bind=self.engine)
 
@@ -41,6 +196,28 @@ class DataBaseManager:
         finally:
             db.close()
 
+    def get_read_session(self):
+        """Sesión del pool de solo lectura (no hace commit)."""
+
+        db = self.ReadSessionLocal()
+
+        try:
+            yield db
+
+        finally:
+            db.close()
+
+    async def get_async_session(self):
+        """Sesión async de solo lectura (no hace commit)."""
+
+        async with self.AsyncSessionLocal() as db:
+            yield db
+
+    def dispose(self):
+        self.engine.dispose()
+        if self.read_engine is not self.engine:
+            self.read_engine.dispose()
+
 
 # =========================
 # Configuración SQLite
@@ -0,0 +1,103 @@
+#src/backend/database/unit_of_work.py
+"""
+Unit of Work sobre una Session de SQLAlchemy.
+
+Dentro de un ``unit_of_work(db)`` los repositorios solo hacen ``flush()``,
+los registros de auditoría se encolan en la sesión y se persiste todo con
+un único ``commit()`` al salir del bloque más externo. Si ocurre una
+excepción se hace rollback de todo el bloque (operación atómica).
+
+Los eventos de auditoría se insertan con un único executemany antes del
+commit, o con ``AUDIT_MODE=async`` se escriben en el journal del
+AuditWriter antes del commit y se le entregan una vez confirmada la
+transacción (ver ``core/audit_writer``).
+"""
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from src.backend.models.audit import AuditLog
+from src.backend.core.audit_writer import get_audit_writer
+from src.backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_DEPTH_KEY = "uow_depth"
+_AUDIT_QUEUE_KEY = "uow_audit_queue"
+
+
+def in_unit_of_work(db: Session) -> bool:
+    """Indica si la sesión tiene un unit of work abierto."""
+    return db.info.get(_DEPTH_KEY, 0) > 0
+
+
+def audit_queue(db: Session) -> List[dict]:
+    """Cola de eventos de auditoría (columnas de AuditLog) del unit of work actual."""
+    return db.info.setdefault(_AUDIT_QUEUE_KEY, [])
+
+
+def commit_with_audit(db: Session) -> None:
+    """
+    Confirma la transacción junto con la cola de auditoría. En modo síncrono
+    los eventos se insertan en la misma transacción; en modo asíncrono se
+    escriben en el journal (fsync) antes del commit y se encolan después,
+    de modo que un crash entre ambos no pierde el audit trail.
+    """
+    queue = db.info.pop(_AUDIT_QUEUE_KEY, None) or []
+    writer = get_audit_writer() if queue else None
+    if writer is None:
+        if queue:
+            db.execute(insert(AuditLog), queue)
+        db.commit()
+        return
+
+    journaled = writer.journal(queue)
+    try:
+        db.commit()
+    except Exception:
+        writer.discard(journaled)
+        raise
+    try:
+        writer.enqueue(journaled)
+    except TimeoutError as e:
+        # El cambio ya está confirmado y sus eventos en el journal: recover() los reinserta
+        logger.error(f"Audit trail pendiente de persistir: {e}")
+
+
+def commit(db: Session) -> None:
+    """
+    Commit consciente del unit of work: dentro de un bloque solo hace flush,
+    fuera de él confirma la transacción como antes.
+    """
+    if in_unit_of_work(db):
+        db.flush()
+    else:
+        db.commit()
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Abre un unit of work sobre ``db``. Los bloques pueden anidarse; solo el
+    más externo hace commit (o rollback si se propaga una excepción).
+
+    Uso:
+        with unit_of_work(db):
+            repo_a.create(db, {...})
+            repo_b.update(db, obj, {...})
+    """
+    depth = db.info.get(_DEPTH_KEY, 0)
+    db.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            commit_with_audit(db)
+    except Exception:
+        if depth == 0:
+            db.info.pop(_AUDIT_QUEUE_KEY, None)
+            db.rollback()
+        raise
+    finally:
+        db.info[_DEPTH_KEY] = depth
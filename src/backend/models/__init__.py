@@ -2,19 +2,21 @@
 from src.backend.models.base import Base
 
 from src.backend.models.auth import Usuario, Rol, UsuarioRol, AuditTrail, Revision, Operario, Laboratorio, UsuarioLaboratorio
-from src.backend.models.dim import Sistema, Planta, Area, TipoEquipo, EstadoEquipo, EquipoInstrumento, ZonaEquipo, CalibracionCalificacionEquipo, HistoricoEstadoEquipo, PuntoMuestreo
+from src.backend.models.dim import Sistema, Planta, Area, TipoEquipo, EstadoEquipo, EquipoInstrumento, ZonaEquipo, CalibracionCalificacionEquipo, CumplimientoEquipo, HistoricoEstadoEquipo, PuntoMuestreo
 from src.backend.models.master import Producto, Especificacion, MetodoVersion, CepaReferencia
 from src.backend.models.fact import EstadoManufactura, OrdenManufactura, Manufactura, ManufacturaOperario, HistoricoEstadoManufactura, EstadoSolicitud, SolicitudMuestreo, SolicitudMuestreoEquipo, HistoricoSolicitudMuestreo, Muestreo, Muestra, EnvioMuestra, Recepcion, EstadoAnalisis, Analisis, UsoEquipoAnalisis, HistorialEstadoAnalisis, Incubacion, Resultado
 from src.backend.models.inventory import PolvoSuplemento, RecepcionPolvoSuplemento, StockPolvoSuplemento, UsoPolvoSuplemento, MedioPreparado, OrdenPreparacionMedio, EstadoQC, StockMedios, AprobacionMedios, UsoMedios, UsoCepa
 from src.backend.models.documents import Documento
 from src.backend.models.inspection import Sampling
+from src.backend.models.dashboard import ContadorDashboard
 
 __all__ = [
     "Base",
     "Usuario", "Rol", "UsuarioRol", "AuditTrail", "Revision", "Operario",
-    "Sistema", "Planta", "Area", "TipoEquipo", "EstadoEquipo", "EquipoInstrumento", "ZonaEquipo", "CalibracionCalificacionEquipo", "HistoricoEstadoEquipo", "PuntoMuestreo",
+    "Sistema", "Planta", "Area", "TipoEquipo", "EstadoEquipo", "EquipoInstrumento", "ZonaEquipo", "CalibracionCalificacionEquipo", "CumplimientoEquipo", "HistoricoEstadoEquipo", "PuntoMuestreo",
     "Producto", "Especificacion", "MetodoVersion", "CepaReferencia",
     "EstadoManufactura", "OrdenManufactura", "Manufactura", "ManufacturaOperario", "HistoricoEstadoManufactura", "EstadoSolicitud", "SolicitudMuestreo", "HistoricoSolicitudMuestreo", "Muestreo", "Muestra", "EnvioMuestra", "Recepcion", "EstadoAnalisis", "Analisis", "HistorialEstadoAnalisis", "Incubacion", "Resultado",
     "PolvoSuplemento", "RecepcionPolvoSuplemento", "StockPolvoSuplemento", "UsoPolvoSuplemento", "MedioPreparado", "OrdenPreparacionMedio", "EstadoQC", "StockMedios", "AprobacionMedios", "UsoMedios", "UsoCepa",
-    "Sampling"
+    "Sampling",
+    "ContadorDashboard"
 ]
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey, Index
 from datetime import datetime, timezone
 from src.backend.models.base import Base
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index('idx_audit_logs_fecha', 'fecha'),
+        Index('idx_audit_logs_tabla_registro', 'tabla_nombre', 'registro_id'),
+    )
 
     audit_log_id = Column(Integer, primary_key=True, autoincrement=True)
     tabla_nombre = Column(String(100), nullable=False)
@@ -1,11 +1,14 @@
 from datetime import date, datetime, timezone
-from sqlalchemy import Column, Integer, String, Boolean, BigInteger, Date, DateTime, ForeignKey, Float, Text, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, BigInteger, Date, DateTime, ForeignKey, Float, Text, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 
 from src.backend.models.base import Base
 
 class Usuario(Base):
     __tablename__ = "usuario"
+    __table_args__ = (
+        Index('idx_usuario_nombre', 'nombre'),
+    )
 
     usuario_id = Column(Integer, primary_key=True)
     nombre = Column(String, nullable=False)
@@ -29,6 +32,9 @@ class Rol(Base):
 
 class UsuarioRol(Base):
     __tablename__ = "usuario_rol"
+    __table_args__ = (
+        Index('idx_usuario_rol_usuario', 'usuario_id'),
+    )
 
     usuario_rol_id = Column(Integer, primary_key=True)
     usuario_id = Column(Integer, ForeignKey("usuario.usuario_id"), nullable=False)
@@ -49,6 +55,9 @@ class Laboratorio(Base):
 
 class UsuarioLaboratorio(Base):
     __tablename__ = "usuario_laboratorio"
+    __table_args__ = (
+        Index('idx_usuario_laboratorio_usuario', 'usuario_id'),
+    )
 
     usuario_laboratorio_id = Column(Integer, primary_key=True)
     usuario_id = Column(Integer, ForeignKey("usuario.usuario_id"), nullable=False)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String
+
+from src.backend.models.base import Base
+
+
+class ContadorDashboard(Base):
+    """
+    Contadores materializados del dashboard, mantenidos por los servicios.
+
+    ``periodo`` es la fecha ISO (YYYY-MM-DD) para contadores diarios o
+    ``"total"`` para acumulados (ej. análisis por estado).
+    """
+    __tablename__ = "contador_dashboard"
+
+    metrica = Column(String(64), primary_key=True)   # ej: 'solicitudes', 'analisis_estado:2'
+    periodo = Column(String(10), primary_key=True)
+    valor = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ContadorDashboard({self.metrica} {self.periodo}={self.valor})>"
@@ -2,7 +2,7 @@ from datetime import date, datetime, timezone
 from sqlalchemy import (
     Column, Integer,
     String, Boolean, Date,
-    DateTime, ForeignKey, UniqueConstraint)
+    DateTime, ForeignKey, Index, UniqueConstraint)
 from sqlalchemy.orm import relationship
 
 from src.backend.models.base import Base
@@ -78,6 +78,7 @@ class EquipoInstrumento(Base):
     zonas = relationship("ZonaEquipo", back_populates="equipo", cascade="all, delete-orphan")
     calibraciones = relationship("CalibracionCalificacionEquipo", back_populates="equipo", cascade="all, delete-orphan")
     historicos_estado = relationship("HistoricoEstadoEquipo", back_populates="equipo", cascade="all, delete-orphan")
+    cumplimiento = relationship("CumplimientoEquipo", uselist=False, cascade="all, delete-orphan")
 
 class ZonaEquipo(Base):
     __tablename__ = "zona_equipo"
@@ -101,6 +102,9 @@ class ZonaArea(Base):
 
 class CalibracionCalificacionEquipo(Base):
     __tablename__ = "calibracion_calificacion_equipo"
+    __table_args__ = (
+        Index('idx_calibracion_equipo_fecha', 'equipo_instrumento_id', 'fecha'),
+    )
 
     calibracion_calificacion_equipo_id = Column(Integer, primary_key=True)
     tipo = Column(String, nullable=False)
@@ -112,6 +116,28 @@ class CalibracionCalificacionEquipo(Base):
     equipo = relationship("EquipoInstrumento", back_populates="calibraciones")
     operario = relationship("Operario", primaryjoin="CalibracionCalificacionEquipo.operario_id==Operario.operario_id")
 
+class CumplimientoEquipo(Base):
+    """
+    Índice de cumplimiento: última calibración/calificación (por fecha) de
+    cada equipo, mantenido al registrar calibraciones. Un equipo sin fila no
+    tiene calibraciones; está en cumplimiento si ``vence`` es nulo o no pasó.
+    """
+    __tablename__ = "cumplimiento_equipo"
+    __table_args__ = (
+        Index('idx_cumplimiento_equipo_vence', 'vence'),
+    )
+
+    equipo_instrumento_id = Column(
+        Integer, ForeignKey("equipo_instrumento.equipo_instrumento_id", ondelete="CASCADE"), primary_key=True)
+    calibracion_calificacion_equipo_id = Column(
+        Integer, ForeignKey("calibracion_calificacion_equipo.calibracion_calificacion_equipo_id", ondelete="CASCADE"),
+        nullable=False)
+    fecha = Column(Date, nullable=False)
+    vence = Column(Date, nullable=True)
+
+    # Ordena el flush: la fila del índice se borra antes que la calibración que referencia
+    calibracion = relationship("CalibracionCalificacionEquipo")
+
 class HistoricoEstadoEquipo(Base):
     __tablename__ = "historico_estado_equipo"
 
@@ -12,6 +12,7 @@ class Documento(Base):
     nombre = Column(String(255), nullable=False)
     tipo_mime = Column(String(100), nullable=False)
     tamano_bytes = Column(Integer, nullable=False)
+    sha256 = Column(String(64), nullable=True)  # Digest del contenido (calculado al subir)
     ruta_archivo = Column(String(500), nullable=False)
     
     # Polymorphic association to link to any entity
@@ -27,6 +28,8 @@ class Documento(Base):
     # Composite index for quick lookups
     __table_args__ = (
         Index('idx_documento_entidad', 'entidad_tipo', 'entidad_id'),
+        # Referencias a un blob (reference_count / collect_blob / collect_garbage)
+        Index('idx_documento_sha256', 'sha256'),
     )
 
     def __repr__(self):
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Boolean, Float, Date, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, Float, Date, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 
 from src.backend.models.base import Base
@@ -87,6 +87,9 @@ class EstadoSolicitud(Base):
 
 class SolicitudMuestreo(Base):
     __tablename__ = "solicitud_muestreo"
+    __table_args__ = (
+        Index('idx_solicitud_muestreo_fecha', 'fecha'),
+    )
 
     solicitud_muestreo_id = Column(Integer, primary_key=True)
     usuario_id = Column(Integer, ForeignKey("usuario.usuario_id"), nullable=False)
@@ -120,6 +123,9 @@ class SolicitudMuestreo(Base):
 
 class SolicitudMuestreoEquipo(Base):
     __tablename__ = "solicitud_muestreo_equipo"
+    __table_args__ = (
+        Index('idx_solicitud_muestreo_equipo_solicitud', 'solicitud_muestreo_id'),
+    )
 
     solicitud_muestreo_equipo_id = Column(Integer, primary_key=True)
     solicitud_muestreo_id = Column(Integer, ForeignKey("solicitud_muestreo.solicitud_muestreo_id"), nullable=False)
@@ -144,6 +150,9 @@ class HistoricoSolicitudMuestreo(Base):
 
 class Muestreo(Base):
     __tablename__ = "muestreo"
+    __table_args__ = (
+        Index('idx_muestreo_solicitud', 'solicitud_muestreo_id'),
+    )
 
     muestreo_id = Column(Integer, primary_key=True)
     solicitud_muestreo_id = Column(Integer, ForeignKey("solicitud_muestreo.solicitud_muestreo_id"), nullable=False)
@@ -155,6 +164,9 @@ class Muestreo(Base):
 
 class Muestra(Base):
     __tablename__ = "muestra"
+    __table_args__ = (
+        Index('idx_muestra_muestreo', 'muestreo_id', 'muestra_id'),
+    )
 
     muestra_id = Column(Integer, primary_key=True)
     muestreo_id = Column(Integer, ForeignKey("muestreo.muestreo_id"), nullable=False)
@@ -169,6 +181,9 @@ class Muestra(Base):
 
 class EnvioMuestra(Base):
     __tablename__ = "envio_muestra"
+    __table_args__ = (
+        Index('idx_envio_muestra_muestra', 'muestra_id', 'envio_muestra_id'),
+    )
 
     envio_muestra_id = Column(Integer, primary_key=True)
     muestra_id = Column(Integer, ForeignKey("muestra.muestra_id"), nullable=False)
@@ -183,6 +198,9 @@ class EnvioMuestra(Base):
 
 class Recepcion(Base):
     __tablename__ = "recepcion"
+    __table_args__ = (
+        Index('idx_recepcion_envio', 'envio_muestra_id', 'recepcion_id'),
+    )
 
     recepcion_id = Column(Integer, primary_key=True)
     envio_muestra_id = Column(Integer, ForeignKey("envio_muestra.envio_muestra_id"), nullable=False)
@@ -206,6 +224,10 @@ class EstadoAnalisis(Base):
 
 class Analisis(Base):
     __tablename__ = "analisis"
+    __table_args__ = (
+        Index('idx_analisis_muestra', 'muestra_id', 'analisis_id'),
+        Index('idx_analisis_estado', 'estado_analisis_id'),
+    )
 
     analisis_id = Column(Integer, primary_key=True)
     muestra_id = Column(Integer, ForeignKey("muestra.muestra_id"), nullable=False)
@@ -227,6 +249,9 @@ class Analisis(Base):
 
 class UsoEquipoAnalisis(Base):
     __tablename__ = "uso_equipo_analisis"
+    __table_args__ = (
+        Index('idx_uso_equipo_analisis_analisis', 'analisis_id'),
+    )
 
     uso_equipo_analisis_id = Column(Integer, primary_key=True)
     analisis_id = Column(Integer, ForeignKey("analisis.analisis_id"), nullable=False)
@@ -238,6 +263,9 @@ class UsoEquipoAnalisis(Base):
 
 class HistorialEstadoAnalisis(Base):
     __tablename__ = "historial_estado_analisis"
+    __table_args__ = (
+        Index('idx_historial_estado_analisis_analisis', 'analisis_id'),
+    )
 
     historial_estado_analisis_id = Column(Integer, primary_key=True)
     analisis_id = Column(Integer, ForeignKey("analisis.analisis_id"), nullable=False)
@@ -251,6 +279,9 @@ class HistorialEstadoAnalisis(Base):
 
 class Incubacion(Base):
     __tablename__ = "incubacion"
+    __table_args__ = (
+        Index('idx_incubacion_analisis', 'analisis_id', 'incubacion_id'),
+    )
 
     incubacion_id = Column(Integer, primary_key=True)
     analisis_id = Column(Integer, ForeignKey("analisis.analisis_id"), nullable=False)
@@ -265,6 +296,9 @@ class Incubacion(Base):
 
 class Resultado(Base):
     __tablename__ = "resultado"
+    __table_args__ = (
+        Index('idx_resultado_analisis', 'analisis_id', 'resultado_id'),
+    )
 
     resultado_id = Column(Integer, primary_key=True)
     analisis_id = Column(Integer, ForeignKey("analisis.analisis_id"), nullable=False)
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, ForeignKey, Text, Numeric
+from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, ForeignKey, Text, Numeric, Index
 from sqlalchemy.orm import relationship
 
 from src.backend.models.base import Base
@@ -11,6 +11,14 @@ class Sampling(Base):
     Puede estar vinculada a una solicitud previa o ser ad-hoc.
     """
     __tablename__ = "samplings"
+    __table_args__ = (
+        Index('idx_samplings_status', 'status'),
+        Index('idx_samplings_batch_status', 'batch_id', 'status'),
+        # Filtros del listado + orden de keyset (start_datetime DESC, id DESC)
+        Index('idx_samplings_status_start', 'status', 'start_datetime', 'id'),
+        Index('idx_samplings_inspector_start', 'inspector_id', 'start_datetime', 'id'),
+        Index('idx_samplings_start', 'start_datetime', 'id'),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     inspector_id = Column(Integer, ForeignKey("usuario.usuario_id"), nullable=False)
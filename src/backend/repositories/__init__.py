@@ -20,3 +20,4 @@ from src.backend.repositories.inventory import (PolvoSuplementoRepository, Recep
                                                 MedioPreparadoRepository, OrdenPreparacionMedioRepository,
                                                 EstadoQCRepository, StockMediosRepository, AprobacionMediosRepository,
                                                 UsoMediosRepository, UsoCepaRepository)
+from src.backend.repositories.inspection import SamplingRepository
@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from src.backend.repositories.base import BaseRepository
+from src.backend.core.principal_cache import principal_cache
+from src.backend.core.response_cache import mark_tables_dirty, on_tables_committed
 from src.backend.models.auth import Usuario, Rol, UsuarioRol, AuditTrail, Revision, Operario, Laboratorio, UsuarioLaboratorio
 
 class UsuarioRepository(BaseRepository[Usuario]):
@@ -10,12 +12,13 @@ class UsuarioRepository(BaseRepository[Usuario]):
 
     def get_by_nombre(self, db: Session, nombre: str) -> Optional[Usuario]:
         return db.query(self.model).filter(self.model.nombre == nombre).first()
-        
+
     def sync_roles(self, db: Session, usuario_id: int, roles_ids: list[int]):
         db.query(UsuarioRol).filter(UsuarioRol.usuario_id == usuario_id).delete()
         for r_id in roles_ids:
             nuevo_rol = UsuarioRol(usuario_id=usuario_id, rol_id=r_id)
             db.add(nuevo_rol)
+        mark_tables_dirty(db, UsuarioRol.__tablename__)
         db.commit()
 
     def sync_laboratorios(self, db: Session, usuario_id: int, laboratorios_ids: list[int]):
@@ -23,6 +26,7 @@ class UsuarioRepository(BaseRepository[Usuario]):
         for lab_id in laboratorios_ids:
             nuevo_lab = UsuarioLaboratorio(usuario_id=usuario_id, laboratorio_id=lab_id)
             db.add(nuevo_lab)
+        mark_tables_dirty(db, UsuarioLaboratorio.__tablename__)
         db.commit()
 
 class RolRepository(BaseRepository[Rol]):
@@ -55,3 +59,10 @@ class OperarioRepository(BaseRepository[Operario]):
         
     def get_by_codigo_empleado(self, db: Session, codigo: str) -> Optional[Operario]:
         return db.query(self.model).filter(self.model.codigo_empleado == codigo).first()
+
+
+# Cualquier escritura confirmada sobre usuarios o sus asignaciones descarta los
+# principals cacheados; tras el commit, para que un rollback no deje el cache
+# adelantado y una lectura concurrente no recargue el estado previo.
+on_tables_committed([Usuario.__tablename__, UsuarioRol.__tablename__, UsuarioLaboratorio.__tablename__],
+                    principal_cache.invalidate)
@@ -1,10 +1,17 @@
-from typing import Generic, TypeVar, Type, Optional, List, Any, Dict
+from typing import Generic, TypeVar, Type, Optional, List, Any, Dict, Sequence, Tuple
+from sqlalchemy import Integer, insert, select
 from sqlalchemy.orm import Session
 from src.backend.models.base import Base
 from src.backend.models.audit import AuditLog
+from src.backend.database.unit_of_work import in_unit_of_work, audit_queue, commit_with_audit, unit_of_work
+from src.backend.core.response_cache import mark_tables_dirty
+from src.backend.core.pagination import keyset_paginate
 
 T = TypeVar("T", bound=Base)
 
+# Filas por sentencia en las operaciones bulk (SQLite admite 32766 parámetros)
+BULK_BATCH_SIZE = 500
+
 class BaseRepository(Generic[T]):
     def __init__(self, model: Type[T]):
         self.model = model
@@ -26,23 +33,100 @@ class BaseRepository(Generic[T]):
             query = query.options(*options)
         return query.offset(skip).limit(limit).all()
 
+    def get_page(self, db: Session, cursor: Optional[str] = None, limit: int = 100,
+                 options: Optional[List] = None, only_active: bool = True,
+                 order_by: Optional[str] = None, descending: bool = False,
+                 filters: Optional[Dict[str, Any]] = None) -> Tuple[List[T], Optional[str]]:
+        """
+        Paginación por keyset: retorna (filas, next_cursor). Ordena por la PK
+        (o por ``order_by`` con la PK como desempate) y continúa después del
+        ``cursor`` opaco de la página anterior; next_cursor es None al final.
+        ``filters`` se aplica como igualdades (filter_by).
+        """
+        query = db.query(self.model)
+        if filters:
+            query = query.filter_by(**filters)
+        if only_active and hasattr(self.model, "activo"):
+            query = query.filter(self.model.activo == True)
+        if options:
+            query = query.options(*options)
+        pk = getattr(self.model, self._pk_column().key)
+        columns = [pk] if order_by in (None, pk.key) else [getattr(self.model, order_by), pk]
+        return keyset_paginate(query, columns, cursor, limit, descending)
+
+    # ─── Lecturas por proyección ─────────────────────────────────
+    # Solo las columnas pedidas como dicts: sin instancias ORM, identity map
+    # ni carga de relaciones (para listados grandes que se serializan tal cual).
+
+    def schema_columns(self, schema: Any) -> List[str]:
+        """Columnas del modelo que son campos del schema Pydantic ``schema``."""
+        columns = self.model.__table__.columns.keys()
+        return [name for name in schema.model_fields if name in columns]
+
+    def projection_query(self, db: Session, columns: Sequence[Any], only_active: bool = True,
+                         filters: Optional[Dict[str, Any]] = None):
+        """
+        Query de columnas: ``columns`` admite nombres de columna del modelo o
+        expresiones (p. ej. ``Otro.nombre.label("otro_nombre")``) para joins.
+        La PK se agrega si no está (la usa el cursor de keyset).
+        """
+        pk = getattr(self.model, self._pk_column().key)
+        selected = [getattr(self.model, c) if isinstance(c, str) else c for c in columns]
+        if not any(c is pk for c in selected):
+            selected.insert(0, pk)
+        query = db.query(*selected).select_from(self.model)
+        for field, value in (filters or {}).items():
+            query = query.filter(getattr(self.model, field) == value)
+        if only_active and hasattr(self.model, "activo"):
+            query = query.filter(self.model.activo == True)
+        return query
+
+    def get_all_projection(self, db: Session, columns: Sequence[Any], skip: int = 0, limit: int = 100,
+                           only_active: bool = True, filters: Optional[Dict[str, Any]] = None,
+                           query=None) -> List[Dict[str, Any]]:
+        """Como ``get_all`` pero retorna dicts con ``columns`` (o las filas de ``query``)."""
+        if query is None:
+            query = self.projection_query(db, columns, only_active, filters)
+        return [row._asdict() for row in query.offset(skip).limit(limit)]
+
+    def get_page_projection(self, db: Session, columns: Sequence[Any], cursor: Optional[str] = None,
+                            limit: int = 100, only_active: bool = True,
+                            filters: Optional[Dict[str, Any]] = None,
+                            query=None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Como ``get_page`` (keyset por PK) pero retorna dicts: (filas, next_cursor)."""
+        if query is None:
+            query = self.projection_query(db, columns, only_active, filters)
+        pk = getattr(self.model, self._pk_column().key)
+        rows, next_cursor = keyset_paginate(query, [pk], cursor, limit)
+        return [row._asdict() for row in rows], next_cursor
+
+    def get_related_projection(self, db: Session, columns: Sequence[str], key: str, ids: Sequence[Any],
+                               only_active: bool = False) -> Dict[Any, List[Dict[str, Any]]]:
+        """
+        Filas hijas agrupadas por la FK ``key`` con una sola consulta IN
+        (p. ej. las zonas de todas las áreas de una página), en orden de PK.
+        """
+        if not ids:
+            return {}
+        pk = getattr(self.model, self._pk_column().key)
+        query = (self.projection_query(db, list(dict.fromkeys([*columns, key])), only_active)
+                 .filter(getattr(self.model, key).in_(set(ids))).order_by(pk))
+        grouped: Dict[Any, List[Dict[str, Any]]] = {}
+        for row in query:
+            grouped.setdefault(getattr(row, key), []).append(row._asdict())
+        return grouped
+
     def create(self, db: Session, obj_in: dict, usuario_id: Optional[int] = None) -> T:
         db_obj = self.model(**obj_in)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        mark_tables_dirty(db, self.model.__tablename__)
+        db.flush()
         
         # Audit insert
         if self.model != AuditLog:
-            # Ensure obj_in is JSON serializable (dates to strings)
-            from datetime import date, datetime
-            audit_data = {}
-            for k, v in obj_in.items():
-                if isinstance(v, (datetime, date)):
-                    v = v.isoformat()
-                audit_data[k] = v
-            self._log_audit(db, db_obj, "INSERT", None, audit_data, usuario_id)
+            self._log_audit(db, db_obj, "INSERT", None, self._to_audit_dict(obj_in), usuario_id)
             
+        self._persist(db, db_obj)
         return db_obj
 
     def update(self, db: Session, db_obj: T, obj_in: dict, usuario_id: Optional[int] = None) -> T:
@@ -51,14 +135,15 @@ class BaseRepository(Generic[T]):
         for field, value in obj_in.items():
             setattr(db_obj, field, value)
         
-        db.commit()
-        db.refresh(db_obj)
+        mark_tables_dirty(db, self.model.__tablename__)
+        db.flush()
         
         # Audit update
         if self.model != AuditLog:
             valor_nuevo = self._get_obj_dict(db_obj)
             self._log_audit(db, db_obj, "UPDATE", valor_anterior, valor_nuevo, usuario_id)
             
+        self._persist(db, db_obj)
         return db_obj
 
     def delete(self, db: Session, id: int, usuario_id: Optional[int] = None) -> bool:
@@ -67,21 +152,158 @@ class BaseRepository(Generic[T]):
             return False
         
         valor_anterior = self._get_obj_dict(db_obj)
+        mark_tables_dirty(db, self.model.__tablename__)
         
         # Soft-delete if the model has an 'activo' column
         if hasattr(db_obj, "activo"):
             setattr(db_obj, "activo", False)
-            db.commit()
-            db.refresh(db_obj)
             if self.model != AuditLog:
                 self._log_audit(db, db_obj, "DELETE (SOFT)", valor_anterior, {"activo": False}, usuario_id)
+            self._persist(db, db_obj)
         else:
             db.delete(db_obj)
-            db.commit()
             if self.model != AuditLog:
                 self._log_audit(db, db_obj, "DELETE (HARD)", valor_anterior, None, usuario_id)
+            self._persist(db)
         return True
 
+    def bulk_create(self, db: Session, rows: List[dict], usuario_id: Optional[int] = None,
+                    batch_size: int = BULK_BATCH_SIZE) -> List[Any]:
+        """
+        Inserta muchas filas con un INSERT multi-VALUES por lote (RETURNING de la PK)
+        y registra los AuditLog correspondientes en un único executemany al confirmar.
+        Todas las filas deben tener las mismas claves. Retorna las PKs en el
+        mismo orden que ``rows``.
+        """
+        if not rows:
+            return []
+        ids: List[Any] = []
+        mark_tables_dirty(db, self.model.__tablename__)
+        with unit_of_work(db):
+            for start in range(0, len(rows), batch_size):
+                chunk = rows[start:start + batch_size]
+                chunk_ids = self._insert_returning(db, chunk)
+                ids.extend(chunk_ids)
+                self._bulk_audit(db, [
+                    (pk, "INSERT", None, self._to_audit_dict(row))
+                    for pk, row in zip(chunk_ids, chunk)
+                ], usuario_id)
+        return ids
+
+    def bulk_update(self, db: Session, changes: List[Tuple[T, dict]],
+                    usuario_id: Optional[int] = None) -> List[T]:
+        """
+        Aplica cada ``obj_in`` sobre su objeto en memoria y persiste todo con un
+        único flush (el ORM agrupa los UPDATE con las mismas columnas en un
+        executemany). Los AuditLog se encolan en el unit of work como en
+        ``bulk_create``. ``changes``: [(db_obj, obj_in), ...]
+        """
+        if not changes:
+            return []
+        pk_name = self._pk_column().key
+        entries = []
+        mark_tables_dirty(db, self.model.__tablename__)
+        with unit_of_work(db):
+            for db_obj, obj_in in changes:
+                valor_anterior = self._get_obj_dict(db_obj)
+                for field, value in obj_in.items():
+                    setattr(db_obj, field, value)
+                entries.append((getattr(db_obj, pk_name), "UPDATE", valor_anterior, self._get_obj_dict(db_obj)))
+            db.flush()
+            self._bulk_audit(db, entries, usuario_id)
+        return [db_obj for db_obj, _ in changes]
+
+    def bulk_upsert(self, db: Session, rows: List[dict], key: str = "codigo",
+                    usuario_id: Optional[int] = None, batch_size: int = BULK_BATCH_SIZE) -> List[Any]:
+        """
+        Inserta o actualiza filas según la columna única ``key``.
+
+        En SQLite/PostgreSQL, si ``key`` tiene restricción UNIQUE, usa una sentencia
+        ``INSERT ... ON CONFLICT (key) DO UPDATE`` por lote; si no (u otros motores)
+        separa nuevas/existentes y hace insert + update masivos.
+        Los valores previos de las filas existentes se leen con un único IN por lote
+        para que el AuditLog (INSERT/UPDATE) conserve valor_anterior.
+
+        Si un lote repite ``key`` solo se escribe la última aparición (PostgreSQL
+        rechaza un ON CONFLICT que afecte dos veces la misma fila); el resultado
+        conserva una PK por cada fila de entrada.
+        """
+        if not rows:
+            return []
+        key_col = getattr(self.model, key)
+        pk_col = self._pk_column()
+        dialect = db.get_bind().dialect.name
+        ids: List[Any] = []
+        mark_tables_dirty(db, self.model.__tablename__)
+        with unit_of_work(db):
+            for start in range(0, len(rows), batch_size):
+                # Una fila por clave: la última gana, en el orden de su primera aparición
+                chunk = list({row[key]: row for row in rows[start:start + batch_size]}.values())
+                keys = [row[key] for row in chunk]
+                previos = {
+                    getattr(obj, key): self._get_obj_dict(obj)
+                    for obj in db.execute(select(self.model).where(key_col.in_(keys))).scalars()
+                }
+
+                if dialect in ("sqlite", "postgresql") and self._is_unique_key(key):
+                    chunk_ids = self._upsert_on_conflict(db, chunk, key, dialect)
+                else:
+                    chunk_ids = self._upsert_split(db, chunk, key, previos)
+                pk_por_key = dict(zip(keys, chunk_ids))
+                ids.extend(pk_por_key[row[key]] for row in rows[start:start + batch_size])
+
+                entries = []
+                for pk, row in zip(chunk_ids, chunk):
+                    nuevo = self._to_audit_dict(row)
+                    anterior = previos.get(row[key])
+                    if anterior is None:
+                        entries.append((pk, "INSERT", None, nuevo))
+                    else:
+                        entries.append((pk, "UPDATE", anterior, {**anterior, **nuevo}))
+                self._bulk_audit(db, entries, usuario_id)
+        return ids
+
+    def _upsert_on_conflict(self, db: Session, chunk: List[dict], key: str, dialect: str) -> List[Any]:
+        """
+        ``INSERT ... ON CONFLICT (key) DO UPDATE ... RETURNING key, pk`` del lote.
+
+        Sin ``sort_by_parameter_order`` (en SQLite no hay sentinel y SQLAlchemy
+        ejecutaría un INSERT por fila) el lote va en una sola sentencia
+        multi-VALUES; el orden de RETURNING no está garantizado, así que las PK
+        se asocian a cada fila por su ``key``.
+        """
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        pk_name = self._pk_column().name
+        stmt = dialect_insert(self.model.__table__)
+        update_cols = {
+            c: stmt.excluded[c] for c in chunk[0].keys() if c not in (key, pk_name)
+        }
+        # DO UPDATE (aunque sea no-op) para que RETURNING incluya también las filas existentes
+        stmt = stmt.on_conflict_do_update(index_elements=[key], set_=update_cols or {key: stmt.excluded[key]})
+        stmt = stmt.returning(self.model.__table__.c[key], self.model.__table__.c[pk_name])
+        ids = {k: pk for k, pk in db.execute(stmt, chunk)}
+        return [ids[row[key]] for row in chunk]
+
+    def _upsert_split(self, db: Session, chunk: List[dict], key: str, previos: Dict[Any, dict]) -> List[Any]:
+        from sqlalchemy import update
+        pk_name = self._pk_column().name
+        nuevos = [row for row in chunk if row[key] not in previos]
+        nuevos_ids = iter(
+            self._insert_returning(db, nuevos) if nuevos else []
+        )
+        existentes = [
+            {**row, pk_name: previos[row[key]][pk_name]} for row in chunk if row[key] in previos
+        ]
+        if existentes:
+            db.execute(update(self.model), existentes)
+        return [
+            previos[row[key]][pk_name] if row[key] in previos else next(nuevos_ids)
+            for row in chunk
+        ]
+
     def get_by_filters(self, db: Session, **filters) -> List[T]:
         return db.query(self.model).filter_by(**filters).all()
 
@@ -96,6 +318,58 @@ class BaseRepository(Generic[T]):
         results = db.query(getattr(self.model, key_field), getattr(self.model, target_value)).all()
         return {str(k): v for k, v in results if k is not None}
 
+    def _insert_returning(self, db: Session, rows: List[dict]) -> List[Any]:
+        """
+        INSERT de ``rows`` con RETURNING de la PK, en el mismo orden que ``rows``.
+
+        SQLite no tiene sentinel implícito: con ``sort_by_parameter_order`` SQLAlchemy
+        ejecutaría un INSERT por fila. Si la PK es entera autoincremental y no viene
+        en las filas, el INSERT multi-VALUES asigna rowids crecientes en el orden de
+        VALUES, así que basta ordenar lo que devuelve RETURNING.
+        """
+        pk_col = self._pk_column()
+        if (db.get_bind().dialect.name == "sqlite" and pk_col.autoincrement in ("auto", True)
+                and isinstance(pk_col.type, Integer) and pk_col.key not in rows[0]):
+            return sorted(db.execute(insert(self.model).returning(pk_col), rows).scalars())
+        stmt = insert(self.model).returning(pk_col, sort_by_parameter_order=True)
+        return list(db.execute(stmt, rows).scalars())
+
+    def _pk_column(self):
+        return self.model.__mapper__.primary_key[0]
+
+    def _is_unique_key(self, key: str) -> bool:
+        """Indica si ``key`` es PK o tiene un UNIQUE propio (requisito de ON CONFLICT)."""
+        from sqlalchemy import UniqueConstraint
+        table = self.model.__table__
+        column = table.c[key]
+        if column.primary_key or column.unique:
+            return True
+        return any(
+            [c.name for c in constraint.columns] == [key]
+            for constraint in list(table.constraints) + list(table.indexes)
+            if isinstance(constraint, UniqueConstraint) or getattr(constraint, "unique", False)
+        )
+
+    @staticmethod
+    def _to_audit_dict(data: dict) -> Dict[str, Any]:
+        """Ensure data is JSON serializable for the audit log (dates to strings)."""
+        from datetime import date, datetime
+        audit_data = {}
+        for k, v in data.items():
+            if isinstance(v, (datetime, date)):
+                v = v.isoformat()
+            audit_data[k] = v
+        return audit_data
+
+    def _persist(self, db: Session, db_obj: Optional[T] = None) -> None:
+        """Commit (con la auditoría encolada) + refresh, o solo flush si hay un unit of work abierto."""
+        if in_unit_of_work(db):
+            db.flush()
+            return
+        commit_with_audit(db)
+        if db_obj is not None:
+            db.refresh(db_obj)
+
     def _get_obj_dict(self, db_obj: T) -> Dict[str, Any]:
         """Helper to convert model instance to dict for audit logs."""
         from datetime import date, datetime
@@ -108,25 +382,34 @@ class BaseRepository(Generic[T]):
                 data[c.key] = val
         return data
 
+    def _audit_event(self, registro_id: Any, operacion: str, anterior: Any, nuevo: Any,
+                     usuario_id: Optional[int], fecha=None) -> Dict[str, Any]:
+        """Evento de auditoría con las columnas de AuditLog."""
+        from datetime import datetime, timezone
+        return {
+            "tabla_nombre": self.model.__tablename__,
+            "registro_id": registro_id,
+            "operacion": operacion,
+            "valor_anterior": anterior,
+            "valor_nuevo": nuevo,
+            "usuario_id": usuario_id,
+            "fecha": fecha or datetime.now(timezone.utc),
+        }
+
     def _log_audit(self, db: Session, db_obj: T, operacion: str, anterior: Any, nuevo: Any, usuario_id: Optional[int]):
-        """Internal helper to create audit records."""
-        try:
-            primary_key = self.model.__mapper__.primary_key[0].name
-            registro_id = getattr(db_obj, primary_key)
-            
-            audit = AuditLog(
-                tabla_nombre=self.model.__tablename__,
-                registro_id=registro_id,
-                operacion=operacion,
-                valor_anterior=anterior,
-                valor_nuevo=nuevo,
-                usuario_id=usuario_id
-            )
-            db.add(audit)
-            db.commit()
-        except Exception as e:
-            # We don't want audit failures to break the main transaction if it already committed
-            # But here db.commit() might fail if the session is in a weird state.
-            # In a real production system, we might use a separate session or a background task.
-            print(f"Audit failed: {e}")
-            db.rollback()
+        """Encola el evento de auditoría; se persiste con el commit del cambio (ver ``_persist``)."""
+        primary_key = self.model.__mapper__.primary_key[0].name
+        event = self._audit_event(getattr(db_obj, primary_key), operacion, anterior, nuevo, usuario_id)
+        audit_queue(db).append(event)
+
+    def _bulk_audit(self, db: Session, entries: List[tuple], usuario_id: Optional[int]) -> None:
+        """Encola en el unit of work los eventos de una operación bulk (un solo
+        executemany al confirmar). ``entries``: [(registro_id, operacion, anterior, nuevo), ...]"""
+        if self.model == AuditLog or not entries:
+            return
+        from datetime import datetime, timezone
+        fecha = datetime.now(timezone.utc)
+        audit_queue(db).extend(
+            self._audit_event(registro_id, operacion, anterior, nuevo, usuario_id, fecha)
+            for registro_id, operacion, anterior, nuevo in entries
+        )
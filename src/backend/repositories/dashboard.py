@@ -0,0 +1,98 @@
+import os
+from typing import Dict, Iterable
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from src.backend.repositories.base import BaseRepository
+from src.backend.core.response_cache import mark_tables_dirty
+from src.backend.models.dashboard import ContadorDashboard
+from src.backend.models.fact import Analisis, SolicitudMuestreo
+from src.backend.models.inspection import Sampling
+
+# Con DASHBOARD_COUNTERS=true los servicios mantienen contador_dashboard y el
+# dashboard lo lee en lugar de agregar sobre las tablas de hechos.
+DASHBOARD_COUNTERS_ENABLED = os.getenv("DASHBOARD_COUNTERS", "false").lower() == "true"
+
+METRICA_SOLICITUDES = "solicitudes"
+PERIODO_TOTAL = "total"
+
+
+def metrica_analisis_estado(estado_analisis_id: int) -> str:
+    return f"analisis_estado:{estado_analisis_id}"
+
+
+# Muestreos por estado (/api/inspection/samplings/summary): se mantienen
+# siempre, sin depender de DASHBOARD_COUNTERS (la migración hace el backfill).
+def metrica_sampling_estado(status: str) -> str:
+    return f"samplings_estado:{status}"
+
+
+class ContadorDashboardRepository(BaseRepository[ContadorDashboard]):
+    """Contadores derivados: se escriben sin AuditLog y pueden reconstruirse con ``rebuild``."""
+
+    def __init__(self):
+        super().__init__(ContadorDashboard)
+
+    def incrementar(self, db: Session, metrica: str, periodo: str, delta: int = 1) -> None:
+        """Suma ``delta`` al contador (lo crea si no existe). Se confirma con la transacción del llamador."""
+        mark_tables_dirty(db, ContadorDashboard.__tablename__)
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            stmt = dialect_insert(ContadorDashboard.__table__).values(metrica=metrica, periodo=periodo, valor=delta)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["metrica", "periodo"],
+                set_={"valor": ContadorDashboard.__table__.c.valor + stmt.excluded.valor},
+            )
+            db.execute(stmt)
+            return
+        result = db.execute(
+            update(ContadorDashboard)
+            .where(ContadorDashboard.metrica == metrica, ContadorDashboard.periodo == periodo)
+            .values(valor=ContadorDashboard.valor + delta)
+        )
+        if result.rowcount == 0:
+            db.execute(insert(ContadorDashboard).values(metrica=metrica, periodo=periodo, valor=delta))
+
+    def get_valores(self, db: Session, metrica: str, periodos: Iterable[str]) -> Dict[str, int]:
+        """{periodo: valor} de ``metrica`` para los periodos pedidos (una sola consulta)."""
+        rows = db.execute(
+            select(ContadorDashboard.periodo, ContadorDashboard.valor)
+            .where(ContadorDashboard.metrica == metrica, ContadorDashboard.periodo.in_(list(periodos)))
+        )
+        return {periodo: valor for periodo, valor in rows}
+
+    def get_totales(self, db: Session, prefijo: str) -> Dict[str, int]:
+        """{metrica: valor} de los acumulados cuya métrica empieza con ``prefijo``."""
+        rows = db.execute(
+            select(ContadorDashboard.metrica, ContadorDashboard.valor)
+            .where(ContadorDashboard.periodo == PERIODO_TOTAL, ContadorDashboard.metrica.startswith(prefijo))
+        )
+        return {metrica: valor for metrica, valor in rows}
+
+    def rebuild(self, db: Session) -> None:
+        """Recalcula todos los contadores desde las tablas de hechos (backfill al habilitarlos)."""
+        mark_tables_dirty(db, ContadorDashboard.__tablename__)
+        db.query(ContadorDashboard).delete()
+        dia = func.date(SolicitudMuestreo.fecha)
+        filas = [
+            {"metrica": METRICA_SOLICITUDES, "periodo": str(fecha), "valor": count}
+            for fecha, count in db.execute(select(dia, func.count()).group_by(dia))
+        ]
+        filas += [
+            {"metrica": metrica_analisis_estado(estado_id), "periodo": PERIODO_TOTAL, "valor": count}
+            for estado_id, count in db.execute(
+                select(Analisis.estado_analisis_id, func.count()).group_by(Analisis.estado_analisis_id)
+            )
+        ]
+        filas += [
+            {"metrica": metrica_sampling_estado(status), "periodo": PERIODO_TOTAL, "valor": count}
+            for status, count in db.execute(select(Sampling.status, func.count()).group_by(Sampling.status))
+        ]
+        if filas:
+            db.execute(insert(ContadorDashboard), filas)
+        db.commit()
@@ -1,9 +1,11 @@
 from typing import List, Optional
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session, joinedload
 
 from src.backend.repositories.base import BaseRepository
+from src.backend.core.response_cache import mark_tables_dirty
 from src.backend.models.dim import (Sistema, Planta, Area, TipoEquipo, EstadoEquipo, 
-                                     EquipoInstrumento, ZonaEquipo, ZonaArea, CalibracionCalificacionEquipo, 
+                                     EquipoInstrumento, ZonaEquipo, ZonaArea, CalibracionCalificacionEquipo, CumplimientoEquipo, 
                                      HistoricoEstadoEquipo, PuntoMuestreo, TipoSolicitudMuestreo)
 
 class SistemaRepository(BaseRepository[Sistema]):
@@ -58,6 +60,87 @@ class CalibracionCalificacionEquipoRepository(BaseRepository[CalibracionCalifica
     def __init__(self):
         super().__init__(CalibracionCalificacionEquipo)
 
+    def get_by_equipo(self, db: Session, equipo_id: int) -> List[CalibracionCalificacionEquipo]:
+        """Calibraciones del equipo filtradas en la BD (idx_calibracion_equipo_fecha)."""
+        return (db.query(self.model)
+                .filter(self.model.equipo_instrumento_id == equipo_id)
+                .order_by(self.model.calibracion_calificacion_equipo_id)
+                .all())
+
+    def latest_query(self):
+        """(equipo_instrumento_id, calibracion_id, fecha, vence) de la última calibración de cada equipo."""
+        model = self.model
+        ranked = select(
+            model.equipo_instrumento_id,
+            model.calibracion_calificacion_equipo_id,
+            model.fecha,
+            model.vence,
+            func.row_number().over(
+                partition_by=model.equipo_instrumento_id,
+                order_by=(model.fecha.desc(), model.calibracion_calificacion_equipo_id),
+            ).label("orden"),
+        ).subquery()
+        return select(
+            ranked.c.equipo_instrumento_id, ranked.c.calibracion_calificacion_equipo_id,
+            ranked.c.fecha, ranked.c.vence,
+        ).where(ranked.c.orden == 1)
+
+class CumplimientoEquipoRepository(BaseRepository[CumplimientoEquipo]):
+    """Índice derivado de las calibraciones: se escribe sin AuditLog y puede reconstruirse con ``rebuild``."""
+
+    def __init__(self):
+        super().__init__(CumplimientoEquipo)
+
+    def registrar(self, db: Session, calibracion: CalibracionCalificacionEquipo) -> None:
+        """
+        Actualiza el índice con una calibración nueva si es la más reciente del
+        equipo (a igual fecha se conserva la registrada antes). Se confirma con
+        la transacción del llamador.
+        """
+        mark_tables_dirty(db, CumplimientoEquipo.__tablename__)
+        valores = {
+            "equipo_instrumento_id": calibracion.equipo_instrumento_id,
+            "calibracion_calificacion_equipo_id": calibracion.calibracion_calificacion_equipo_id,
+            "fecha": calibracion.fecha,
+            "vence": calibracion.vence,
+        }
+        table = CumplimientoEquipo.__table__
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            stmt = dialect_insert(table).values(**valores)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["equipo_instrumento_id"],
+                set_={c: stmt.excluded[c] for c in ("calibracion_calificacion_equipo_id", "fecha", "vence")},
+                where=stmt.excluded.fecha > table.c.fecha,
+            )
+            db.execute(stmt)
+            return
+        actual = db.get(CumplimientoEquipo, calibracion.equipo_instrumento_id)
+        if actual is None:
+            db.execute(insert(CumplimientoEquipo).values(**valores))
+        elif calibracion.fecha > actual.fecha:
+            db.execute(
+                update(CumplimientoEquipo)
+                .where(CumplimientoEquipo.equipo_instrumento_id == calibracion.equipo_instrumento_id)
+                .values(**valores)
+            )
+
+    def rebuild(self, db: Session) -> None:
+        """Recalcula el índice desde calibracion_calificacion_equipo (backfill o divergencia)."""
+        mark_tables_dirty(db, CumplimientoEquipo.__tablename__)
+        db.query(CumplimientoEquipo).delete()
+        db.execute(
+            insert(CumplimientoEquipo).from_select(
+                ["equipo_instrumento_id", "calibracion_calificacion_equipo_id", "fecha", "vence"],
+                CalibracionCalificacionEquipoRepository().latest_query(),
+            )
+        )
+        db.commit()
+
 class HistoricoEstadoEquipoRepository(BaseRepository[HistoricoEstadoEquipo]):
     def __init__(self):
         super().__init__(HistoricoEstadoEquipo)
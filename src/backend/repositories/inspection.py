@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Query, Session, joinedload
+
+from src.backend.repositories.base import BaseRepository
+from src.backend.core.exceptions import ConcurrencyConflictException
+from src.backend.core.pagination import keyset_paginate
+from src.backend.models.inspection import Sampling
+
+
+class SamplingRepository(BaseRepository[Sampling]):
+    def __init__(self):
+        super().__init__(Sampling)
+
+    # Orden del listado: más recientes primero, id como desempate (servido
+    # por los índices (filtro, start_datetime, id) de samplings)
+    ORDER_COLUMNS = (Sampling.start_datetime, Sampling.id)
+
+    def filtered_query(self, db: Session,
+                       status: Optional[str] = None,
+                       batch_id: Optional[str] = None,
+                       inspector_id: Optional[int] = None,
+                       start_from: Optional[datetime] = None,
+                       start_to: Optional[datetime] = None) -> Query:
+        """Muestreos filtrados; el rango de fechas es semiabierto [start_from, start_to)."""
+        query = db.query(Sampling).options(joinedload(Sampling.sampling_point))
+        if status:
+            query = query.filter(Sampling.status == status)
+        if batch_id:
+            query = query.filter(Sampling.batch_id == batch_id)
+        if inspector_id:
+            query = query.filter(Sampling.inspector_id == inspector_id)
+        if start_from:
+            query = query.filter(Sampling.start_datetime >= start_from)
+        if start_to:
+            query = query.filter(Sampling.start_datetime < start_to)
+        return query
+
+    def list_filtered(self, db: Session, skip: int = 0, limit: int = 100, **filters: Any) -> List[Sampling]:
+        query = self.filtered_query(db, **filters)
+        return query.order_by(*(col.desc() for col in self.ORDER_COLUMNS)).offset(skip).limit(limit).all()
+
+    def page_filtered(self, db: Session, cursor: Optional[str] = None, limit: int = 100,
+                      **filters: Any) -> Tuple[List[Sampling], Optional[str]]:
+        """Igual que list_filtered pero paginado por keyset: (muestreos, next_cursor)."""
+        return keyset_paginate(self.filtered_query(db, **filters), self.ORDER_COLUMNS, cursor, limit, descending=True)
+
+    # ─── Transiciones de estado por lote ─────────────────────────
+    # Un UPDATE condicional por operación: solo cambian las filas que siguen
+    # en el estado de origen al ejecutarse la sentencia, así que dos
+    # revisiones/envíos concurrentes del mismo muestreo no pueden ganar ambos.
+
+    def transition(self, db: Session, where: List[Any], values: dict) -> List[str]:
+        """Aplica ``values`` a los muestreos que cumplen ``where`` y retorna sus id."""
+        stmt = update(Sampling).where(*where).values(**values).execution_options(synchronize_session=False)
+        if db.get_bind().dialect.update_returning:
+            return list(db.execute(stmt.returning(Sampling.id)).scalars())
+        # Sin RETURNING (SQLite < 3.35): se leen los id y el UPDATE repite la condición
+        ids = list(db.execute(select(Sampling.id).where(*where)).scalars())
+        if ids and db.execute(stmt.where(Sampling.id.in_(ids))).rowcount != len(ids):
+            raise ConcurrencyConflictException()
+        return ids
+
+    def review(self, db: Session, sampling_id: str, reviewer_id: int, review_timestamp: datetime) -> List[str]:
+        """PENDING_REVIEW → PENDING_SUBMISSION para un muestreo (lista vacía si no estaba pendiente)."""
+        return self.transition(
+            db, [Sampling.id == sampling_id, Sampling.status == "PENDING_REVIEW"],
+            {"status": "PENDING_SUBMISSION", "reviewer_id": reviewer_id, "review_timestamp": review_timestamp},
+        )
+
+    def review_batch(self, db: Session, batch_id: str, reviewer_id: int, review_timestamp: datetime) -> List[str]:
+        """PENDING_REVIEW → PENDING_SUBMISSION para el lote ``batch_id``."""
+        return self.transition(
+            db, [Sampling.batch_id == batch_id, Sampling.status == "PENDING_REVIEW"],
+            {"status": "PENDING_SUBMISSION", "reviewer_id": reviewer_id, "review_timestamp": review_timestamp},
+        )
+
+    def submit(self, db: Session, sampling_ids: List[str], submission_id: str,
+               submission_timestamp: datetime) -> List[str]:
+        """PENDING_SUBMISSION → SUBMITTED para ``sampling_ids`` (los que estén listos)."""
+        return self.transition(
+            db, [Sampling.id.in_(sampling_ids), Sampling.status == "PENDING_SUBMISSION"],
+            {"status": "SUBMITTED", "submission_id": submission_id, "submission_timestamp": submission_timestamp},
+        )
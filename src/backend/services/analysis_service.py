@@ -1,15 +1,17 @@
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
-from typing import List, Optional
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
 
 from src.backend.repositories.fact import (AnalisisRepository, EstadoAnalisisRepository, 
                                            HistorialEstadoAnalisisRepository, IncubacionRepository, 
-                                           ResultadoRepository, SolicitudMuestreoRepository,
-                                           MuestreoRepository, MuestraRepository, EnvioMuestraRepository,
-                                           RecepcionRepository)
+                                           ResultadoRepository)
 from src.backend.repositories.inventory import UsoMediosRepository, UsoCepaRepository
 from src.backend.repositories.master import EspecificacionRepository
 from src.backend.models.fact import Analisis, Incubacion, Resultado, UsoEquipoAnalisis
+from src.backend.database.unit_of_work import unit_of_work
+from src.backend.repositories.dashboard import ContadorDashboardRepository, metrica_analisis_estado, PERIODO_TOTAL
+from src.backend.services.spec_engine import SpecIndex, spec_index as default_spec_index
 
 class AnalysisService:
     def __init__(self,
@@ -20,7 +22,9 @@ class AnalysisService:
                  resultado_repo: ResultadoRepository,
                  especificacion_repo: EspecificacionRepository,
                  uso_medios_repo: UsoMediosRepository,
-                 uso_cepa_repo: UsoCepaRepository):
+                 uso_cepa_repo: UsoCepaRepository,
+                 contador_repo: Optional[ContadorDashboardRepository] = None,
+                 spec_index: Optional[SpecIndex] = None):
         self.analisis_repo = analisis_repo
         self.estado_analisis_repo = estado_analisis_repo
         self.historial_repo = historial_repo
@@ -29,6 +33,8 @@ class AnalysisService:
         self.especificacion_repo = especificacion_repo
         self.uso_medios_repo = uso_medios_repo
         self.uso_cepa_repo = uso_cepa_repo
+        self.contador_repo = contador_repo
+        self.spec_index = spec_index or default_spec_index
 
     def change_analysis_state(self, db: Session, analisis_id: int, nuevo_estado_id: int, operario_id: int) -> Analisis:
         analisis = self.analisis_repo.get(db, analisis_id)
@@ -41,42 +47,105 @@ class AnalysisService:
         if nuevo_estado_id == 2 and not analisis.fecha_inicio:
             update_data["fecha_inicio"] = datetime.now(timezone.utc)
 
-        analisis = self.analisis_repo.update(db, analisis, update_data)
+        estado_anterior_id = analisis.estado_analisis_id
+        with unit_of_work(db):
+            analisis = self.analisis_repo.update(db, analisis, update_data)
+            self._mover_contador_estado(db, estado_anterior_id, nuevo_estado_id)
 
-        # Register history
-        self.historial_repo.create(db, {
-            "analisis_id": analisis_id,
-            "estado_analisis_id": nuevo_estado_id,
-            "fecha": datetime.now(timezone.utc),
-            "operario_id": operario_id
-        })
+            # Register history
+            self.historial_repo.create(db, {
+                "analisis_id": analisis_id,
+                "estado_analisis_id": nuevo_estado_id,
+                "fecha": datetime.now(timezone.utc),
+                "operario_id": operario_id
+            })
 
         return analisis
 
+    def update_analisis(self, db: Session, analisis_id: int, update_data: dict) -> Analisis:
+        """Edición directa de un análisis (PUT); si cambia el estado mueve sus contadores."""
+        analisis = self.analisis_repo.get(db, analisis_id)
+        if not analisis:
+            raise ValueError(f"Analysis with ID {analisis_id} not found")
+
+        estado_anterior_id = analisis.estado_analisis_id
+        with unit_of_work(db):
+            analisis = self.analisis_repo.update(db, analisis, update_data)
+            self._mover_contador_estado(db, estado_anterior_id, analisis.estado_analisis_id)
+        return analisis
+
+    def delete_analisis(self, db: Session, analisis_id: int) -> None:
+        analisis = self.analisis_repo.get(db, analisis_id)
+        if not analisis:
+            raise ValueError(f"Analysis with ID {analisis_id} not found")
+
+        estado_id = analisis.estado_analisis_id
+        with unit_of_work(db):
+            self.analisis_repo.delete(db, analisis_id)
+            if self.contador_repo:
+                self.contador_repo.incrementar(db, metrica_analisis_estado(estado_id), PERIODO_TOTAL, -1)
+
+    def _mover_contador_estado(self, db: Session, desde: int, hacia: int, n: int = 1) -> None:
+        """Pasa ``n`` análisis del contador del estado ``desde`` al de ``hacia``."""
+        if self.contador_repo and desde != hacia:
+            self.contador_repo.incrementar(db, metrica_analisis_estado(desde), PERIODO_TOTAL, -n)
+            self.contador_repo.incrementar(db, metrica_analisis_estado(hacia), PERIODO_TOTAL, n)
+
     def create_analisis(self, db: Session, analisis_data: dict, operario_id: int) -> Analisis:
-        analisis = self.analisis_repo.create(db, analisis_data)
-        
-        self.historial_repo.create(db, {
-            "analisis_id": analisis.analisis_id,
-            "estado_analisis_id": analisis_data["estado_analisis_id"],
-            "fecha": datetime.now(timezone.utc),
-            "operario_id": operario_id
-        })
+        with unit_of_work(db):
+            analisis = self.analisis_repo.create(db, analisis_data)
+            if self.contador_repo:
+                self.contador_repo.incrementar(db, metrica_analisis_estado(analisis.estado_analisis_id), PERIODO_TOTAL)
+            
+            self.historial_repo.create(db, {
+                "analisis_id": analisis.analisis_id,
+                "estado_analisis_id": analisis_data["estado_analisis_id"],
+                "fecha": datetime.now(timezone.utc),
+                "operario_id": operario_id
+            })
         return analisis
 
     def create_bulk_analisis(self, db: Session, bulk_data: dict) -> List[Analisis]:
-        results = []
-        for metodo_id in bulk_data["metodos_versions_ids"]:
-            analisis_data = {
-                "muestra_id": bulk_data["muestra_id"],
-                "recepcion_id": bulk_data["recepcion_id"],
+        """
+        Crea un análisis por cada muestra × método en una sola transacción:
+        un INSERT ... RETURNING para los análisis, otro para su historial y
+        la auditoría encolada en un único lote.
+        """
+        muestras = list(bulk_data.get("muestras") or [])
+        if bulk_data.get("muestra_id") is not None:
+            if bulk_data.get("recepcion_id") is None:
+                raise ValueError("recepcion_id es requerido junto con muestra_id.")
+            muestras.insert(0, {"muestra_id": bulk_data["muestra_id"], "recepcion_id": bulk_data["recepcion_id"]})
+        if not muestras or not bulk_data["metodos_versions_ids"]:
+            raise ValueError("Se requiere al menos una muestra y un método.")
+
+        estado_id = bulk_data.get("estado_analisis_id", 1)
+        operario_id = bulk_data["operario_id"]
+        ahora = datetime.now(timezone.utc)
+        rows = [
+            {
+                "muestra_id": muestra["muestra_id"],
+                "recepcion_id": muestra["recepcion_id"],
                 "metodo_version_id": metodo_id,
-                "estado_analisis_id": bulk_data.get("estado_analisis_id", 1),
-                "operario_id": bulk_data["operario_id"]
+                "estado_analisis_id": estado_id,
+                "operario_id": operario_id,
+                "ultimo_cambio": ahora,
             }
-            res = self.create_analisis(db, analisis_data, bulk_data["operario_id"])
-            results.append(res)
-        return results
+            for muestra in muestras
+            for metodo_id in bulk_data["metodos_versions_ids"]
+        ]
+
+        with unit_of_work(db):
+            ids = self.analisis_repo.bulk_create(db, rows)
+            self.historial_repo.bulk_create(db, [
+                {"analisis_id": analisis_id, "estado_analisis_id": estado_id, "fecha": ahora, "operario_id": operario_id}
+                for analisis_id in ids
+            ])
+            if self.contador_repo:
+                self.contador_repo.incrementar(db, metrica_analisis_estado(estado_id), PERIODO_TOTAL, len(ids))
+
+        por_id = {a.analisis_id: a for a in db.query(Analisis).filter(Analisis.analisis_id.in_(ids))}
+        return [por_id[analisis_id] for analisis_id in ids]
 
     def start_incubation(self, db: Session, incubacion_data: dict) -> Incubacion:
         # Link analysis to incubation
@@ -104,35 +173,85 @@ class AnalysisService:
         return usage
 
     def register_resultado(self, db: Session, resultado_data: dict, is_final: bool = False) -> Resultado:
-        # Evaluate specification if provided numerically
-        analisis = self.analisis_repo.get(db, resultado_data["analisis_id"])
-        
-        conforme = None
-        if analisis and analisis.especificacion_id and "valor_numerico" in resultado_data:
-            especificacion = self.especificacion_repo.get(db, analisis.especificacion_id)
-            if especificacion:
-                val = resultado_data["valor_numerico"]
-                if especificacion.valor_min is not None and val < especificacion.valor_min:
-                    conforme = False
-                elif especificacion.valor_max is not None and val > especificacion.valor_max:
-                    conforme = False
-                else:
-                    conforme = True
-                    
-        resultado_data["conforme"] = conforme
-        
-        # Check if already has a result (for overwriting in final)
-        existing_res = db.query(Resultado).filter_by(analisis_id=resultado_data["analisis_id"]).first()
-        if existing_res:
-            res = self.resultado_repo.update(db, existing_res, resultado_data)
-        else:
-            res = self.resultado_repo.create(db, resultado_data)
-        
-        # Update Analysis Status
-        new_state = 4 if is_final else 3 # 3: Preliminar, 4: Final
-        self.change_analysis_state(db, res.analisis_id, new_state, res.operario_id)
-        
-        return res
+        registrados, errores = self.register_resultados_bulk(db, [resultado_data], is_final)
+        if errores:
+            raise ValueError(errores[0]["error"])
+        return registrados[0]
+
+    def register_resultados_bulk(self, db: Session, resultados: List[dict],
+                                 is_final: bool = False) -> Tuple[List[Resultado], List[dict]]:
+        """
+        Registra un lote de resultados (p. ej. al terminar una incubación).
+
+        Los Analisis y Resultado afectados se leen con dos consultas IN, la
+        conformidad se evalúa de una vez contra el índice de especificaciones y
+        los upserts + cambios de estado (historial incluido) se aplican en
+        memoria y se confirman con un único commit. Los ítems inválidos no
+        detienen el lote: se retornan como errores con su posición.
+
+        Retorna (resultados registrados, [{"indice", "analisis_id", "error"}]).
+        """
+        analisis_ids = {r["analisis_id"] for r in resultados}
+        analisis = {
+            a.analisis_id: a
+            for a in db.query(Analisis).filter(Analisis.analisis_id.in_(analisis_ids))
+        }
+        existentes: Dict[int, Resultado] = {}
+        for res in (db.query(Resultado).filter(Resultado.analisis_id.in_(analisis_ids))
+                    .order_by(Resultado.resultado_id)):
+            existentes.setdefault(res.analisis_id, res)
+
+        errores, validos, vistos = [], [], set()
+        for indice, resultado_data in enumerate(resultados):
+            analisis_id = resultado_data["analisis_id"]
+            if analisis_id not in analisis:
+                errores.append({"indice": indice, "analisis_id": analisis_id,
+                                "error": f"Analysis with ID {analisis_id} not found"})
+            elif analisis_id in vistos:
+                errores.append({"indice": indice, "analisis_id": analisis_id,
+                                "error": "Resultado repetido para el mismo análisis en el lote."})
+            else:
+                vistos.add(analisis_id)
+                validos.append(resultado_data)
+        if not validos:
+            return [], errores
+
+        conformes = self.spec_index.evaluate_many(
+            db,
+            [analisis[r["analisis_id"]].especificacion_id for r in validos],
+            [r.get("valor_numerico") for r in validos],
+        )
+        validos = [{**r, "conforme": conforme} for r, conforme in zip(validos, conformes)]
+        nuevo_estado_id = 4 if is_final else 3 # 3: Preliminar, 4: Final
+        ahora = datetime.now(timezone.utc)
+
+        with unit_of_work(db):
+            nuevos = [r for r in validos if r["analisis_id"] not in existentes]
+            nuevos_ids = iter(self.resultado_repo.bulk_create(db, nuevos))
+            self.resultado_repo.bulk_update(db, [
+                (existentes[r["analisis_id"]], r) for r in validos if r["analisis_id"] in existentes
+            ])
+
+            transiciones = Counter(analisis[r["analisis_id"]].estado_analisis_id for r in validos)
+            self.analisis_repo.bulk_update(db, [
+                (analisis[r["analisis_id"]], {"estado_analisis_id": nuevo_estado_id, "ultimo_cambio": ahora})
+                for r in validos
+            ])
+            self.historial_repo.bulk_create(db, [
+                {"analisis_id": r["analisis_id"], "estado_analisis_id": nuevo_estado_id,
+                 "fecha": ahora, "operario_id": r["operario_id"]}
+                for r in validos
+            ])
+            for estado_anterior_id, n in transiciones.items():
+                self._mover_contador_estado(db, estado_anterior_id, nuevo_estado_id, n)
+
+            ids = [
+                existentes[r["analisis_id"]].resultado_id if r["analisis_id"] in existentes else next(nuevos_ids)
+                for r in validos
+            ]
+
+        por_id = {r.resultado_id: r for r in db.query(Resultado).filter(Resultado.resultado_id.in_(ids))}
+        return [por_id[resultado_id] for resultado_id in ids], errores
 
     def register_usage_media(self, db: Session, usage_data: dict):
         # Validate media is approved (ID 2)
@@ -158,41 +277,58 @@ class AnalysisService:
         return self.uso_cepa_repo.create(db, usage_data)
 
     def get_analysis_report(self, db: Session, solicitud_id: int):
-        sol_repo = SolicitudMuestreoRepository()
-        muestreo_repo = MuestreoRepository()
-        muestra_repo = MuestraRepository()
-        envio_repo = EnvioMuestraRepository()
-        recepcion_repo = RecepcionRepository()
-        
-        solicitud = sol_repo.get(db, solicitud_id)
+        """
+        Árbol completo de una solicitud (muestreo → muestras → envíos → recepciones,
+        análisis → incubaciones/resultados) en un número fijo de consultas: un IN
+        por nivel, keyed por los ids del nivel anterior, sin importar el tamaño.
+        """
+        from sqlalchemy.orm import joinedload, selectinload
+        from src.backend.models.fact import SolicitudMuestreo, Muestreo, Muestra, EnvioMuestra, Recepcion
+        from src.backend.models.auth import Usuario, UsuarioRol, UsuarioLaboratorio
+
+        solicitud = (
+            db.query(SolicitudMuestreo)
+            .options(
+                selectinload(SolicitudMuestreo.equipamiento),
+                joinedload(SolicitudMuestreo.orden_manufactura),
+                joinedload(SolicitudMuestreo.punto_muestreo),
+                joinedload(SolicitudMuestreo.usuario).selectinload(Usuario.roles).joinedload(UsuarioRol.rol),
+                joinedload(SolicitudMuestreo.usuario).selectinload(Usuario.laboratorios).joinedload(UsuarioLaboratorio.laboratorio),
+            )
+            .filter(SolicitudMuestreo.solicitud_muestreo_id == solicitud_id)
+            .first()
+        )
         if not solicitud:
             return None
-            
-        muestreo = db.query(muestreo_repo.model).filter_by(solicitud_muestreo_id=solicitud_id).first()
+
+        muestreo = db.query(Muestreo).filter_by(solicitud_muestreo_id=solicitud_id).first()
         muestras = []
         envios = []
         recepciones = []
         analisis_list = []
         incubaciones = []
         resultados = []
-        
+
         if muestreo:
-            muestras = db.query(muestra_repo.model).filter_by(muestreo_id=muestreo.muestreo_id).all()
-            for m in muestras:
-                m_envios = db.query(envio_repo.model).filter_by(muestra_id=m.muestra_id).all()
-                envios.extend(m_envios)
-                for e in m_envios:
-                    m_recepciones = db.query(recepcion_repo.model).filter_by(envio_muestra_id=e.envio_muestra_id).all()
-                    recepciones.extend(m_recepciones)
-                    
-                m_analisis = db.query(self.analisis_repo.model).filter_by(muestra_id=m.muestra_id).all()
-                analisis_list.extend(m_analisis)
-                for a in m_analisis:
-                    m_incubaciones = db.query(self.incubacion_repo.model).filter_by(analisis_id=a.analisis_id).all()
-                    incubaciones.extend(m_incubaciones)
-                    m_resultados = db.query(self.resultado_repo.model).filter_by(analisis_id=a.analisis_id).all()
-                    resultados.extend(m_resultados)
-                    
+            # Ordenado por (padre, pk): mismo agrupamiento que el recorrido por muestra
+            muestras = db.query(Muestra).filter(Muestra.muestreo_id == muestreo.muestreo_id).order_by(Muestra.muestra_id).all()
+            muestra_ids = [m.muestra_id for m in muestras]
+            if muestra_ids:
+                envios = (db.query(EnvioMuestra).filter(EnvioMuestra.muestra_id.in_(muestra_ids))
+                          .order_by(EnvioMuestra.muestra_id, EnvioMuestra.envio_muestra_id).all())
+                analisis_list = (db.query(Analisis).filter(Analisis.muestra_id.in_(muestra_ids))
+                                 .order_by(Analisis.muestra_id, Analisis.analisis_id).all())
+            envio_ids = [e.envio_muestra_id for e in envios]
+            if envio_ids:
+                recepciones = (db.query(Recepcion).filter(Recepcion.envio_muestra_id.in_(envio_ids))
+                               .order_by(Recepcion.envio_muestra_id, Recepcion.recepcion_id).all())
+            analisis_ids = [a.analisis_id for a in analisis_list]
+            if analisis_ids:
+                incubaciones = (db.query(Incubacion).filter(Incubacion.analisis_id.in_(analisis_ids))
+                                .order_by(Incubacion.analisis_id, Incubacion.incubacion_id).all())
+                resultados = (db.query(Resultado).filter(Resultado.analisis_id.in_(analisis_ids))
+                              .order_by(Resultado.analisis_id, Resultado.resultado_id).all())
+
         return {
             "solicitud": solicitud,
             "muestreo": muestreo,
@@ -0,0 +1,229 @@
+"""
+Vencimientos de calibración en memoria y cambio de estado al vencer.
+
+``CalibrationScheduler`` carga con una única consulta los ``vence`` del
+índice cumplimiento_equipo (última calibración de cada equipo) en una
+lista ordenada por fecha: ``upcoming`` responde /api/equipos/vencimientos
+con bisect, sin recorrer tablas. La lista se descarta al confirmarse una
+escritura en cumplimiento_equipo o equipo_instrumento (mismo hook que el
+cache de respuestas) o al vencer ``CALIBRATION_CACHE_TTL_S``, y se recarga
+al siguiente uso. La lista es por proceso: con varios workers, el TTL acota
+la ventana en que otro worker responde con vencimientos previos.
+
+Con ``CALIBRATION_SCHEDULER=true`` un hilo de fondo duerme hasta el próximo
+vencimiento (00:00 del día siguiente al ``vence``, el mismo criterio que
+``is_compliant``) y pasa cada equipo vencido al EstadoEquipo
+``CALIBRATION_EXPIRED_STATE`` con ``EquipmentService.change_equipment_state``.
+Al arrancar pone al día los que vencieron mientras estuvo detenido.
+Habilitarlo en un solo proceso: con varios workers cada uno registraría su
+propio cambio de estado.
+"""
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from operator import itemgetter
+from time import monotonic
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.backend.core.logging import get_logger
+from src.backend.core.response_cache import on_tables_committed
+from src.backend.database.unit_of_work import unit_of_work
+from src.backend.models.dim import CumplimientoEquipo, EquipoInstrumento, EstadoEquipo
+from src.backend.repositories.dim import (EquipoInstrumentoRepository, EstadoEquipoRepository,
+                                          HistoricoEstadoEquipoRepository)
+from src.backend.services.equipment_service import EquipmentService
+
+logger = get_logger(__name__)
+
+CALIBRATION_SCHEDULER = os.getenv("CALIBRATION_SCHEDULER", "false").lower() == "true"
+CALIBRATION_EXPIRED_STATE = os.getenv("CALIBRATION_EXPIRED_STATE", "Fuera de calibración")
+CALIBRATION_SCHEDULER_USER_ID = int(os.getenv("CALIBRATION_SCHEDULER_USER_ID", "1"))
+CALIBRATION_CACHE_TTL_S = float(os.getenv("CALIBRATION_CACHE_TTL_S", "300"))
+
+# Tope de cada espera: acota el efecto de cambios de reloj o suspensiones del host
+_MAX_SLEEP_S = 3600
+
+# (vence, equipo_instrumento_id), ordenada por vence
+Vencimiento = Tuple[date, int]
+# (lista ordenada, equipos por id, expira_en): se reemplaza entera, nunca se modifica
+Snapshot = Tuple[List[Vencimiento], Dict[int, dict], float]
+
+_vence = itemgetter(0)
+
+
+class CalibrationScheduler:
+    """Lista ordenada de vencimientos + hilo que dispara los cambios de estado."""
+
+    def __init__(self,
+                 session_factory: Optional[Callable[[], Session]] = None,
+                 service: Optional[EquipmentService] = None,
+                 expired_state: str = CALIBRATION_EXPIRED_STATE,
+                 usuario_id: int = CALIBRATION_SCHEDULER_USER_ID,
+                 ttl_seconds: float = CALIBRATION_CACHE_TTL_S):
+        self.session_factory = session_factory
+        self.service = service or EquipmentService(
+            EquipoInstrumentoRepository(), HistoricoEstadoEquipoRepository(), EstadoEquipoRepository())
+        self.expired_state = expired_state
+        self.usuario_id = usuario_id
+        self.ttl_seconds = ttl_seconds
+
+        self._snapshot: Optional[Snapshot] = None
+        self._version = 0          # se incrementa en cada invalidación
+        self._lock = threading.Lock()
+        self._expired_state_id: Optional[int] = None
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self.loads = 0
+        self.fired = 0
+
+    # ─── Índice en memoria ────────────────────────────────────
+
+    def _ensure_loaded(self, db: Session) -> Tuple[List[Vencimiento], Dict[int, dict]]:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[2] > monotonic():
+            return snapshot[0], snapshot[1]
+
+        version = self._version
+        rows = db.execute(
+            select(EquipoInstrumento.equipo_instrumento_id, EquipoInstrumento.codigo,
+                   EquipoInstrumento.nombre, EquipoInstrumento.estado_equipo_id, CumplimientoEquipo.vence)
+            .join(CumplimientoEquipo,
+                  CumplimientoEquipo.equipo_instrumento_id == EquipoInstrumento.equipo_instrumento_id)
+            .where(CumplimientoEquipo.vence.is_not(None))
+        )
+        equipos = {row.equipo_instrumento_id: dict(row._mapping) for row in rows}
+        orden = sorted((e["vence"], equipo_id) for equipo_id, e in equipos.items())
+        self.loads += 1
+
+        with self._lock:
+            # Si hubo una escritura mientras se cargaba, se usa pero no se guarda
+            if self.ttl_seconds > 0 and version == self._version:
+                self._snapshot = (orden, equipos, monotonic() + self.ttl_seconds)
+        return orden, equipos
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+        # El hilo recalcula su próxima espera con los datos nuevos
+        self._wake.set()
+
+    def upcoming(self, db: Session, dias: int, hoy: Optional[date] = None,
+                 incluir_vencidos: bool = False) -> List[dict]:
+        """Equipos cuya calibración vence entre ``hoy`` y ``hoy + dias`` (inclusive), por fecha."""
+        hoy = hoy or date.today()
+        orden, equipos = self._ensure_loaded(db)
+        desde = 0 if incluir_vencidos else bisect_left(orden, hoy, key=_vence)
+        hasta = bisect_right(orden, hoy + timedelta(days=dias), key=_vence)
+        return [
+            {**equipos[equipo_id], "dias_restantes": (vence - hoy).days}
+            for vence, equipo_id in orden[desde:hasta]
+        ]
+
+    def due(self, db: Session, hoy: Optional[date] = None) -> List[int]:
+        """Equipos con la calibración vencida que todavía no están en el estado de vencido."""
+        hoy = hoy or date.today()
+        estado_id = self._resolve_expired_state(db)
+        orden, equipos = self._ensure_loaded(db)
+        return [equipo_id for _, equipo_id in orden[:bisect_left(orden, hoy, key=_vence)]
+                if equipos[equipo_id]["estado_equipo_id"] != estado_id]
+
+    def next_run(self, db: Session, hoy: Optional[date] = None) -> Optional[datetime]:
+        """Momento en que vence la próxima calibración vigente (None si no hay)."""
+        hoy = hoy or date.today()
+        orden, _ = self._ensure_loaded(db)
+        i = bisect_left(orden, hoy, key=_vence)
+        if i == len(orden):
+            return None
+        return datetime.combine(orden[i][0] + timedelta(days=1), time.min)
+
+    # ─── Cambios de estado ────────────────────────────────────
+
+    def _resolve_expired_state(self, db: Session) -> int:
+        """ID del EstadoEquipo ``expired_state``; se crea en el catálogo si no existe."""
+        if self._expired_state_id is None:
+            estado_id = db.execute(
+                select(EstadoEquipo.estado_equipo_id).where(EstadoEquipo.nombre == self.expired_state)
+            ).scalar()
+            if estado_id is None:
+                with unit_of_work(db):
+                    estado = self.service.estado_repo.create(db, {"nombre": self.expired_state}, self.usuario_id)
+                estado_id = estado.estado_equipo_id
+            self._expired_state_id = estado_id
+        return self._expired_state_id
+
+    def run_due(self, db: Session, hoy: Optional[date] = None) -> List[int]:
+        """Pasa al estado de vencido los equipos vencidos. Retorna los IDs cambiados."""
+        estado_id = self._resolve_expired_state(db)
+        cambiados = []
+        for equipo_id in self.due(db, hoy):
+            try:
+                self.service.change_equipment_state(db, equipo_id, estado_id, self.usuario_id)
+            except Exception:
+                db.rollback()
+                logger.exception(f"No se pudo marcar el equipo {equipo_id} como '{self.expired_state}'")
+                continue
+            cambiados.append(equipo_id)
+        if cambiados:
+            # Los estados cambiaron: no depender de que la instancia esté registrada en el hook
+            self.invalidate()
+            self.fired += len(cambiados)
+            logger.info(f"Calibración vencida: {len(cambiados)} equipo(s) pasados a '{self.expired_state}'")
+        return cambiados
+
+    # ─── Ciclo de vida ────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        if self.session_factory is None:
+            from src.backend.database.db_manager import db_manager
+            self.session_factory = db_manager.SessionLocal
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="calibration-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self._thread:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            proximo = None
+            try:
+                with self.session_factory() as db:
+                    self.run_due(db)
+                    proximo = self.next_run(db)
+            except Exception:
+                logger.exception("Error en el scheduler de vencimientos de calibración")
+            espera = _MAX_SLEEP_S
+            if proximo is not None:
+                espera = min(max((proximo - datetime.now()).total_seconds(), 0), _MAX_SLEEP_S)
+            self._wake.wait(espera)
+
+
+calibration_scheduler = CalibrationScheduler()
+
+on_tables_committed([CumplimientoEquipo.__tablename__, EquipoInstrumento.__tablename__],
+                    calibration_scheduler.invalidate)
+
+
+def start_calibration_scheduler() -> None:
+    """Arranca el hilo de vencimientos si CALIBRATION_SCHEDULER=true."""
+    if CALIBRATION_SCHEDULER:
+        calibration_scheduler.start()
+
+
+def shutdown_calibration_scheduler() -> None:
+    calibration_scheduler.stop()
@@ -1,12 +1,15 @@
 from sqlalchemy.orm import Session
-from datetime import datetime, timezone
-from typing import List, Optional
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
 
 from src.backend.repositories.dim import (EquipoInstrumentoRepository, 
                                           HistoricoEstadoEquipoRepository, 
-                                          EstadoEquipoRepository)
-from src.backend.models.dim import EquipoInstrumento
+                                          EstadoEquipoRepository,
+                                          CalibracionCalificacionEquipoRepository,
+                                          CumplimientoEquipoRepository)
+from src.backend.models.dim import CalibracionCalificacionEquipo, CumplimientoEquipo, EquipoInstrumento
 from src.backend.core.exceptions import EntityNotFoundException
+from src.backend.database.unit_of_work import unit_of_work
 from src.backend.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -15,49 +18,107 @@ class EquipmentService:
     def __init__(self, 
                  equipo_repo: EquipoInstrumentoRepository, 
                  historico_repo: HistoricoEstadoEquipoRepository,
-                 estado_repo: EstadoEquipoRepository):
+                 estado_repo: EstadoEquipoRepository,
+                 calibracion_repo: Optional[CalibracionCalificacionEquipoRepository] = None,
+                 cumplimiento_repo: Optional[CumplimientoEquipoRepository] = None):
         self.equipo_repo = equipo_repo
         self.historico_repo = historico_repo
         self.estado_repo = estado_repo
+        self.calibracion_repo = calibracion_repo or CalibracionCalificacionEquipoRepository()
+        self.cumplimiento_repo = cumplimiento_repo or CumplimientoEquipoRepository()
 
     def create_equipo(self, db: Session, equipo_data: dict, usuario_id: int = 1) -> EquipoInstrumento:
         # Default state to 'Operativo' (ID 1) if not provided
         if "estado_equipo_id" not in equipo_data:
             equipo_data["estado_equipo_id"] = 1
         
-        equipo = self.equipo_repo.create(db, equipo_data)
-        
-        # Register initial state in history
-        self.historico_repo.create(db, {
-            "equipo_instrumento_id": equipo.equipo_instrumento_id,
-            "estado_equipo_id": equipo.estado_equipo_id,
-            "usuario_id": usuario_id,
-            "fecha": datetime.now(timezone.utc)
-        })
+        with unit_of_work(db):
+            equipo = self.equipo_repo.create(db, equipo_data)
+            
+            # Register initial state in history
+            self.historico_repo.create(db, {
+                "equipo_instrumento_id": equipo.equipo_instrumento_id,
+                "estado_equipo_id": equipo.estado_equipo_id,
+                "usuario_id": usuario_id,
+                "fecha": datetime.now(timezone.utc)
+            })
         
         return equipo
 
-    def get_equipment_with_details(self, db: Session, skip: int = 0, limit: int = 100, 
-                                   area_id: Optional[int] = None,
-                                   tipo_id: Optional[int] = None,
-                                   estado_id: Optional[int] = None) -> List[EquipoInstrumento]:
-        from sqlalchemy.orm import joinedload
-        query = db.query(EquipoInstrumento).options(
-            joinedload(EquipoInstrumento.tipo_equipo),
-            joinedload(EquipoInstrumento.estado),
-            joinedload(EquipoInstrumento.area),
-            joinedload(EquipoInstrumento.calibraciones),
-            joinedload(EquipoInstrumento.zonas)
-        )
-        
-        if area_id:
-            query = query.filter(EquipoInstrumento.area_id == area_id)
-        if tipo_id:
-            query = query.filter(EquipoInstrumento.tipo_equipo_id == tipo_id)
-        if estado_id:
-            query = query.filter(EquipoInstrumento.estado_equipo_id == estado_id)
-            
-        return query.offset(skip).limit(limit).all()
+    # ─── Calibraciones ───────────────────────────────────────────
+
+    def register_calibracion(self, db: Session, calibracion_data: dict, usuario_id: Optional[int] = None) -> CalibracionCalificacionEquipo:
+        """Registra la calibración y actualiza el índice de cumplimiento en la misma transacción."""
+        with unit_of_work(db):
+            calibracion = self.calibracion_repo.create(db, calibracion_data, usuario_id)
+            self.cumplimiento_repo.registrar(db, calibracion)
+        return calibracion
+
+    # ─── Listado por proyección ──────────────────────────────────
+    # Mismo contenido que EquipoDetalleResponse.from_orm_extended, en dicts:
+    # una consulta con los joins de nombres y el índice de cumplimiento, y
+    # una IN para las zonas.
+
+    def get_equipment_rows(self, db: Session, skip: int = 0, limit: int = 100,
+                           area_id: Optional[int] = None,
+                           tipo_id: Optional[int] = None,
+                           estado_id: Optional[int] = None,
+                           compliance: Optional[bool] = None) -> List[dict]:
+        query = self._equipment_projection_query(db, area_id, tipo_id, estado_id, compliance)
+        rows = self.equipo_repo.get_all_projection(db, (), skip=skip, limit=limit, query=query)
+        return self._attach_zonas(db, rows)
+
+    def get_equipment_rows_page(self, db: Session, cursor: Optional[str] = None, limit: int = 100,
+                                area_id: Optional[int] = None,
+                                tipo_id: Optional[int] = None,
+                                estado_id: Optional[int] = None,
+                                compliance: Optional[bool] = None) -> Tuple[List[dict], Optional[str]]:
+        query = self._equipment_projection_query(db, area_id, tipo_id, estado_id, compliance)
+        rows, next_cursor = self.equipo_repo.get_page_projection(db, (), cursor=cursor, limit=limit, query=query)
+        return self._attach_zonas(db, rows), next_cursor
+
+    def get_equipment_detail(self, db: Session, equipo_id: int) -> Optional[dict]:
+        query = (self._equipment_projection_query(db, None, None, None)
+                 .filter(EquipoInstrumento.equipo_instrumento_id == equipo_id))
+        rows = self._attach_zonas(db, self.equipo_repo.get_all_projection(db, (), limit=1, query=query))
+        return rows[0] if rows else None
+
+    def _equipment_projection_query(self, db: Session, area_id: Optional[int], tipo_id: Optional[int],
+                                    estado_id: Optional[int], compliance: Optional[bool] = None):
+        from sqlalchemy import Boolean, case, or_, type_coerce
+        from src.backend.models.dim import Area, EstadoEquipo, TipoEquipo
+        hoy = date.today()
+        vencido = CumplimientoEquipo.vence < hoy
+        columns = EquipoInstrumento.__table__.columns.keys() + [
+            TipoEquipo.nombre.label("tipo_nombre"),
+            EstadoEquipo.nombre.label("estado_nombre"),
+            Area.nombre.label("area_nombre"),
+            # Sin fila en el índice (sin calibraciones) o sin vencimiento = en cumplimiento
+            type_coerce(case((vencido, False), else_=True), Boolean).label("is_compliant"),
+        ]
+        filters = {k: v for k, v in (("area_id", area_id), ("tipo_equipo_id", tipo_id),
+                                     ("estado_equipo_id", estado_id)) if v}
+        query = (self.equipo_repo.projection_query(db, columns, filters=filters)
+                 .outerjoin(TipoEquipo, EquipoInstrumento.tipo_equipo_id == TipoEquipo.tipo_equipo_id)
+                 .outerjoin(EstadoEquipo, EquipoInstrumento.estado_equipo_id == EstadoEquipo.estado_equipo_id)
+                 .outerjoin(Area, EquipoInstrumento.area_id == Area.area_id)
+                 .outerjoin(CumplimientoEquipo,
+                            EquipoInstrumento.equipo_instrumento_id == CumplimientoEquipo.equipo_instrumento_id))
+        if compliance is True:
+            query = query.filter(or_(CumplimientoEquipo.vence.is_(None), CumplimientoEquipo.vence >= hoy))
+        elif compliance is False:
+            query = query.filter(vencido)
+        return query
+
+    def _attach_zonas(self, db: Session, rows: List[dict]) -> List[dict]:
+        from src.backend.models.dim import ZonaEquipo
+        from src.backend.repositories.dim import ZonaEquipoRepository
+        zonas = ZonaEquipoRepository().get_related_projection(
+            db, ZonaEquipo.__table__.columns.keys(), "equipo_instrumento_id",
+            [row["equipo_instrumento_id"] for row in rows])
+        for row in rows:
+            row["zonas"] = zonas.get(row["equipo_instrumento_id"], [])
+        return rows
 
     def change_equipment_state(self, db: Session, equipo_id: int, nuevo_estado_id: int, usuario_id: int) -> EquipoInstrumento:
         # Check if equipo exists
@@ -67,14 +128,15 @@ class EquipmentService:
 
         # Update the state of the equipment
         logger.info(f"Changing state for equipment {equipo_id} to {nuevo_estado_id} by user {usuario_id}")
-        equipo = self.equipo_repo.update(db, equipo, {"estado_equipo_id": nuevo_estado_id})
+        with unit_of_work(db):
+            equipo = self.equipo_repo.update(db, equipo, {"estado_equipo_id": nuevo_estado_id})
 
-        # Register history
-        self.historico_repo.create(db, {
-            "equipo_instrumento_id": equipo_id,
-            "estado_equipo_id": nuevo_estado_id,
-            "usuario_id": usuario_id,
-            "fecha": datetime.now(timezone.utc)
-        })
+            # Register history
+            self.historico_repo.create(db, {
+                "equipo_instrumento_id": equipo_id,
+                "estado_equipo_id": nuevo_estado_id,
+                "usuario_id": usuario_id,
+                "fecha": datetime.now(timezone.utc)
+            })
         
         return equipo
@@ -8,6 +8,7 @@ from src.backend.repositories.inventory import (RecepcionPolvoSuplementoReposito
 from src.backend.models.inventory import RecepcionPolvoSuplemento, OrdenPreparacionMedio, StockMedios
 from src.backend.core.exceptions import InsufficientStockException, EntityNotFoundException
 from src.backend.core.logging import get_logger
+from src.backend.database.unit_of_work import unit_of_work
 
 logger = get_logger(__name__)
 
@@ -30,48 +31,51 @@ class InventoryService:
 
     def register_powder_reception(self, db: Session, recepcion_data: dict, usuario_id: Optional[int] = None) -> RecepcionPolvoSuplemento:
         logger.info(f"Registering powder reception: {recepcion_data.get('lote_proveedor')}")
-        recepcion = self.recepcion_polvo_repo.create(db, recepcion_data, usuario_id=usuario_id)
-        
-        # Add to stock
-        self.stock_polvo_repo.create(db, {
-            "recepcion_polvo_suplemento_id": recepcion.recepcion_polvo_suplemento_id,
-            "cantidad": recepcion_data["cantidad"]
-        }, usuario_id=usuario_id)
+        with unit_of_work(db):
+            recepcion = self.recepcion_polvo_repo.create(db, recepcion_data, usuario_id=usuario_id)
+            
+            # Add to stock
+            self.stock_polvo_repo.create(db, {
+                "recepcion_polvo_suplemento_id": recepcion.recepcion_polvo_suplemento_id,
+                "cantidad": recepcion_data["cantidad"]
+            }, usuario_id=usuario_id)
         
         return recepcion
 
     def prepare_culture_media(self, db: Session, orden_data: dict, consumos: list, usuario_id: Optional[int] = None) -> OrdenPreparacionMedio:
         logger.info(f"Preparing culture media: {orden_data.get('lote')}")
-        orden = self.orden_prep_repo.create(db, orden_data, usuario_id=usuario_id)
+        # Orden, consumos y stock resultante se confirman juntos
+        with unit_of_work(db):
+            orden = self.orden_prep_repo.create(db, orden_data, usuario_id=usuario_id)
         
-        # Consume logic
-        for consumo in consumos:
-            try:
-                stock_polvo = self.stock_polvo_repo.get(db, consumo["stock_polvo_suplemento_id"])
-                if stock_polvo and stock_polvo.cantidad >= consumo["cantidad"]:
-                    self.uso_polvo_repo.create(db, {
-                        "stock_polvo_suplemento_id": consumo["stock_polvo_suplemento_id"],
-                        "orden_preparacion_medio_id": orden.orden_preparacion_medio_id,
-                        "cantidad": consumo["cantidad"],
-                        "unidad": consumo["unidad"]
-                    }, usuario_id=usuario_id)
-                    # Decrease stock
-                    self.stock_polvo_repo.update(db, stock_polvo, {"cantidad": stock_polvo.cantidad - consumo["cantidad"]}, usuario_id=usuario_id)
-                else:
-                    stock_name = f"ID:{consumo['stock_polvo_suplemento_id']}"
-                    raise InsufficientStockException(stock_name)
-            except InsufficientStockException as e:
-                logger.warning(f"Stock failure: {str(e)}")
-                raise
+            # Consume logic
+            for consumo in consumos:
+                try:
+                    stock_polvo = self.stock_polvo_repo.get(db, consumo["stock_polvo_suplemento_id"])
+                    if stock_polvo and stock_polvo.cantidad >= consumo["cantidad"]:
+                        self.uso_polvo_repo.create(db, {
+                            "stock_polvo_suplemento_id": consumo["stock_polvo_suplemento_id"],
+                            "orden_preparacion_medio_id": orden.orden_preparacion_medio_id,
+                            "cantidad": consumo["cantidad"],
+                            "unidad": consumo["unidad"]
+                        }, usuario_id=usuario_id)
+                        # Decrease stock
+                        self.stock_polvo_repo.update(db, stock_polvo, {"cantidad": stock_polvo.cantidad - consumo["cantidad"]}, usuario_id=usuario_id)
+                    else:
+                        stock_name = f"ID:{consumo['stock_polvo_suplemento_id']}"
+                        raise InsufficientStockException(stock_name)
+                except InsufficientStockException as e:
+                    logger.warning(f"Stock failure: {str(e)}")
+                    raise
         
-        # Generate initial stock of the prepared media in QC "Pendiente" State
-        estado_pendiente = self.estado_qc_repo.get_all(db) 
+            # Generate initial stock of the prepared media in QC "Pendiente" State
+            estado_pendiente = self.estado_qc_repo.get_all(db) 
         
-        self.stock_medios_repo.create(db, {
-            "orden_preparacion_medio_id": orden.orden_preparacion_medio_id,
-            "lote_interno": orden_data["lote"],
-            "vence": orden_data.get("vence", datetime.now(timezone.utc)),
-            "estado_qc_id": estado_pendiente[0].estado_qc_id if estado_pendiente else 1 
-        }, usuario_id=usuario_id)
+            self.stock_medios_repo.create(db, {
+                "orden_preparacion_medio_id": orden.orden_preparacion_medio_id,
+                "lote_interno": orden_data["lote"],
+                "vence": orden_data.get("vence", datetime.now(timezone.utc)),
+                "estado_qc_id": estado_pendiente[0].estado_qc_id if estado_pendiente else 1 
+            }, usuario_id=usuario_id)
         
         return orden
@@ -5,6 +5,7 @@ from src.backend.repositories.fact import (OrdenManufacturaRepository, Manufactu
                                            HistoricoEstadoManufacturaRepository, EstadoManufacturaRepository,
                                            ManufacturaOperarioRepository)
 from src.backend.models.fact import Manufactura, OrdenManufactura, HistoricoEstadoManufactura, ManufacturaOperario, UsoMaterialManufactura
+from src.backend.database.unit_of_work import unit_of_work
 
 class ManufacturingService:
     def __init__(self,
@@ -22,15 +23,16 @@ class ManufacturingService:
         self.sample_service = sample_service
 
     def create_manufacture_process(self, db: Session, manufactura_data: dict, usuario_id: int) -> Manufactura:
-        manufactura = self.manufactura_repo.create(db, manufactura_data)
-        
-        # Register history
-        self.historico_repo.create(db, {
-            "manufactura_id": manufactura.manufactura_id,
-            "estado_manufactura_id": manufactura_data["estado_manufactura_id"],
-            "usuario_id": usuario_id,
-            "fecha": datetime.now(timezone.utc)
-        })
+        with unit_of_work(db):
+            manufactura = self.manufactura_repo.create(db, manufactura_data)
+            
+            # Register history
+            self.historico_repo.create(db, {
+                "manufactura_id": manufactura.manufactura_id,
+                "estado_manufactura_id": manufactura_data["estado_manufactura_id"],
+                "usuario_id": usuario_id,
+                "fecha": datetime.now(timezone.utc)
+            })
         
         return manufactura
 
@@ -48,25 +50,26 @@ class ManufacturingService:
             if not manufactura.fecha_fin:
                 update_data["fecha_fin"] = datetime.now(timezone.utc)
 
-        manufactura = self.manufactura_repo.update(db, manufactura, update_data)
+        with unit_of_work(db):
+            manufactura = self.manufactura_repo.update(db, manufactura, update_data)
 
-        # Register history
-        self.historico_repo.create(db, {
-            "manufactura_id": manufactura_id,
-            "estado_manufactura_id": nuevo_estado_id,
-            "usuario_id": usuario_id,
-            "fecha": datetime.now(timezone.utc)
-        })
-
-        # TRIGGER: Auto-generate SolicitudMuestreo when process starts ('En curso' ID 6)
-        if nuevo_estado_id == 6 and self.sample_service:
-            self.sample_service.create_sampling_request(db, {
+            # Register history
+            self.historico_repo.create(db, {
+                "manufactura_id": manufactura_id,
+                "estado_manufactura_id": nuevo_estado_id,
                 "usuario_id": usuario_id,
-                "tipo": "Producto",
-                "orden_manufactura_id": manufactura.orden_manufactura_id,
-                "estado_solicitud_id": 1, # 'Pendiente'
-                "observacion": f"Solicitud automática por inicio de manufactura {manufactura_id}"
-            }, usuario_id=usuario_id)
+                "fecha": datetime.now(timezone.utc)
+            })
+
+            # TRIGGER: Auto-generate SolicitudMuestreo when process starts ('En curso' ID 6)
+            if nuevo_estado_id == 6 and self.sample_service:
+                self.sample_service.create_sampling_request(db, {
+                    "usuario_id": usuario_id,
+                    "tipo": "Producto",
+                    "orden_manufactura_id": manufactura.orden_manufactura_id,
+                    "estado_solicitud_id": 1, # 'Pendiente'
+                    "observacion": f"Solicitud automática por inicio de manufactura {manufactura_id}"
+                }, usuario_id=usuario_id)
 
         return manufactura
 
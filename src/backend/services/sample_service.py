@@ -4,6 +4,8 @@ from datetime import datetime, timezone
 from src.backend.repositories.fact import (SolicitudMuestreoRepository, HistoricoSolicitudMuestreoRepository,
                                            MuestreoRepository, MuestraRepository, EnvioMuestraRepository, RecepcionRepository)
 from src.backend.models.fact import SolicitudMuestreo, SolicitudMuestreoEquipo, Muestreo, Muestra, EnvioMuestra, Recepcion
+from src.backend.database.unit_of_work import unit_of_work
+from src.backend.repositories.dashboard import ContadorDashboardRepository, METRICA_SOLICITUDES
 
 class SampleService:
     def __init__(self,
@@ -13,7 +15,8 @@ class SampleService:
                  muestra_repo: MuestraRepository,
                  envio_repo: EnvioMuestraRepository,
                  recepcion_repo: RecepcionRepository,
-                 analysis_service = None):
+                 analysis_service = None,
+                 contador_repo: ContadorDashboardRepository = None):
         self.solicitud_repo = solicitud_repo
         self.historico_solicitud_repo = historico_solicitud_repo
         self.muestreo_repo = muestreo_repo
@@ -21,68 +24,93 @@ class SampleService:
         self.envio_repo = envio_repo
         self.recepcion_repo = recepcion_repo
         self.analysis_service = analysis_service
+        self.contador_repo = contador_repo
 
     def create_sampling_request(self, db: Session, solicitud_data: dict, usuario_id: int) -> SolicitudMuestreo:
         equipos_ids = solicitud_data.pop("equipos_ids", [])
-        solicitud = self.solicitud_repo.create(db, solicitud_data)
-        
-        # Link multiple equipment
-        if equipos_ids:
-            for eq_id in equipos_ids:
-                db.add(SolicitudMuestreoEquipo(solicitud_muestreo_id=solicitud.solicitud_muestreo_id, equipo_instrumento_id=eq_id))
-        
-        # Insert initial history
-        self.historico_solicitud_repo.create(db, {
-            "solicitud_muestreo_id": solicitud.solicitud_muestreo_id,
-            "estado_solicitud_id": solicitud_data["estado_solicitud_id"],
-            "fecha": datetime.now(timezone.utc),
-            "usuario_id": usuario_id,
-            "observacion": "Creación de solicitud"
-        })
+        with unit_of_work(db):
+            solicitud = self.solicitud_repo.create(db, solicitud_data)
+            
+            # Link multiple equipment
+            if equipos_ids:
+                for eq_id in equipos_ids:
+                    db.add(SolicitudMuestreoEquipo(solicitud_muestreo_id=solicitud.solicitud_muestreo_id, equipo_instrumento_id=eq_id))
+            
+            # Insert initial history
+            self.historico_solicitud_repo.create(db, {
+                "solicitud_muestreo_id": solicitud.solicitud_muestreo_id,
+                "estado_solicitud_id": solicitud_data["estado_solicitud_id"],
+                "fecha": datetime.now(timezone.utc),
+                "usuario_id": usuario_id,
+                "observacion": "Creación de solicitud"
+            })
+
+            if self.contador_repo:
+                self.contador_repo.incrementar(db, METRICA_SOLICITUDES, solicitud.fecha.date().isoformat())
         
-        db.commit()
         return solicitud
 
+    def update_sampling_request(self, db: Session, solicitud_id: int, update_data: dict, options=None) -> SolicitudMuestreo:
+        """Edición directa de una solicitud (PUT); si cambia la fecha mueve su contador diario."""
+        solicitud = self.solicitud_repo.get(db, solicitud_id, options=options)
+        if not solicitud:
+            raise ValueError(f"Sampling request with ID {solicitud_id} not found")
+
+        dia_anterior = solicitud.fecha.date()
+        with unit_of_work(db):
+            solicitud = self.solicitud_repo.update(db, solicitud, update_data)
+            dia_nuevo = solicitud.fecha.date()
+            if self.contador_repo and dia_nuevo != dia_anterior:
+                self.contador_repo.incrementar(db, METRICA_SOLICITUDES, dia_anterior.isoformat(), -1)
+                self.contador_repo.incrementar(db, METRICA_SOLICITUDES, dia_nuevo.isoformat())
+        return solicitud
+
+    def delete_sampling_request(self, db: Session, solicitud_id: int) -> None:
+        solicitud = self.solicitud_repo.get(db, solicitud_id)
+        if not solicitud:
+            raise ValueError(f"Sampling request with ID {solicitud_id} not found")
+
+        dia = solicitud.fecha.date()
+        with unit_of_work(db):
+            self.solicitud_repo.delete(db, solicitud_id)
+            if self.contador_repo:
+                self.contador_repo.incrementar(db, METRICA_SOLICITUDES, dia.isoformat(), -1)
+
     def register_sampling_session(self, db: Session, session_data: dict, muestras_data: list, envios_data: list = None) -> Muestreo:
         try:
-            # Create session
-            muestreo = self.muestreo_repo.create(db, session_data)
-            db.flush()
-            
-            # Create individual samples in session
-            created_samples = []
-            for muestra_val in muestras_data:
-                muestra_val["muestreo_id"] = muestreo.muestreo_id
-                s = self.muestra_repo.create(db, muestra_val)
-                db.flush()
-                created_samples.append(s)
+            # Toda la sesión se confirma con un único commit (atómico)
+            with unit_of_work(db):
+                # Create session
+                muestreo = self.muestreo_repo.create(db, session_data)
                 
-            # Handle fractioned shipments if provided
-            if envios_data:
-                for envio_val in envios_data:
+                # Create individual samples in session (single batched insert)
+                for muestra_val in muestras_data:
+                    muestra_val["muestreo_id"] = muestreo.muestreo_id
+                muestra_ids = self.muestra_repo.bulk_create(db, muestras_data)
+                    
+                # Handle fractioned shipments if provided
+                if envios_data:
                     # Link to each sample in the session for this demo
-                    for s in created_samples:
-                        envio_copy = envio_val.copy()
-                        envio_copy["muestra_id"] = s.muestra_id
-                        self.envio_repo.create(db, envio_copy)
-                db.flush()
+                    self.envio_repo.bulk_create(db, [
+                        {**envio_val, "muestra_id": muestra_id}
+                        for envio_val in envios_data
+                        for muestra_id in muestra_ids
+                    ])
 
-            # Update Solicitud Status to 'Completado' (3)
-            solicitud = self.solicitud_repo.get(db, session_data["solicitud_muestreo_id"])
-            if solicitud:
-                self.solicitud_repo.update(db, solicitud, {"estado_solicitud_id": 3})
-                self.historico_solicitud_repo.create(db, {
-                    "solicitud_muestreo_id": solicitud.solicitud_muestreo_id,
-                    "estado_solicitud_id": 3,
-                    "fecha": datetime.now(timezone.utc),
-                    "usuario_id": session_data.get("operario_id", 1),
-                    "observacion": f"Muestreo ejecutado (Sesión #{muestreo.muestreo_id})"
-                })
+                # Update Solicitud Status to 'Completado' (3)
+                solicitud = self.solicitud_repo.get(db, session_data["solicitud_muestreo_id"])
+                if solicitud:
+                    self.solicitud_repo.update(db, solicitud, {"estado_solicitud_id": 3})
+                    self.historico_solicitud_repo.create(db, {
+                        "solicitud_muestreo_id": solicitud.solicitud_muestreo_id,
+                        "estado_solicitud_id": 3,
+                        "fecha": datetime.now(timezone.utc),
+                        "usuario_id": session_data.get("operario_id", 1),
+                        "observacion": f"Muestreo ejecutado (Sesión #{muestreo.muestreo_id})"
+                    })
             
-            db.commit()
             return muestreo
         except Exception as e:
-            db.rollback()
             from src.backend.core.logging import get_logger
             logger = get_logger(__name__)
             logger.error(f"Error in register_sampling_session: {str(e)}", exc_info=True)
@@ -90,21 +118,22 @@ class SampleService:
 
     def receive_sample(self, db: Session, recepcion_data: dict) -> Recepcion:
         # Business logic for receiving sample at lab
-        recepcion = self.recepcion_repo.create(db, recepcion_data)
+        with unit_of_work(db):
+            recepcion = self.recepcion_repo.create(db, recepcion_data)
 
-        # TRIGGER: If accepted (total or partial), auto-create Analysis
-        if recepcion.decision in ["Aceptado", "Aceptado Parcial"] and self.analysis_service:
-            # Find the sample from the shipment
-            envio = self.envio_repo.get(db, recepcion.envio_muestra_id)
-            if envio:
-                # Create Analysis in 'Programado' (1) state
-                self.analysis_service.create_analisis(db, {
-                    "muestra_id": envio.muestra_id,
-                    "recepcion_id": recepcion.recepcion_id,
-                    "metodo_version_id": 1, # Placeholder, should be resolved based on product
-                    "estado_analisis_id": 1, # 'Programado'
-                    "operario_id": recepcion.operario_id,
-                    "fecha_inicio": datetime.now(timezone.utc)
-                }, operario_id=recepcion.operario_id)
+            # TRIGGER: If accepted (total or partial), auto-create Analysis
+            if recepcion.decision in ["Aceptado", "Aceptado Parcial"] and self.analysis_service:
+                # Find the sample from the shipment
+                envio = self.envio_repo.get(db, recepcion.envio_muestra_id)
+                if envio:
+                    # Create Analysis in 'Programado' (1) state
+                    self.analysis_service.create_analisis(db, {
+                        "muestra_id": envio.muestra_id,
+                        "recepcion_id": recepcion.recepcion_id,
+                        "metodo_version_id": 1, # Placeholder, should be resolved based on product
+                        "estado_analisis_id": 1, # 'Programado'
+                        "operario_id": recepcion.operario_id,
+                        "fecha_inicio": datetime.now(timezone.utc)
+                    }, operario_id=recepcion.operario_id)
 
         return recepcion
@@ -0,0 +1,110 @@
+"""
+Motor de evaluación de especificaciones.
+
+``SpecIndex`` mantiene en memoria las ``Especificacion`` activas agrupadas
+por producto (producto_id → {especificacion_id: (valor_min, valor_max)}).
+Se carga con una única consulta al primer uso y se descarta cuando se
+confirma una escritura sobre ``especificacion`` (mismo hook que el cache de
+respuestas) o al vencer ``SPEC_CACHE_TTL_S``. El índice es por proceso:
+con varios workers, el TTL acota la ventana con límites previos.
+
+``evaluate_many`` evalúa un lote de resultados contra el índice sin
+consultar la BD por cada uno.
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.backend.core.response_cache import on_tables_committed
+from src.backend.models.master import Especificacion
+
+SPEC_CACHE_TTL_S = float(os.getenv("SPEC_CACHE_TTL_S", "300"))
+
+# (valor_min, valor_max); None = sin límite por ese lado
+Limites = Tuple[Optional[float], Optional[float]]
+
+
+def evaluate(limites: Optional[Limites], valor: Optional[float]) -> Optional[bool]:
+    """Conformidad de ``valor`` frente a ``limites`` (None si no hay especificación o valor)."""
+    if limites is None or valor is None:
+        return None
+    valor_min, valor_max = limites
+    if valor_min is not None and valor < valor_min:
+        return False
+    if valor_max is not None and valor > valor_max:
+        return False
+    return True
+
+
+class SpecIndex:
+    """Índice en memoria de especificaciones activas por producto."""
+
+    def __init__(self, ttl_seconds: float = SPEC_CACHE_TTL_S):
+        self.ttl_seconds = ttl_seconds
+        self._por_producto: Dict[int, Dict[int, Limites]] = {}
+        self._por_id: Dict[int, Limites] = {}
+        self._expira_en = 0.0
+        self._lock = threading.Lock()
+        self._version = 0          # se incrementa en cada invalidación
+        self.loads = 0
+        self.invalidations = 0
+
+    def _ensure_loaded(self, db: Session) -> Tuple[Dict[int, Dict[int, Limites]], Dict[int, Limites]]:
+        por_producto, por_id = self._por_producto, self._por_id
+        if self._expira_en > time.monotonic():
+            return por_producto, por_id
+
+        version = self._version
+        por_producto, por_id = {}, {}
+        rows = db.execute(
+            select(Especificacion.especificacion_id, Especificacion.producto_id,
+                   Especificacion.valor_min, Especificacion.valor_max)
+            .where(Especificacion.activo == True)
+        )
+        for especificacion_id, producto_id, valor_min, valor_max in rows:
+            limites = (valor_min, valor_max)
+            por_id[especificacion_id] = limites
+            por_producto.setdefault(producto_id, {})[especificacion_id] = limites
+        self.loads += 1
+
+        with self._lock:
+            # Si hubo una escritura mientras se cargaba, se usa pero no se guarda
+            if self.ttl_seconds > 0 and version == self._version:
+                self._por_producto, self._por_id = por_producto, por_id
+                self._expira_en = time.monotonic() + self.ttl_seconds
+        return por_producto, por_id
+
+    def for_producto(self, db: Session, producto_id: int) -> Dict[int, Limites]:
+        """{especificacion_id: (valor_min, valor_max)} de las especificaciones activas de ``producto_id``."""
+        por_producto, _ = self._ensure_loaded(db)
+        return dict(por_producto.get(producto_id, {}))
+
+    def get(self, db: Session, especificacion_id: Optional[int]) -> Optional[Limites]:
+        if especificacion_id is None:
+            return None
+        return self._ensure_loaded(db)[1].get(especificacion_id)
+
+    def evaluate_many(self, db: Session, especificacion_ids: Sequence[Optional[int]],
+                      valores: Sequence[Optional[float]]) -> List[Optional[bool]]:
+        """Conformidad de cada ``valores[i]`` frente a ``especificacion_ids[i]`` (una sola carga del índice)."""
+        _, por_id = self._ensure_loaded(db)
+        return [
+            evaluate(por_id.get(especificacion_id), valor)
+            for especificacion_id, valor in zip(especificacion_ids, valores)
+        ]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._expira_en = 0.0
+            self._por_producto, self._por_id = {}, {}
+            self.invalidations += 1
+
+
+spec_index = SpecIndex()
+
+on_tables_committed([Especificacion.__tablename__], spec_index.invalidate)
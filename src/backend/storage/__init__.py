@@ -0,0 +1,25 @@
+"""Almacenamiento de documentos (``DOCUMENT_STORAGE``: local | s3)."""
+import os
+
+from src.backend.storage.base import (
+    DOCUMENT_GC_GRACE_S, DocumentStorage, StoredBlob,
+    collect_blob, collect_garbage, content_key, reference_count,
+)
+
+DOCUMENT_STORAGE = os.getenv("DOCUMENT_STORAGE", "local").lower()
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+
+_storage = None
+
+
+def get_document_storage() -> DocumentStorage:
+    """Backend configurado (una instancia por proceso)."""
+    global _storage
+    if _storage is None:
+        if DOCUMENT_STORAGE == "s3":
+            from src.backend.storage.s3 import S3DocumentStorage
+            _storage = S3DocumentStorage()
+        else:
+            from src.backend.storage.local import LocalDocumentStorage
+            _storage = LocalDocumentStorage(UPLOAD_DIR)
+    return _storage
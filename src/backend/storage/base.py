@@ -0,0 +1,89 @@
+"""
+Interfaz de almacenamiento de documentos direccionado por contenido.
+
+Cada archivo se guarda una sola vez bajo la clave derivada de su SHA-256
+(``ab/cd/abcd…``): subir el mismo certificado para varios equipos reutiliza
+el mismo blob. Las filas de ``Documento`` con ese ``sha256`` son las
+referencias; un blob sin referencias se elimina con ``collect_blob`` /
+``collect_garbage`` una vez superado ``DOCUMENT_GC_GRACE_S`` (una subida
+concurrente del mismo contenido renueva la antigüedad del blob antes de
+insertar su fila).
+"""
+import os
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional, Tuple
+
+from fastapi import UploadFile
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from starlette.responses import Response
+
+from src.backend.models.documents import Documento
+
+DOCUMENT_GC_GRACE_S = int(os.getenv("DOCUMENT_GC_GRACE_S", "3600"))
+
+# (clave, tamaño en bytes, sha256)
+StoredBlob = Tuple[str, int, str]
+
+
+def content_key(sha256: str) -> str:
+    """Clave fragmentada por prefijo del hash (evita directorios con miles de archivos)."""
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+class DocumentStorage(ABC):
+    """Backend de almacenamiento de blobs; las implementaciones definen la E/S."""
+
+    @abstractmethod
+    async def save(self, file: UploadFile) -> StoredBlob:
+        """Guarda el contenido (si no existía) y retorna (clave, tamaño, sha256)."""
+
+    @abstractmethod
+    def response(self, key: str, filename: str, media_type: str, http_range: Optional[str] = None) -> Response:
+        """Respuesta de descarga del blob (206 si se pide un ``Range``)."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def age(self, key: str) -> float:
+        """Segundos desde la última escritura (o reutilización) del blob."""
+
+    @abstractmethod
+    def keys(self) -> Iterator[str]:
+        ...
+
+
+def reference_count(db: Session, sha256: str) -> int:
+    return db.query(func.count(Documento.documento_id)).filter(Documento.sha256 == sha256).scalar()
+
+
+def collect_blob(db: Session, storage: DocumentStorage, sha256: str, grace_s: Optional[int] = None) -> bool:
+    """
+    Elimina el blob de ``sha256`` si ninguna fila lo referencia y es más
+    antiguo que ``grace_s`` (default ``DOCUMENT_GC_GRACE_S``). Llamar después
+    del commit del borrado; lo que quede lo limpia ``collect_garbage``.
+    """
+    grace_s = DOCUMENT_GC_GRACE_S if grace_s is None else grace_s
+    key = content_key(sha256)
+    if reference_count(db, sha256) or not storage.exists(key) or storage.age(key) < grace_s:
+        return False
+    storage.delete(key)
+    return True
+
+
+def collect_garbage(db: Session, storage: DocumentStorage, grace_s: Optional[int] = None) -> int:
+    """Barrido completo: elimina los blobs sin referencias más antiguos que ``grace_s``."""
+    grace_s = DOCUMENT_GC_GRACE_S if grace_s is None else grace_s
+    referenced = {sha for (sha,) in db.query(Documento.sha256).filter(Documento.sha256.isnot(None)).distinct()}
+    removed = 0
+    for key in list(storage.keys()):
+        if key.rsplit("/", 1)[-1] not in referenced and storage.age(key) >= grace_s:
+            storage.delete(key)
+            removed += 1
+    return removed
@@ -0,0 +1,69 @@
+"""Almacenamiento de documentos en el filesystem local (``UPLOAD_DIR``)."""
+import os
+import time
+import uuid
+from typing import Iterator, Optional
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import FileResponse, Response
+
+from src.backend.core.uploads import save_upload
+from src.backend.storage.base import DocumentStorage, StoredBlob, content_key
+
+_BLOBS_DIR = "sha256"
+_TMP_DIR = "tmp"
+
+
+class LocalDocumentStorage(DocumentStorage):
+    """
+    Blobs en ``<root>/sha256/ab/cd/<hash>``. La subida se escribe primero en
+    ``<root>/tmp`` y se mueve con ``os.replace`` (atómico): nunca queda un
+    blob a medio escribir bajo su clave.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(os.path.join(root, _TMP_DIR), exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, _BLOBS_DIR, *key.split("/"))
+
+    async def save(self, file: UploadFile) -> StoredBlob:
+        tmp_path = os.path.join(self.root, _TMP_DIR, uuid.uuid4().hex)
+        size, sha256 = await save_upload(file, tmp_path)
+        key = content_key(sha256)
+        await run_in_threadpool(self._commit, tmp_path, self.path(key))
+        return key, size, sha256
+
+    @staticmethod
+    def _commit(tmp_path: str, final_path: str) -> None:
+        if os.path.exists(final_path):
+            # Deduplicado: se descarta la copia y se renueva la antigüedad del blob
+            os.remove(tmp_path)
+            os.utime(final_path)
+            return
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(tmp_path, final_path)
+
+    def response(self, key: str, filename: str, media_type: str, http_range: Optional[str] = None) -> Response:
+        # FileResponse atiende Range / If-Range por su cuenta
+        return FileResponse(path=self.path(key), filename=filename, media_type=media_type)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def age(self, key: str) -> float:
+        return time.time() - os.path.getmtime(self.path(key))
+
+    def keys(self) -> Iterator[str]:
+        base = os.path.join(self.root, _BLOBS_DIR)
+        for dirpath, _, filenames in os.walk(base):
+            for name in filenames:
+                yield os.path.relpath(os.path.join(dirpath, name), base).replace(os.sep, "/")
@@ -0,0 +1,117 @@
+"""
+Almacenamiento de documentos en un bucket S3 compatible (AWS, MinIO, …).
+
+Requiere ``boto3`` (dependencia opcional). Las credenciales se toman de la
+configuración estándar de boto3 (``AWS_ACCESS_KEY_ID``, …).
+"""
+import os
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+
+from src.backend.core.uploads import UPLOAD_CHUNK_SIZE, save_upload
+from src.backend.storage.base import DocumentStorage, StoredBlob, content_key
+
+S3_BUCKET = os.getenv("S3_BUCKET", "lims-documentos")
+S3_PREFIX = os.getenv("S3_PREFIX", "sha256/")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+S3_REGION = os.getenv("S3_REGION") or None
+
+
+class S3DocumentStorage(DocumentStorage):
+    """
+    Blobs en ``s3://<bucket>/<prefix>ab/cd/<hash>``. La subida se copia a un
+    archivo temporal (hash al vuelo) y solo se envía si la clave no existe;
+    si ya existe se renueva su LastModified con un copy sobre sí mismo.
+    """
+
+    def __init__(self, bucket: str = S3_BUCKET, prefix: str = S3_PREFIX, client=None):
+        if client is None:
+            import boto3
+
+            client = boto3.client("s3", endpoint_url=S3_ENDPOINT_URL, region_name=S3_REGION)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    async def save(self, file: UploadFile) -> StoredBlob:
+        tmp_path = os.path.join(tempfile.gettempdir(), f"lims-upload-{uuid.uuid4().hex}")
+        try:
+            size, sha256 = await save_upload(file, tmp_path)
+            key = content_key(sha256)
+            await run_in_threadpool(self._commit, tmp_path, key)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return key, size, sha256
+
+    def _commit(self, tmp_path: str, key: str) -> None:
+        object_key = self._object_key(key)
+        if self.exists(key):
+            self.client.copy_object(
+                Bucket=self.bucket, Key=object_key,
+                CopySource={"Bucket": self.bucket, "Key": object_key},
+                MetadataDirective="REPLACE",
+            )
+            return
+        self.client.upload_file(tmp_path, self.bucket, object_key)
+
+    def response(self, key: str, filename: str, media_type: str, http_range: Optional[str] = None) -> Response:
+        from botocore.exceptions import ClientError
+
+        params = {"Bucket": self.bucket, "Key": self._object_key(key)}
+        if http_range:
+            params["Range"] = http_range
+        try:
+            obj = self.client.get_object(**params)
+        except ClientError as e:
+            if not http_range or e.response["Error"]["Code"] != "InvalidRange":
+                raise
+            # Mismo 416 que FileResponse en el almacenamiento local
+            size = self.client.head_object(Bucket=self.bucket, Key=params["Key"])["ContentLength"]
+            return PlainTextResponse(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Content-Length": str(obj["ContentLength"]),
+            "Content-Disposition": f'attachment; filename="{filename}"',
+        }
+        if obj.get("ContentRange"):
+            headers["Content-Range"] = obj["ContentRange"]
+        return StreamingResponse(
+            obj["Body"].iter_chunks(UPLOAD_CHUNK_SIZE),
+            status_code=206 if obj.get("ContentRange") else 200,
+            media_type=media_type,
+            headers=headers,
+        )
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def age(self, key: str) -> float:
+        head = self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        return (datetime.now(timezone.utc) - head["LastModified"]).total_seconds()
+
+    def keys(self) -> Iterator[str]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for obj in page.get("Contents", []):
+                yield obj["Key"][len(self.prefix):]
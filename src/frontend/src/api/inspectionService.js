@@ -15,6 +15,14 @@ export const inspectionService = {
     return response.data;
   },
 
+  /**
+   * Per-status sampling counts ({ por_estado: { STATUS: n }, total }).
+   */
+  getSummary: async () => {
+    const response = await api.get('inspection/samplings/summary');
+    return response.data;
+  },
+
   /**
    * Get a single sampling by ID.
    */
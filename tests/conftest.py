@@ -9,6 +9,9 @@ import src.backend.models as models
 from src.backend.api.app import app
 from src.backend.api.dependencies import get_db
 from src.backend.api.security import hash_password
+from src.backend.core.response_cache import response_cache
+from src.backend.services.spec_engine import spec_index
+from src.backend.services.calibration_scheduler import calibration_scheduler
 from src.backend.models.auth import Usuario, Rol, UsuarioRol
 from src.backend.models.fact import EstadoSolicitud, EstadoAnalisis, EstadoManufactura
 from src.backend.models.dim import Sistema, Planta, Area, TipoSolicitudMuestreo
@@ -27,6 +30,10 @@ def engine():
 def db_session(engine):
     Session = sessionmaker(bind=engine)
     session = Session()
+    # Los tests insertan filas sin pasar por los repositorios: se parte sin respuestas cacheadas
+    response_cache.clear()
+    spec_index.invalidate()
+    calibration_scheduler.invalidate()
     yield session
     session.close()
 
@@ -102,3 +102,133 @@ def test_analysis_requires_auth(client):
     """Los endpoints protegidos retornan 401 sin token JWT."""
     response = client.get("/api/analisis/")
     assert response.status_code == 401
+
+
+# ─── Especificaciones y resultados en lote ───────────────────────────────────
+
+@pytest.fixture
+def sin_auditoria(db_session):
+    """Descarta al final los AuditLog generados por el test."""
+    from sqlalchemy import func
+    from src.backend.models.audit import AuditLog
+    ultimo = db_session.query(func.max(AuditLog.audit_log_id)).scalar() or 0
+    yield
+    db_session.query(AuditLog).filter(AuditLog.audit_log_id > ultimo).delete()
+    db_session.commit()
+
+
+def _crear_especificacion(db_session, valor_min, valor_max, producto_id=900):
+    from src.backend.repositories.master import EspecificacionRepository
+    return EspecificacionRepository().create(db_session, {
+        "producto_id": producto_id, "parametro": "Recuento aerobios", "tipo_limite": "RANGO",
+        "valor_min": valor_min, "valor_max": valor_max, "unidad": "UFC/g",
+    })
+
+
+def test_spec_index_invalidated_on_spec_write(db_session, sin_auditoria):
+    """El índice se carga una vez y se descarta al confirmar una escritura en especificacion."""
+    from src.backend.repositories.master import EspecificacionRepository
+    from src.backend.services.spec_engine import spec_index
+
+    spec = _crear_especificacion(db_session, 1.0, 10.0, producto_id=901)
+    assert spec_index.get(db_session, spec.especificacion_id) == (1.0, 10.0)
+    assert spec_index.for_producto(db_session, 901) == {spec.especificacion_id: (1.0, 10.0)}
+    loads = spec_index.loads
+    assert spec_index.evaluate_many(db_session, [spec.especificacion_id] * 4 + [None],
+                                    [0.5, 1.0, 10.0, 11.0, 5.0]) == [False, True, True, False, None]
+    assert spec_index.loads == loads
+
+    EspecificacionRepository().update(db_session, spec, {"valor_max": 20.0})
+    assert spec_index.evaluate_many(db_session, [spec.especificacion_id], [11.0]) == [True]
+    assert spec_index.loads == loads + 1
+
+    EspecificacionRepository().delete(db_session, spec.especificacion_id)
+    assert spec_index.get(db_session, spec.especificacion_id) is None
+
+
+def _crear_analisis_con_spec(auth_client, especificacion_id, n):
+    return [
+        auth_client.post("/api/analisis/", json={
+            **_analisis_payload(), "muestra_id": 9001, "especificacion_id": especificacion_id,
+        }).json()["analisis_id"]
+        for _ in range(n)
+    ]
+
+
+def test_register_resultados_bulk(auth_client, db_session, sin_auditoria):
+    """POST /api/analisis/resultados/bulk evalúa la conformidad de todo el lote."""
+    spec = _crear_especificacion(db_session, None, 100.0)
+    ids = _crear_analisis_con_spec(auth_client, spec.especificacion_id, 3)
+    payload = {"resultados": [
+        {"analisis_id": ids[0], "operario_id": 1, "valor_numerico": 50.0, "unidad": "UFC/g"},
+        {"analisis_id": ids[1], "operario_id": 1, "valor_numerico": 150.0, "unidad": "UFC/g"},
+        {"analisis_id": ids[2], "operario_id": 1, "valor": "Ausencia"},
+    ]}
+    response = auth_client.post("/api/analisis/resultados/bulk", json=payload)
+    assert response.status_code == 201
+    data = response.json()
+    assert data["errores"] == []
+    assert [r["conforme"] for r in data["registrados"]] == [True, False, None]
+    assert {auth_client.get(f"/api/analisis/{i}").json()["estado_analisis_id"] for i in ids} == {3}
+
+    # Re-registro como final: sobrescribe el resultado existente
+    payload["resultados"][1]["valor_numerico"] = 80.0
+    response = auth_client.post("/api/analisis/resultados/bulk?is_final=true", json=payload)
+    assert response.status_code == 201
+    registrados = response.json()["registrados"]
+    assert [r["resultado_id"] for r in registrados] == [r["resultado_id"] for r in data["registrados"]]
+    assert registrados[1]["conforme"] is True
+    assert auth_client.get(f"/api/analisis/{ids[1]}").json()["estado_analisis_id"] == 4
+
+
+def test_register_resultados_bulk_reports_item_errors(auth_client, db_session, sin_auditoria):
+    """Los ítems inválidos se informan por posición sin impedir el resto del lote."""
+    ids = _crear_analisis_con_spec(auth_client, None, 1)
+    payload = {"resultados": [
+        {"analisis_id": 99999, "operario_id": 1, "valor_numerico": 1.0},
+        {"analisis_id": ids[0], "operario_id": 1, "valor": "10"},
+        {"analisis_id": ids[0], "operario_id": 1, "valor": "11"},
+    ]}
+    response = auth_client.post("/api/analisis/resultados/bulk", json=payload)
+    assert response.status_code == 201
+    data = response.json()
+    assert [r["valor"] for r in data["registrados"]] == ["10"]
+    assert [(e["indice"], e["analisis_id"]) for e in data["errores"]] == [(0, 99999), (2, ids[0])]
+
+
+def test_register_resultados_bulk_single_commit(auth_client, db_session, engine, sin_auditoria):
+    """N resultados: dos lecturas IN, una sentencia por tabla y un único commit."""
+    from sqlalchemy import event
+
+    ids = _crear_analisis_con_spec(auth_client, None, 5)
+    auth_client.post("/api/analisis/resultados/bulk", json={"resultados": [
+        {"analisis_id": ids[0], "operario_id": 1, "valor": "1"},
+    ]})
+    sentencias, commits = [], []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        verbo = statement.split()[0]
+        tabla = statement.split("(")[0].split()[-1] if verbo == "INSERT" else statement.split()[1]
+        sentencias.append(f"{verbo} {tabla}")
+
+    def contar_commit(conn):
+        commits.append(1)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    event.listen(engine, "commit", contar_commit)
+    try:
+        response = auth_client.post("/api/analisis/resultados/bulk", json={"resultados": [
+            {"analisis_id": i, "operario_id": 1, "valor": str(n)} for n, i in enumerate(ids)
+        ]})
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+        event.remove(engine, "commit", contar_commit)
+    assert response.status_code == 201
+    assert len(response.json()["registrados"]) == 5
+    assert len(commits) == 1
+    escrituras = [s for s in sentencias if not s.startswith("SELECT")]
+    assert sorted(s for s in escrituras if s.startswith("INSERT")) == [
+        "INSERT audit_logs", "INSERT historial_estado_analisis", "INSERT resultado"]
+    # Un UPDATE por grupo de columnas modificadas (no por fila)
+    assert escrituras.count("UPDATE resultado") == 1
+    assert escrituras.count("UPDATE analisis") <= 2
@@ -17,6 +17,55 @@ def test_bulk_analysis_creation(auth_client):
     assert data[0]["metodo_version_id"] == 1
     assert data[1]["metodo_version_id"] == 2
 
+def test_bulk_analysis_many_muestras_single_statements(auth_client, db_session, engine):
+    """Muestras × métodos en una llamada: un INSERT por tabla (análisis, historial, auditoría)."""
+    from sqlalchemy import event
+    from src.backend.models.audit import AuditLog
+    from src.backend.models.fact import Analisis, HistorialEstadoAnalisis
+
+    payload = {
+        "muestras": [{"muestra_id": 1, "recepcion_id": 1}, {"muestra_id": 2, "recepcion_id": 1},
+                     {"muestra_id": 3, "recepcion_id": 1}],
+        "metodos_versions_ids": [1, 2],
+        "operario_id": 1,
+    }
+    inserts = []
+
+    def contar(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            inserts.append(statement.split("(")[0].split()[-1])
+
+    event.listen(engine, "before_cursor_execute", contar)
+    try:
+        response = auth_client.post("/api/analisis/bulk", json=payload)
+    finally:
+        event.remove(engine, "before_cursor_execute", contar)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert [(a["muestra_id"], a["metodo_version_id"]) for a in data] == [
+        (1, 1), (1, 2), (2, 1), (2, 2), (3, 1), (3, 2)]
+    assert sorted(inserts) == ["analisis", "audit_logs", "historial_estado_analisis"]
+
+    ids = [a["analisis_id"] for a in data]
+    historial = db_session.query(HistorialEstadoAnalisis).filter(HistorialEstadoAnalisis.analisis_id.in_(ids)).all()
+    assert len(historial) == 6
+    auditados = db_session.query(AuditLog).filter(AuditLog.tabla_nombre == "analisis", AuditLog.registro_id.in_(ids))
+    assert auditados.count() == 6
+
+    db_session.query(AuditLog).filter(
+        ((AuditLog.tabla_nombre == "analisis") & AuditLog.registro_id.in_(ids))
+        | ((AuditLog.tabla_nombre == "historial_estado_analisis")
+           & AuditLog.registro_id.in_([h.historial_estado_analisis_id for h in historial]))
+    ).delete(synchronize_session=False)
+    db_session.query(HistorialEstadoAnalisis).filter(HistorialEstadoAnalisis.analisis_id.in_(ids)).delete()
+    db_session.query(Analisis).filter(Analisis.analisis_id.in_(ids)).delete()
+    db_session.commit()
+
+def test_bulk_analysis_requires_muestra(auth_client):
+    response = auth_client.post("/api/analisis/bulk", json={"metodos_versions_ids": [1], "operario_id": 1})
+    assert response.status_code == 400
+
 def test_incubation_update(auth_client):
     """Verifica que se pueda actualizar una incubación."""
     # 1. Crear una incubación primero
@@ -0,0 +1,140 @@
+"""Tests para /api/dashboard/stats (consultas agrupadas y contadores materializados)."""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.backend.api import dependencies
+from src.backend.api.routers import dashboard
+from src.backend.core.response_cache import response_cache
+from src.backend.models.dashboard import ContadorDashboard
+from src.backend.models.fact import SolicitudMuestreo
+from src.backend.repositories.dashboard import ContadorDashboardRepository
+
+
+@pytest.fixture
+def contadores(db_session, monkeypatch):
+    """Habilita los contadores del dashboard (servicios + lectura) y los limpia al final."""
+    monkeypatch.setattr(dashboard, "DASHBOARD_COUNTERS_ENABLED", True)
+    monkeypatch.setattr(dependencies, "DASHBOARD_COUNTERS_ENABLED", True)
+    yield ContadorDashboardRepository()
+    db_session.query(ContadorDashboard).delete()
+    db_session.commit()
+
+
+def test_dashboard_stats_counts_last_seven_days(auth_client, seed_data, db_session):
+    hace_dos_dias = datetime.combine(date.today() - timedelta(days=2), datetime.min.time()).replace(hour=12)
+    antes = auth_client.get("/api/dashboard/stats").json()
+    db_session.add(SolicitudMuestreo(usuario_id=1, tipo="Ambiental", estado_solicitud_id=1, fecha=hace_dos_dias))
+    db_session.add(SolicitudMuestreo(usuario_id=1, tipo="Ambiental", estado_solicitud_id=1,
+                                     fecha=hace_dos_dias - timedelta(days=10)))
+    db_session.commit()
+    response_cache.clear()  # inserción directa, sin repositorio que invalide
+
+    data = auth_client.get("/api/dashboard/stats").json()
+    assert [d["fecha"] for d in data["muestras_semana"]] == [
+        (date.today() - timedelta(days=i)).isoformat() for i in range(6, -1, -1)
+    ]
+    # Solo la solicitud dentro del rango suma al gráfico
+    assert data["muestras_semana"][4]["count"] == antes["muestras_semana"][4]["count"] + 1
+    assert sum(d["count"] for d in data["muestras_semana"]) == sum(d["count"] for d in antes["muestras_semana"]) + 1
+    assert data["muestras_hoy"] == data["muestras_semana"][-1]["count"]
+
+
+def test_dashboard_counters_match_grouped_queries(auth_client, seed_data, db_session, contadores, monkeypatch):
+    contadores.rebuild(db_session)
+    monkeypatch.setattr(dashboard, "DASHBOARD_COUNTERS_ENABLED", False)
+    esperado = auth_client.get("/api/dashboard/stats").json()
+    monkeypatch.setattr(dashboard, "DASHBOARD_COUNTERS_ENABLED", True)
+    response_cache.clear()
+    assert auth_client.get("/api/dashboard/stats").json() == esperado
+
+    # El servicio de muestreo mantiene el contador diario de solicitudes
+    usuario_id = auth_client.get("/api/auth/me").json()["usuario_id"]
+    resp = auth_client.post("/api/muestreo/solicitudes",
+                            json={"usuario_id": usuario_id, "tipo": "Ambiental", "estado_solicitud_id": 1})
+    assert resp.status_code == 201
+    data = auth_client.get("/api/dashboard/stats").json()
+    assert data["muestras_hoy"] == esperado["muestras_hoy"] + 1
+
+
+def test_dashboard_stats_etag_and_invalidation(auth_client, seed_data):
+    primera = auth_client.get("/api/dashboard/stats")
+    etag = primera.headers["ETag"]
+    assert primera.status_code == 200
+
+    no_modificado = auth_client.get("/api/dashboard/stats", headers={"If-None-Match": etag})
+    assert no_modificado.status_code == 304
+    assert no_modificado.content == b""
+
+    # Una escritura vía repositorio invalida la entrada al confirmar
+    usuario_id = auth_client.get("/api/auth/me").json()["usuario_id"]
+    resp = auth_client.post("/api/muestreo/solicitudes",
+                            json={"usuario_id": usuario_id, "tipo": "Ambiental", "estado_solicitud_id": 1})
+    assert resp.status_code == 201
+    nueva = auth_client.get("/api/dashboard/stats", headers={"If-None-Match": etag})
+    assert nueva.status_code == 200
+    assert nueva.headers["ETag"] != etag
+    assert nueva.json()["muestras_hoy"] == primera.json()["muestras_hoy"] + 1
+
+
+def test_dashboard_counters_follow_analisis_put_and_delete(auth_client, seed_data, db_session, contadores, monkeypatch):
+    from sqlalchemy import func
+    from src.backend.models.audit import AuditLog
+
+    ultimo_audit = db_session.query(func.max(AuditLog.audit_log_id)).scalar() or 0
+    contadores.rebuild(db_session)
+
+    def _por_estado(counters: bool):
+        monkeypatch.setattr(dashboard, "DASHBOARD_COUNTERS_ENABLED", counters)
+        response_cache.clear()
+        return auth_client.get("/api/dashboard/stats").json()["analisis_por_estado"]
+
+    resp = auth_client.post("/api/analisis/", json={"muestra_id": 9001, "recepcion_id": 1, "metodo_version_id": 1,
+                                                    "estado_analisis_id": 1, "operario_id": 1})
+    assert resp.status_code == 201
+    analisis_id = resp.json()["analisis_id"]
+
+    # PUT con cambio de estado: el contador sigue a la tabla
+    assert auth_client.put(f"/api/analisis/{analisis_id}", json={"estado_analisis_id": 2}).status_code == 200
+    assert _por_estado(True) == _por_estado(False)
+
+    assert auth_client.delete(f"/api/analisis/{analisis_id}").status_code == 204
+    assert _por_estado(True) == _por_estado(False)
+
+    db_session.query(AuditLog).filter(AuditLog.audit_log_id > ultimo_audit).delete()
+    db_session.commit()
+
+
+def test_dashboard_counters_follow_solicitud_fecha_and_delete(auth_client, seed_data, db_session, contadores, monkeypatch):
+    from sqlalchemy import func
+    from src.backend.models.audit import AuditLog
+    from src.backend.models.fact import HistoricoSolicitudMuestreo
+
+    ultimo_audit = db_session.query(func.max(AuditLog.audit_log_id)).scalar() or 0
+    contadores.rebuild(db_session)
+
+    def _semana(counters: bool):
+        monkeypatch.setattr(dashboard, "DASHBOARD_COUNTERS_ENABLED", counters)
+        response_cache.clear()
+        return auth_client.get("/api/dashboard/stats").json()["muestras_semana"]
+
+    usuario_id = auth_client.get("/api/auth/me").json()["usuario_id"]
+    resp = auth_client.post("/api/muestreo/solicitudes",
+                            json={"usuario_id": usuario_id, "tipo": "Ambiental", "estado_solicitud_id": 1})
+    assert resp.status_code == 201
+    solicitud_id = resp.json()["solicitud_muestreo_id"]
+    assert _semana(True) == _semana(False)
+
+    # Cambio de fecha: el contador pasa del día anterior al nuevo
+    hace_dos_dias = datetime.combine(date.today() - timedelta(days=2), datetime.min.time()).replace(hour=12)
+    dependencies.get_sample_service().update_sampling_request(db_session, solicitud_id, {"fecha": hace_dos_dias})
+    assert _semana(True) == _semana(False)
+
+    assert auth_client.delete(f"/api/muestreo/solicitudes/{solicitud_id}").status_code == 204
+    assert _semana(True) == _semana(False)
+    assert auth_client.delete(f"/api/muestreo/solicitudes/{solicitud_id}").status_code == 404
+
+    db_session.query(HistoricoSolicitudMuestreo).filter(
+        HistoricoSolicitudMuestreo.solicitud_muestreo_id == solicitud_id).delete()
+    db_session.query(AuditLog).filter(AuditLog.audit_log_id > ultimo_audit).delete()
+    db_session.commit()
@@ -0,0 +1,138 @@
+"""Tests del motor de carga CSV por lotes (data_loaders.bulk_loader)."""
+import pytest
+
+from src.backend.data_loaders.bulk_loader import bulk_csv_loader
+from src.backend.data_loaders.generic_loader import generic_csv_loader
+from src.backend.data_loaders.pipeline_runner import build_dependencies, dependency_levels, run_pipeline_dag
+from src.backend.models.audit import AuditLog
+from src.backend.models.auth import Operario
+from src.backend.models.dim import Planta
+from src.backend.models.master import Producto
+from src.backend.repositories.auth import OperarioRepository
+from src.backend.repositories.dim import PlantaRepository, SistemaRepository
+from src.backend.repositories.master import ProductoRepository
+
+PLANTAS_CONFIG = {
+    "repo": PlantaRepository,
+    "delimiter": ";",
+    "defaults": {"sistema_id": 1},
+    "mappings": {"planta_id": "codigo", "Nombre Planta": "nombre"},
+    "fks": {
+        "sis_nitrogeno_id": {"table": "sistema", "repo": SistemaRepository, "target_field": "sistema_id"}
+    },
+}
+
+
+def _write_csv(tmp_path, name, lines):
+    path = tmp_path / name
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_bulk_loader_maps_resolves_fks_and_upserts(db_session, seed_data, tmp_path):
+    path = _write_csv(tmp_path, "plantas.csv", [
+        "\ufeffplanta_id;nombre_planta;sis_nitrogeno_id",
+        "BLK-P1;Planta Uno;SIS-001",
+        "BLK-P2;Planta Dos;",
+        "BLK-P1;Planta Uno (corregida);SIS-001",
+    ])
+    loader = bulk_csv_loader(PLANTAS_CONFIG, chunk_size=2)
+    assert loader(path, db_session) == 3
+
+    plantas = {p.codigo: p for p in db_session.query(Planta).filter(Planta.codigo.like("BLK-%"))}
+    assert set(plantas) == {"BLK-P1", "BLK-P2"}
+    assert plantas["BLK-P1"].nombre == "Planta Uno (corregida)"
+    # FK vacío → se aplica el default
+    assert plantas["BLK-P2"].sistema_id == 1
+
+    # Una segunda carga actualiza en lugar de duplicar
+    path = _write_csv(tmp_path, "plantas2.csv", [
+        "planta_id;nombre_planta;sis_nitrogeno_id",
+        "BLK-P2;Planta Dos v2;SIS-001",
+    ])
+    loader(path, db_session)
+    db_session.expire_all()
+    assert db_session.query(Planta).filter(Planta.codigo == "BLK-P2").one().nombre == "Planta Dos v2"
+
+    ids = [p.planta_id for p in plantas.values()]
+    db_session.query(AuditLog).filter(AuditLog.tabla_nombre == "planta", AuditLog.registro_id.in_(ids)).delete()
+    db_session.query(Planta).filter(Planta.planta_id.in_(ids)).delete()
+    db_session.commit()
+
+
+def test_bulk_loader_matches_row_loader(db_session, tmp_path):
+    config = {
+        "repo": OperarioRepository,
+        "delimiter": ";",
+        "unique_field": "codigo_empleado",
+        "mappings": {"operarioID": "codigo_empleado", "nombreOperario": "nombre"},
+    }
+    filas = ["Ana Perez", "Bruno", "Carla de la Fuente"]
+
+    def cargar(loader, prefijo):
+        path = _write_csv(tmp_path, f"{prefijo}.csv", ["operarioID;nombreOperario"] +
+                          [f"{prefijo}{i};{nombre}" for i, nombre in enumerate(filas)])
+        loader(path, db_session)
+        db_session.commit()
+        return db_session.query(Operario).filter(Operario.codigo_empleado.like(f"{prefijo}%")) \
+            .order_by(Operario.codigo_empleado).all()
+
+    por_fila = cargar(generic_csv_loader(config), "ROW")
+    por_lote = cargar(bulk_csv_loader(config), "BLK")
+    assert [(o.nombre, o.apellido) for o in por_lote] == [(o.nombre, o.apellido) for o in por_fila]
+    assert [(o.nombre, o.apellido) for o in por_lote][1] == ("Bruno", ".")
+
+    ids = [o.operario_id for o in por_fila + por_lote]
+    db_session.query(AuditLog).filter(AuditLog.tabla_nombre == "operario", AuditLog.registro_id.in_(ids)).delete()
+    db_session.query(Operario).filter(Operario.operario_id.in_(ids)).delete()
+    db_session.commit()
+
+
+PRODUCTOS_CONFIG = {
+    "repo": ProductoRepository,
+    "delimiter": ";",
+    "fks": {"planta_id": {"table": "planta", "repo": PlantaRepository, "target_field": "planta_id"}},
+}
+
+
+def _dag_jobs(tmp_path, planta_producto):
+    plantas = _write_csv(tmp_path, "dag_plantas.csv", ["planta_id;nombre_planta", "DAG-P1;Planta DAG"])
+    productos = _write_csv(tmp_path, "dag_productos.csv", ["codigo;nombre;planta_id",
+                                                            f"DAG-PR1;Producto DAG;{planta_producto}"])
+    # Orden inverso al de dependencia: el runner debe cargar plantas primero
+    return [("productos", PRODUCTOS_CONFIG, productos), ("plantas", PLANTAS_CONFIG, plantas)]
+
+
+def test_pipeline_dependency_levels(tmp_path):
+    jobs = _dag_jobs(tmp_path, "DAG-P1")
+    deps = build_dependencies(jobs)
+    assert deps == {"productos": {"plantas"}, "plantas": set()}
+    assert dependency_levels(deps) == [["plantas"], ["productos"]]
+    with pytest.raises(ValueError):
+        dependency_levels({"a": {"b"}, "b": {"a"}})
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_pipeline_dag_loads_in_order(db_session, seed_data, tmp_path, workers):
+    timings = run_pipeline_dag(_dag_jobs(tmp_path, "DAG-P1"), db=db_session, workers=workers)
+    assert timings["plantas"]["nivel"] == 0 and timings["productos"]["nivel"] == 1
+    assert timings["productos"]["filas"] == 1
+
+    planta = db_session.query(Planta).filter(Planta.codigo == "DAG-P1").one()
+    producto = db_session.query(Producto).filter(Producto.codigo == "DAG-PR1").one()
+    assert producto.planta_id == planta.planta_id
+
+    db_session.query(AuditLog).filter(
+        ((AuditLog.tabla_nombre == "planta") & (AuditLog.registro_id == planta.planta_id))
+        | ((AuditLog.tabla_nombre == "producto") & (AuditLog.registro_id == producto.producto_id))
+    ).delete()
+    db_session.delete(producto)
+    db_session.delete(planta)
+    db_session.commit()
+
+
+def test_run_pipeline_dag_rolls_back_everything_on_error(db_session, seed_data, tmp_path):
+    with pytest.raises(ValueError, match="NO-EXISTE"):
+        run_pipeline_dag(_dag_jobs(tmp_path, "NO-EXISTE"), db=db_session, workers=1)
+    # plantas ya se había escrito en el nivel 0: el rollback es global
+    assert db_session.query(Planta).filter(Planta.codigo == "DAG-P1").count() == 0
@@ -0,0 +1,41 @@
+"""Tests de los perfiles de motor de DataBaseManager."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.backend.database.db_manager import DataBaseManager, SQLITE_BUSY_TIMEOUT_MS
+
+
+def _pragma(session_factory, name):
+    db = session_factory()
+    try:
+        return db.execute(text(f"PRAGMA {name}")).scalar()
+    finally:
+        db.close()
+
+
+def test_production_profile_sets_pragmas_and_read_only_pool(tmp_path):
+    manager = DataBaseManager(f"sqlite:///{tmp_path / 'prod.db'}", profile="production")
+    try:
+        manager.init_db()
+        assert _pragma(manager.SessionLocal, "journal_mode") == "wal"
+        assert _pragma(manager.SessionLocal, "synchronous") == 1  # NORMAL
+        assert _pragma(manager.SessionLocal, "busy_timeout") == SQLITE_BUSY_TIMEOUT_MS
+        assert _pragma(manager.SessionLocal, "temp_store") == 2  # MEMORY
+        assert manager.read_engine is not manager.engine
+
+        db = next(manager.get_read_session())
+        with pytest.raises(OperationalError, match="readonly"):
+            db.execute(text("INSERT INTO sistema (codigo, nombre, activo) VALUES ('RO', 'RO', 1)"))
+        db.close()
+    finally:
+        manager.dispose()
+
+
+def test_dev_profile_keeps_single_engine(tmp_path):
+    manager = DataBaseManager(f"sqlite:///{tmp_path / 'dev.db'}", profile="dev")
+    try:
+        assert manager.read_engine is manager.engine
+        assert _pragma(manager.SessionLocal, "journal_mode") == "delete"
+    finally:
+        manager.dispose()
@@ -0,0 +1,63 @@
+"""Tests para el perfilado por request y /api/_debug/profile."""
+import logging
+
+from fastapi.testclient import TestClient
+
+from src.backend.core.profiling import ProfileHistory, ProfilingMiddleware, RequestProfile, profile_history
+
+
+def _server_timing(response) -> dict:
+    """{métrica: {'dur': float, 'desc': str}} del header Server-Timing."""
+    metricas = {}
+    for parte in response.headers["server-timing"].split(","):
+        nombre, *params = [p.strip() for p in parte.split(";")]
+        valores = dict(p.split("=", 1) for p in params)
+        metricas[nombre] = {"dur": float(valores["dur"]), "desc": valores.get("desc", "").strip('"')}
+    return metricas
+
+
+def test_server_timing_and_profile_history(auth_client):
+    profile_history.clear()
+    response = auth_client.get("/api/equipos/", params={"limit": 5})
+    assert response.status_code == 200
+
+    timing = _server_timing(response)
+    assert timing["db"]["desc"].endswith("queries") and int(timing["db"]["desc"].split()[0]) >= 1
+    assert timing["app"]["dur"] >= timing["db"]["dur"]
+
+    data = auth_client.get("/api/_debug/profile").json()
+    assert data["enabled"] is True
+    ultima = data["requests"][0]
+    # Se agrupa por la ruta con parámetros y no se registra la propia consulta al perfil
+    assert (ultima["method"], ultima["path"], ultima["status_code"]) == ("GET", "/api/equipos/", 200)
+    assert ultima["queries"] == int(timing["db"]["desc"].split()[0])
+    assert ultima["slowest"] and all(s["sql"] for s in ultima["slowest"])
+    assert [r["path"] for r in data["routes"]] == ["/api/equipos/"]
+
+
+def test_profile_reports_repeated_statements():
+    profile = RequestProfile("GET", "/x")
+    for ms in (1.0, 3.0, 2.0):
+        profile.record("SELECT * FROM analisis WHERE analisis_id = ?", ms)
+    profile.record("SELECT * FROM muestra", 10.0)
+
+    assert profile.queries == 4 and profile.db_ms == 16.0
+    assert profile.repeated() == [{"sql": "SELECT * FROM analisis WHERE analisis_id = ?",
+                                   "count": 3, "total_ms": 6.0, "max_ms": 3.0}]
+    assert [s["sql"] for s in profile.slowest()] == ["SELECT * FROM muestra",
+                                                     "SELECT * FROM analisis WHERE analisis_id = ?"]
+
+
+def test_slow_request_is_logged(auth_client, caplog):
+    from src.backend.api.app import app
+
+    history = ProfileHistory()
+    with TestClient(ProfilingMiddleware(app, slow_ms=0, history=history)) as client:
+        with caplog.at_level(logging.WARNING, logger="src.backend.core.profiling"):
+            assert client.get("/api/equipos/1").status_code in (200, 404)
+    assert any("Slow request GET /api/equipos/{equipo_id}" in r.message for r in caplog.records)
+    assert history.recent()[0]["path"] == "/api/equipos/{equipo_id}"
+
+
+def test_debug_profile_requires_admin(supervisor_client):
+    assert supervisor_client.get("/api/_debug/profile").status_code == 403
@@ -0,0 +1,156 @@
+import hashlib
+import os
+
+import pytest
+from fastapi import status
+
+from src.backend.api.app import app
+from src.backend.core import uploads
+from src.backend.models.documents import Documento
+from src.backend.storage import base as storage_base
+from src.backend.storage import collect_garbage, content_key, get_document_storage
+from src.backend.storage.local import LocalDocumentStorage
+
+
+@pytest.fixture
+def storage(auth_client, tmp_path):
+    # auth_client limpia dependency_overrides al terminar
+    storage = LocalDocumentStorage(str(tmp_path))
+    app.dependency_overrides[get_document_storage] = lambda: storage
+    return storage
+
+
+def _upload(client, content: bytes, nombre: str = "certificado.pdf", entidad_id: int = 1):
+    return client.post(
+        "/api/documentos/upload",
+        files={"file": (nombre, content, "application/pdf")},
+        data={"entidad_tipo": "equipo", "entidad_id": str(entidad_id)},
+    )
+
+
+def _blobs(storage):
+    return list(storage.keys())
+
+
+def test_upload_streams_size_and_sha256_and_download_supports_range(auth_client, db_session, storage, monkeypatch):
+    monkeypatch.setattr(uploads, "UPLOAD_CHUNK_SIZE", 1000)
+    content = os.urandom(5000)
+    response = _upload(auth_client, content)
+    assert response.status_code == status.HTTP_201_CREATED
+    body = response.json()
+    assert body["tamano_bytes"] == 5000
+    assert body["sha256"] == hashlib.sha256(content).hexdigest()
+
+    response = auth_client.get(f"/api/documentos/descargar/{body['documento_id']}",
+                               headers={"Range": "bytes=1000-1999"})
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert response.headers["content-range"] == "bytes 1000-1999/5000"
+    assert response.content == content[1000:2000]
+
+    db_session.query(Documento).filter(Documento.documento_id == body["documento_id"]).delete()
+    db_session.commit()
+
+
+def test_upload_over_limit_is_rejected_without_leftovers(auth_client, db_session, storage, monkeypatch):
+    monkeypatch.setattr(uploads, "UPLOAD_MAX_BYTES", 1024)
+    antes = db_session.query(Documento).count()
+
+    # Content-Length mayor al límite + margen: 413 antes de leer el multipart
+    response = _upload(auth_client, b"x" * (uploads._MULTIPART_OVERHEAD + 4096))
+    assert response.status_code == 413
+
+    # Dentro del margen del middleware: se corta mientras se copia
+    response = _upload(auth_client, b"x" * 4096)
+    assert response.status_code == 413
+    assert "máximo" in response.json()["message"]
+
+    assert [f for _, _, files in os.walk(storage.root) for f in files] == []
+    assert db_session.query(Documento).count() == antes
+
+
+def test_same_content_is_stored_once_and_collected_after_last_delete(auth_client, db_session, storage, monkeypatch):
+    monkeypatch.setattr(storage_base, "DOCUMENT_GC_GRACE_S", 0)
+    content = b"%PDF certificado de calibracion"
+    sha256 = hashlib.sha256(content).hexdigest()
+
+    ids = [_upload(auth_client, content, f"cert-{i}.pdf", entidad_id=i).json()["documento_id"] for i in (1, 2)]
+    assert _blobs(storage) == [content_key(sha256)]
+    assert storage.path(content_key(sha256)).startswith(os.path.join(storage.root, "sha256", sha256[:2], sha256[2:4]))
+
+    # Queda una referencia: el blob se conserva y sigue descargable
+    assert auth_client.delete(f"/api/documentos/{ids[0]}").status_code == status.HTTP_204_NO_CONTENT
+    assert _blobs(storage) == [content_key(sha256)]
+    assert auth_client.get(f"/api/documentos/descargar/{ids[1]}").content == content
+
+    assert auth_client.delete(f"/api/documentos/{ids[1]}").status_code == status.HTTP_204_NO_CONTENT
+    assert _blobs(storage) == []
+
+
+def test_collect_garbage_respects_grace_period(auth_client, db_session, storage, monkeypatch):
+    content = b"adjunto huerfano"
+    doc_id = _upload(auth_client, content).json()["documento_id"]
+    # Borrado directo en BD: el blob queda sin referencias
+    db_session.query(Documento).filter(Documento.documento_id == doc_id).delete()
+    db_session.commit()
+
+    assert collect_garbage(db_session, storage, grace_s=3600) == 0
+    assert collect_garbage(db_session, storage, grace_s=0) == 1
+    assert _blobs(storage) == []
+
+
+S3_ENDPOINT = os.getenv("LIMS_TEST_S3_ENDPOINT")
+
+
+@pytest.mark.skipif(not S3_ENDPOINT, reason="LIMS_TEST_S3_ENDPOINT no configurada (p. ej. MinIO local)")
+def test_s3_storage_dedupes_and_serves_ranges(auth_client, db_session, monkeypatch):
+    import uuid
+
+    import boto3
+
+    from src.backend.storage.s3 import S3DocumentStorage
+
+    client = boto3.client("s3", endpoint_url=S3_ENDPOINT)
+    bucket = f"lims-test-{uuid.uuid4().hex[:8]}"
+    client.create_bucket(Bucket=bucket)
+    storage = S3DocumentStorage(bucket=bucket, client=client)
+    app.dependency_overrides[get_document_storage] = lambda: storage
+    monkeypatch.setattr(storage_base, "DOCUMENT_GC_GRACE_S", 0)
+    try:
+        content = os.urandom(3000)
+        ids = [_upload(auth_client, content, entidad_id=i).json()["documento_id"] for i in (1, 2)]
+        assert len(_blobs(storage)) == 1
+
+        response = auth_client.get(f"/api/documentos/descargar/{ids[0]}", headers={"Range": "bytes=0-99"})
+        assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert response.content == content[:100]
+
+        fuera_de_rango = auth_client.get(f"/api/documentos/descargar/{ids[0]}", headers={"Range": "bytes=5000-"})
+        assert fuera_de_rango.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        assert fuera_de_rango.headers["Content-Range"] == "bytes */3000"
+
+        for doc_id in ids:
+            auth_client.delete(f"/api/documentos/{doc_id}")
+        assert _blobs(storage) == []
+    finally:
+        for key in list(storage.keys()):
+            storage.delete(key)
+        client.delete_bucket(Bucket=bucket)
+
+
+def test_s3_unsatisfiable_range_is_416():
+    botocore_exceptions = pytest.importorskip("botocore.exceptions")
+
+    from src.backend.storage.s3 import S3DocumentStorage
+
+    class _Client:
+        def get_object(self, **params):
+            raise botocore_exceptions.ClientError(
+                {"Error": {"Code": "InvalidRange", "Message": "The requested range is not satisfiable"}}, "GetObject")
+
+        def head_object(self, **params):
+            return {"ContentLength": 3000}
+
+    response = S3DocumentStorage(bucket="lims-test", client=_Client()).response(
+        "ab/cd/abcd", "cert.pdf", "application/pdf", "bytes=5000-")
+    assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response.headers["Content-Range"] == "bytes */3000"
@@ -0,0 +1,243 @@
+"""Tests para los endpoints de Equipos – /api/equipos/*"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func
+
+from src.backend.api.dependencies import get_equipment_service
+from src.backend.models.audit import AuditLog
+from src.backend.models.dim import (CalibracionCalificacionEquipo, CumplimientoEquipo, EquipoInstrumento,
+                                    EstadoEquipo, HistoricoEstadoEquipo, ZonaEquipo)
+
+
+@pytest.fixture
+def equipos(db_session):
+    """Tres equipos: calibración vigente (con zonas), vencida y sin calibraciones."""
+    hoy = date.today()
+    if db_session.get(EstadoEquipo, 1) is None:
+        db_session.add(EstadoEquipo(estado_equipo_id=1, nombre="Operativo"))
+    creados = [
+        EquipoInstrumento(codigo=f"EQ-PRJ-{n}", nombre=f"Equipo {n}", tipo_equipo_id=1,
+                          estado_equipo_id=1, area_id=1)
+        for n in range(3)
+    ]
+    db_session.add_all(creados)
+    db_session.flush()
+    vigente, vencido, _ = creados
+    db_session.add_all([
+        ZonaEquipo(equipo_instrumento_id=vigente.equipo_instrumento_id, nombre="Cámara"),
+        ZonaEquipo(equipo_instrumento_id=vigente.equipo_instrumento_id, nombre="Puerta", activo=False),
+    ])
+    db_session.commit()
+    ultimo_audit = db_session.query(func.max(AuditLog.audit_log_id)).scalar() or 0
+    service = get_equipment_service()
+    for equipo, dias_fecha, dias_vence in ((vigente, 30, -335), (vigente, 400, 35), (vencido, 400, 35)):
+        # La calibración más antigua del equipo vigente se registra después: no debe pisar el índice
+        service.register_calibracion(db_session, {
+            "tipo": "CAL", "equipo_instrumento_id": equipo.equipo_instrumento_id, "operario_id": 1,
+            "fecha": hoy - timedelta(days=dias_fecha), "vence": hoy - timedelta(days=dias_vence),
+        })
+    ids = [e.equipo_instrumento_id for e in creados]
+    yield ids
+    db_session.query(AuditLog).filter(AuditLog.audit_log_id > ultimo_audit).delete()
+    db_session.query(CumplimientoEquipo).filter(CumplimientoEquipo.equipo_instrumento_id.in_(ids)).delete()
+    db_session.query(ZonaEquipo).filter(ZonaEquipo.equipo_instrumento_id.in_(ids)).delete()
+    db_session.query(HistoricoEstadoEquipo).filter(HistoricoEstadoEquipo.equipo_instrumento_id.in_(ids)).delete()
+    db_session.query(CalibracionCalificacionEquipo).filter(
+        CalibracionCalificacionEquipo.equipo_instrumento_id.in_(ids)).delete()
+    db_session.query(EquipoInstrumento).filter(EquipoInstrumento.equipo_instrumento_id.in_(ids)).delete()
+    db_session.commit()
+
+
+def _equipos_orm(db_session):
+    """Ruta de referencia: instancias ORM con todas las relaciones cargadas."""
+    from sqlalchemy.orm import joinedload
+    return db_session.query(EquipoInstrumento).options(
+        joinedload(EquipoInstrumento.tipo_equipo),
+        joinedload(EquipoInstrumento.estado),
+        joinedload(EquipoInstrumento.area),
+        joinedload(EquipoInstrumento.calibraciones),
+        joinedload(EquipoInstrumento.zonas),
+    ).all()
+
+
+def test_list_equipos_projection_matches_orm(auth_client, db_session, equipos):
+    """GET /api/equipos/ (proyección) == EquipoDetalleResponse.from_orm_extended sobre el ORM."""
+    from src.backend.api.schemas.dim import EquipoDetalleResponse
+
+    data = auth_client.get("/api/equipos/", params={"limit": 1000}).json()
+    db_session.expire_all()
+    orm = _equipos_orm(db_session)
+    esperado = [EquipoDetalleResponse.from_orm_extended(e).model_dump(mode="json") for e in orm]
+    assert sorted(data, key=lambda e: e["equipo_instrumento_id"]) == \
+        sorted(esperado, key=lambda e: e["equipo_instrumento_id"])
+
+    por_id = {e["equipo_instrumento_id"]: e for e in data}
+    assert [por_id[i]["is_compliant"] for i in equipos] == [True, False, True]
+    assert [len(por_id[i]["zonas"]) for i in equipos] == [2, 0, 0]
+
+
+
+def test_projection_rows_validate_against_response_models(auth_client, db_session, equipos):
+    """ProjectionResponse salta la validación de response_model: cada fila debe cumplir el schema."""
+    from src.backend.api.schemas.dim import AreaResponse, EquipoDetalleResponse, VencimientoEquipoResponse
+    from src.backend.models.dim import Area, ZonaArea
+
+    def _validar(schema, filas):
+        assert filas
+        for fila in filas:
+            assert schema.model_validate(fila).model_dump(mode="json") == fila
+
+    _validar(EquipoDetalleResponse, auth_client.get("/api/equipos/", params={"limit": 1000}).json())
+    _validar(EquipoDetalleResponse, auth_client.get("/api/equipos/", params={"limit": 2, "cursor": ""}).json()["items"])
+    _validar(EquipoDetalleResponse, [auth_client.get(f"/api/equipos/{equipo_id}").json() for equipo_id in equipos])
+    _validar(VencimientoEquipoResponse,
+             auth_client.get("/api/equipos/vencimientos", params={"dias": 60, "vencidos": True}).json())
+
+    area = Area(codigo="VAL-1", nombre="Área validación", planta_id=1)
+    db_session.add(area)
+    db_session.flush()
+    db_session.add(ZonaArea(area_id=area.area_id, nombre="Pared"))
+    db_session.commit()
+    try:
+        _validar(AreaResponse, auth_client.get("/api/ubicaciones/areas").json())
+        _validar(AreaResponse, auth_client.get("/api/ubicaciones/areas", params={"limit": 2, "cursor": ""}).json()["items"])
+    finally:
+        db_session.query(ZonaArea).filter(ZonaArea.area_id == area.area_id).delete()
+        db_session.query(Area).filter(Area.area_id == area.area_id).delete()
+        db_session.commit()
+
+def test_list_equipos_projection_cursor_and_filters(auth_client, equipos):
+    ids, cursor = [], ""
+    while cursor is not None:
+        body = auth_client.get("/api/equipos/", params={"limit": 2, "cursor": cursor, "area_id": 1}).json()
+        ids.extend(e["equipo_instrumento_id"] for e in body["items"])
+        cursor = body["next_cursor"]
+    assert set(equipos) <= set(ids)
+    assert ids == sorted(ids)
+    assert auth_client.get("/api/equipos/", params={"area_id": 999999}).json() == []
+
+
+def test_compliance_index_and_filter(auth_client, db_session, equipos):
+    """El índice guarda la última calibración por fecha y responde ?compliance=."""
+    vigente, vencido, sin_calibrar = equipos
+    indice = {c.equipo_instrumento_id: c for c in
+              db_session.query(CumplimientoEquipo).filter(CumplimientoEquipo.equipo_instrumento_id.in_(equipos))}
+    assert set(indice) == {vigente, vencido}
+    assert indice[vigente].vence > date.today() > indice[vencido].vence
+
+    cumplen = {e["equipo_instrumento_id"] for e in auth_client.get("/api/equipos/", params={"compliance": True, "limit": 1000}).json()}
+    no_cumplen = {e["equipo_instrumento_id"] for e in auth_client.get("/api/equipos/", params={"compliance": False, "limit": 1000}).json()}
+    assert {vigente, sin_calibrar} <= cumplen and vencido not in cumplen
+    assert vencido in no_cumplen and not {vigente, sin_calibrar} & no_cumplen
+
+    detalle = auth_client.get(f"/api/equipos/{vencido}").json()
+    assert detalle["is_compliant"] is False and detalle["codigo"] == "EQ-PRJ-1"
+    assert auth_client.get("/api/equipos/99999").status_code == 404
+
+    # rebuild reproduce el índice mantenido por las escrituras
+    from src.backend.repositories.dim import CumplimientoEquipoRepository
+    antes = {(c.equipo_instrumento_id, c.calibracion_calificacion_equipo_id) for c in db_session.query(CumplimientoEquipo)}
+    CumplimientoEquipoRepository().rebuild(db_session)
+    assert {(c.equipo_instrumento_id, c.calibracion_calificacion_equipo_id) for c in db_session.query(CumplimientoEquipo)} == antes
+
+
+def test_list_calibraciones_filtered_in_db(auth_client, equipos):
+    vigente, vencido, sin_calibrar = equipos
+    assert len(auth_client.get(f"/api/equipos/{vigente}/calibraciones").json()) == 2
+    assert [c["equipo_instrumento_id"] for c in auth_client.get(f"/api/equipos/{vencido}/calibraciones").json()] == [vencido]
+    assert auth_client.get(f"/api/equipos/{sin_calibrar}/calibraciones").json() == []
+
+    response = auth_client.post("/api/equipos/calibraciones", json={
+        "tipo": "Calibración", "equipo_instrumento_id": vencido, "operario_id": 1,
+        "fecha": date.today().isoformat(), "vence": (date.today() + timedelta(days=365)).isoformat(),
+    })
+    assert response.status_code == 201
+    assert auth_client.get(f"/api/equipos/{vencido}").json()["is_compliant"] is True
+
+
+def test_vencimientos_served_from_memory(auth_client, equipos):
+    """?dias=N responde desde la lista ordenada: una sola carga para varias consultas."""
+    from src.backend.services.calibration_scheduler import calibration_scheduler
+
+    vigente, vencido, sin_calibrar = equipos
+    cargas = calibration_scheduler.loads
+    proximos = auth_client.get("/api/equipos/vencimientos", params={"dias": 400}).json()
+    por_id = {v["equipo_instrumento_id"]: v for v in proximos}
+    assert vigente in por_id and not {vencido, sin_calibrar} & set(por_id)
+    assert por_id[vigente]["dias_restantes"] == 335 and por_id[vigente]["codigo"] == "EQ-PRJ-0"
+    assert [v["vence"] for v in proximos] == sorted(v["vence"] for v in proximos)
+
+    assert vigente not in {v["equipo_instrumento_id"] for v in
+                           auth_client.get("/api/equipos/vencimientos", params={"dias": 30}).json()}
+    con_vencidos = auth_client.get("/api/equipos/vencimientos", params={"dias": 400, "vencidos": True}).json()
+    assert {v["equipo_instrumento_id"]: v["dias_restantes"] for v in con_vencidos}[vencido] == -35
+    assert calibration_scheduler.loads == cargas + 1
+    assert auth_client.get("/api/equipos/vencimientos", params={"dias": -1}).status_code == 400
+
+
+def test_vencimientos_expire_after_ttl(db_session, equipos):
+    """Sin invalidación en este proceso (escritura en otro worker) la lista se recarga al vencer el TTL."""
+    import time
+    from src.backend.services.calibration_scheduler import CalibrationScheduler
+
+    scheduler = CalibrationScheduler(ttl_seconds=0.05)
+    scheduler.upcoming(db_session, 400)
+    scheduler.upcoming(db_session, 400)
+    assert scheduler.loads == 1
+    time.sleep(0.06)
+    scheduler.upcoming(db_session, 400)
+    assert scheduler.loads == 2
+
+    sin_cache = CalibrationScheduler(ttl_seconds=0)
+    sin_cache.upcoming(db_session, 400)
+    sin_cache.upcoming(db_session, 400)
+    assert sin_cache.loads == 2
+
+
+def test_scheduler_marks_expired_equipment(engine, db_session, equipos):
+    """El hilo pasa el equipo vencido al estado de vencido, una sola vez, y calcula la próxima espera."""
+    import time
+    from sqlalchemy.orm import sessionmaker
+    from src.backend.services.calibration_scheduler import CalibrationScheduler
+
+    vigente, vencido, _ = equipos
+    scheduler = CalibrationScheduler(session_factory=sessionmaker(bind=engine),
+                                     expired_state="Fuera de calibración (test)")
+    scheduler.start()
+    try:
+        limite = time.monotonic() + 5
+        while scheduler.fired == 0 and time.monotonic() < limite:
+            time.sleep(0.02)
+    finally:
+        scheduler.stop()
+
+    estado = db_session.query(EstadoEquipo).filter_by(nombre="Fuera de calibración (test)").one()
+    db_session.expire_all()
+    assert db_session.get(EquipoInstrumento, vencido).estado_equipo_id == estado.estado_equipo_id
+    assert db_session.get(EquipoInstrumento, vigente).estado_equipo_id == 1
+    historial = db_session.query(HistoricoEstadoEquipo).filter_by(equipo_instrumento_id=vencido).all()
+    assert [h.estado_equipo_id for h in historial] == [estado.estado_equipo_id]
+
+    assert vencido not in scheduler.due(db_session)
+    assert vencido not in scheduler.run_due(db_session)
+    proximo = scheduler.next_run(db_session)
+    assert proximo is not None and proximo.date() <= date.today() + timedelta(days=336)
+
+    db_session.query(HistoricoEstadoEquipo).filter_by(equipo_instrumento_id=vencido).delete()
+    db_session.query(EquipoInstrumento).filter_by(equipo_instrumento_id=vencido).update({"estado_equipo_id": 1})
+    db_session.query(EstadoEquipo).filter_by(estado_equipo_id=estado.estado_equipo_id).delete()
+    db_session.commit()
+
+
+def test_delete_calibrated_equipo_leaves_no_dangling_compliance_row(db_session, equipos):
+    """Borrar un equipo calibrado arrastra su fila del índice de cumplimiento."""
+    from sqlalchemy import text
+    from src.backend.repositories.dim import EquipoInstrumentoRepository
+
+    vigente = equipos[0]
+    assert EquipoInstrumentoRepository().delete(db_session, vigente)
+    assert db_session.get(CumplimientoEquipo, vigente) is None
+    assert db_session.query(CalibracionCalificacionEquipo).filter_by(equipo_instrumento_id=vigente).count() == 0
+    # Con PRAGMA foreign_keys=ON (o en PostgreSQL) estas filas harían fallar el DELETE
+    assert db_session.execute(text("PRAGMA foreign_key_check(cumplimiento_equipo)")).all() == []
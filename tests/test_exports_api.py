@@ -0,0 +1,34 @@
+import pytest
+from fastapi import status
+
+
+def test_export_plantas_csv(auth_client, seed_data):
+    response = auth_client.get("/api/exports/plantas.csv")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.splitlines()
+    assert lines[0] == "ID;Codigo;Nombre;Sistema ID;Activo"
+    assert "1;PLT-001;Planta Central;1;Sí" in lines
+
+
+def test_export_audit_csv_streams_all_rows(auth_client, seed_data):
+    auth_client.post("/api/ubicaciones/sistemas", json={"codigo": "SIS-EXP", "nombre": "Export"})
+    response = auth_client.get("/api/exports/audit.csv")
+    assert response.status_code == status.HTTP_200_OK
+    lines = response.text.splitlines()
+    assert lines[0].startswith("ID Log;Tabla;Registro ID")
+    assert any(";sistema;" in line for line in lines[1:])
+
+
+def test_generate_csv_emits_bounded_chunks():
+    from src.backend.api.routers.exports import _generate_csv
+
+    rows = ({"ID": i, "Nombre": "x" * 50} for i in range(1000))
+    chunks = list(_generate_csv(rows, ["ID", "Nombre"], chunk_size=4096))
+
+    assert len(chunks) > 1
+    # Cada chunk supera el umbral como mucho por una fila
+    assert all(len(chunk) < 4096 + 100 for chunk in chunks)
+    lines = "".join(chunks).splitlines()
+    assert lines[0] == "ID;Nombre"
+    assert len(lines) == 1001
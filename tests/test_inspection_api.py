@@ -290,3 +290,213 @@ def test_create_personnel_swab_tyvek_success(inspector_client: TestClient):
     response = inspector_client.post("/api/inspection/samplings/", json=payload)
     assert response.status_code == 201
     assert response.json()["tyvek_wash_number"] == 4
+
+
+@pytest.fixture
+def muestreos_listado(db_session: Session):
+    """Cinco muestreos de dos inspectores y dos lotes, un día de diferencia entre cada uno."""
+    from src.backend.models.inspection import Sampling
+    import uuid
+
+    base = datetime(2031, 3, 1, 8, 0)
+    lotes = [str(uuid.uuid4()), str(uuid.uuid4())]
+    creados = [
+        Sampling(batch_id=lotes[i % 2], inspector_id=1 + i % 2, start_datetime=base + timedelta(days=i),
+                 end_datetime=base + timedelta(days=i, hours=1), destination="Retén",
+                 status="SUBMITTED" if i == 4 else "PENDING_REVIEW", sample_type="Agua")
+        for i in range(5)
+    ]
+    db_session.add_all(creados)
+    db_session.commit()
+    yield {"ids": [s.id for s in creados], "lotes": lotes, "base": base}
+    db_session.query(Sampling).filter(Sampling.id.in_([s.id for s in creados])).delete()
+    db_session.commit()
+
+
+def test_list_samplings_keyset_and_filters(inspector_client: TestClient, muestreos_listado):
+    ids, lotes, base = muestreos_listado["ids"], muestreos_listado["lotes"], muestreos_listado["base"]
+    rango = {"start_from": base.isoformat(), "start_to": (base + timedelta(days=5)).isoformat()}
+
+    vistos, cursor = [], ""
+    while cursor is not None:
+        page = inspector_client.get("/api/inspection/samplings/", params={**rango, "limit": 2, "cursor": cursor}).json()
+        assert len(page["items"]) <= 2
+        vistos += [s["id"] for s in page["items"]]
+        cursor = page["next_cursor"]
+    assert vistos == ids[::-1]  # más recientes primero, sin repetidos ni saltos
+
+    def listar(**params):
+        return [s["id"] for s in inspector_client.get("/api/inspection/samplings/", params={**rango, **params}).json()]
+
+    assert listar(batch_id=lotes[0]) == [ids[4], ids[2], ids[0]]
+    assert listar(inspector_id=2) == [ids[3], ids[1]]
+    assert listar(status_filter="SUBMITTED") == [ids[4]]
+    assert listar(start_to=(base + timedelta(days=2)).isoformat()) == [ids[1], ids[0]]
+    assert listar(limit=2, skip=1) == [ids[3], ids[2]]
+    assert inspector_client.get("/api/inspection/samplings/", params={"cursor": "no-es-un-cursor"}).status_code == 400
+
+
+def test_samplings_summary_follows_transitions(inspector_client: TestClient, db_session: Session):
+    """Los contadores por estado acompañan alta, revisión por lote y envío."""
+    from src.backend.models.dashboard import ContadorDashboard
+    from src.backend.models.dim import PuntoMuestreo
+    from src.backend.models.inspection import Sampling
+    import uuid
+
+    if not db_session.query(PuntoMuestreo).filter_by(punto_muestreo_id=1).first():
+        db_session.add(PuntoMuestreo(punto_muestreo_id=1, codigo="PM-01", nombre="Punto 01", area_id=1))
+        db_session.commit()
+
+    def resumen():
+        return inspector_client.get("/api/inspection/samplings/summary").json()["por_estado"]
+
+    antes = resumen()
+    batch_id = str(uuid.uuid4())
+    start = datetime.now()
+    creados = [
+        inspector_client.post("/api/inspection/samplings/", json={
+            "inspector_id": inspector_client.inspector_id, "start_datetime": start.isoformat(),
+            "end_datetime": (start + timedelta(hours=1)).isoformat(), "sampling_point_id": 1,
+            "destination": "Retén", "batch_id": batch_id,
+        }).json()["id"]
+        for _ in range(3)
+    ]
+
+    def delta():
+        despues = resumen()
+        return {k: despues.get(k, 0) - antes.get(k, 0) for k in ("PENDING_REVIEW", "PENDING_SUBMISSION", "SUBMITTED")}
+
+    assert delta() == {"PENDING_REVIEW": 3, "PENDING_SUBMISSION": 0, "SUBMITTED": 0}
+    assert inspector_client.patch(f"/api/inspection/samplings/batch/{batch_id}/review").status_code == 200
+    assert delta() == {"PENDING_REVIEW": 0, "PENDING_SUBMISSION": 3, "SUBMITTED": 0}
+    inspector_client.post("/api/inspection/samplings/batch-submit", json={"sampling_ids": creados[:2]})
+    assert delta() == {"PENDING_REVIEW": 0, "PENDING_SUBMISSION": 1, "SUBMITTED": 2}
+
+    # Un envío rechazado no mueve los contadores
+    assert inspector_client.post("/api/inspection/samplings/batch-submit",
+                                 json={"sampling_ids": creados}).status_code == 400
+    assert delta() == {"PENDING_REVIEW": 0, "PENDING_SUBMISSION": 1, "SUBMITTED": 2}
+
+    db_session.query(Sampling).filter(Sampling.id.in_(creados)).delete()
+    for status, n in delta().items():
+        db_session.query(ContadorDashboard).filter_by(metrica=f"samplings_estado:{status}").update(
+            {"valor": ContadorDashboard.valor - n})
+    db_session.commit()
+
+
+def _crear_lote(db_session: Session, n: int, status: str = "PENDING_REVIEW"):
+    from src.backend.models.inspection import Sampling
+    import uuid
+
+    batch_id = str(uuid.uuid4())
+    start = datetime(2031, 4, 1, 8, 0)
+    muestreos = [Sampling(batch_id=batch_id, inspector_id=1, start_datetime=start, end_datetime=start + timedelta(hours=1),
+                          destination="Retén", status=status, sample_type="Agua") for _ in range(n)]
+    db_session.add_all(muestreos)
+    db_session.commit()
+    return batch_id, [s.id for s in muestreos]
+
+
+@pytest.fixture
+def contar_updates(engine):
+    sentencias = []
+
+    def _registrar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE SAMPLINGS"):
+            sentencias.append(statement)
+
+    from sqlalchemy import event
+    event.listen(engine, "before_cursor_execute", _registrar)
+    yield sentencias
+    event.remove(engine, "before_cursor_execute", _registrar)
+
+
+def test_review_and_submit_batch_single_conditional_update(inspector_client: TestClient, db_session: Session,
+                                                           contar_updates):
+    from src.backend.models.inspection import Sampling
+
+    batch_id, ids = _crear_lote(db_session, 150)
+    response = inspector_client.patch(f"/api/inspection/samplings/batch/{batch_id}/review")
+    assert response.status_code == 200 and response.json()["count"] == 150
+    assert len(contar_updates) == 1
+
+    # Segunda revisión del mismo lote: ya no quedan filas en PENDING_REVIEW
+    assert inspector_client.patch(f"/api/inspection/samplings/batch/{batch_id}/review").status_code == 404
+
+    contar_updates.clear()
+    response = inspector_client.post("/api/inspection/samplings/batch-submit", json={"sampling_ids": ids + ids[:5]})
+    assert response.status_code == 200 and response.json()["count"] == 150
+    assert len(contar_updates) == 1
+    db_session.expire_all()
+    enviados = db_session.query(Sampling).filter(Sampling.id.in_(ids)).all()
+    assert {(s.status, s.submission_id) for s in enviados} == {("SUBMITTED", response.json()["submission_id"])}
+
+    # Doble envío: el UPDATE condicional no encuentra filas en PENDING_SUBMISSION
+    repetido = inspector_client.post("/api/inspection/samplings/batch-submit", json={"sampling_ids": ids[:3]})
+    assert repetido.status_code == 400 and "SUBMITTED" in repetido.json()["message"]
+    db_session.query(Sampling).filter(Sampling.id.in_(ids)).delete()
+    db_session.commit()
+
+
+def test_review_sampling_is_a_conditional_update(inspector_client: TestClient, db_session: Session, contar_updates):
+    from src.backend.models.dashboard import ContadorDashboard
+    from src.backend.models.inspection import Sampling
+
+    def contador(status):
+        db_session.expire_all()
+        fila = db_session.query(ContadorDashboard).filter_by(metrica=f"samplings_estado:{status}").first()
+        return fila.valor if fila else 0
+
+    _, (sampling_id,) = _crear_lote(db_session, 1)
+    antes = contador("PENDING_REVIEW"), contador("PENDING_SUBMISSION")
+
+    response = inspector_client.patch(f"/api/inspection/samplings/{sampling_id}/review")
+    assert response.status_code == 200
+    assert response.json()["status"] == "PENDING_SUBMISSION"
+    assert response.json()["reviewer_id"] == inspector_client.inspector_id
+    assert len(contar_updates) == 1 and "status" in contar_updates[0].split("WHERE", 1)[1]
+
+    # La segunda revisión no encuentra la fila en PENDING_REVIEW y no vuelve a mover los contadores
+    repetida = inspector_client.patch(f"/api/inspection/samplings/{sampling_id}/review")
+    assert repetida.status_code == 400 and "PENDING_SUBMISSION" in repetida.json()["message"]
+    assert (contador("PENDING_REVIEW"), contador("PENDING_SUBMISSION")) == (antes[0] - 1, antes[1] + 1)
+    assert inspector_client.patch("/api/inspection/samplings/no-existe/review").status_code == 404
+
+    db_session.query(Sampling).filter(Sampling.id == sampling_id).delete()
+    db_session.query(ContadorDashboard).filter_by(metrica="samplings_estado:PENDING_REVIEW").update(
+        {"valor": ContadorDashboard.valor + 1})
+    db_session.query(ContadorDashboard).filter_by(metrica="samplings_estado:PENDING_SUBMISSION").update(
+        {"valor": ContadorDashboard.valor - 1})
+    db_session.commit()
+
+
+def test_batch_submit_is_all_or_nothing(inspector_client: TestClient, db_session: Session):
+    from src.backend.models.inspection import Sampling
+
+    _, listos = _crear_lote(db_session, 3, status="PENDING_SUBMISSION")
+    _, pendientes = _crear_lote(db_session, 1)
+
+    response = inspector_client.post("/api/inspection/samplings/batch-submit", json={"sampling_ids": listos + pendientes})
+    assert response.status_code == 400
+    assert f"El muestreo {pendientes[0]} no está listo" in response.json()["message"]
+    response = inspector_client.post("/api/inspection/samplings/batch-submit", json={"sampling_ids": listos + ["no-existe"]})
+    assert response.status_code == 404 and "no-existe" in response.json()["message"]
+
+    db_session.expire_all()
+    assert {s.status for s in db_session.query(Sampling).filter(Sampling.id.in_(listos))} == {"PENDING_SUBMISSION"}
+    db_session.query(Sampling).filter(Sampling.id.in_(listos + pendientes)).delete()
+    db_session.commit()
+
+
+def test_transition_without_returning(db_session: Session, monkeypatch):
+    """Sin UPDATE ... RETURNING se leen los id y el UPDATE repite la condición de estado."""
+    from src.backend.models.inspection import Sampling
+    from src.backend.repositories.inspection import SamplingRepository
+
+    batch_id, ids = _crear_lote(db_session, 4)
+    monkeypatch.setattr(db_session.get_bind().dialect, "update_returning", False)
+    revisados = SamplingRepository().review_batch(db_session, batch_id, 1, datetime.now())
+    assert sorted(revisados) == sorted(ids)
+    assert SamplingRepository().review_batch(db_session, batch_id, 1, datetime.now()) == []
+    db_session.query(Sampling).filter(Sampling.id.in_(ids)).delete()
+    db_session.commit()
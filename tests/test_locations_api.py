@@ -108,3 +108,57 @@ def test_locations_requires_auth(client):
     """Los endpoints protegidos retornan 401 sin token JWT."""
     response = client.get("/api/ubicaciones/plantas")
     assert response.status_code == 401
+
+
+def test_list_plantas_cursor_pagination(auth_client):
+    """Con ?cursor= la respuesta es {items, next_cursor} y recorre todas las plantas sin repetir."""
+    for n in range(900, 903):
+        auth_client.post("/api/ubicaciones/plantas", json=_planta_payload(n))
+    legacy = auth_client.get("/api/ubicaciones/plantas", params={"limit": 1000}).json()
+    assert isinstance(legacy, list)
+
+    ids, cursor = [], ""
+    while cursor is not None:
+        body = auth_client.get("/api/ubicaciones/plantas", params={"limit": 2, "cursor": cursor}).json()
+        assert len(body["items"]) <= 2
+        ids.extend(p["planta_id"] for p in body["items"])
+        cursor = body["next_cursor"]
+    assert ids == sorted(p["planta_id"] for p in legacy)
+
+    response = auth_client.get("/api/ubicaciones/plantas", params={"cursor": "%%%"})
+    assert response.status_code == 400
+
+
+def test_list_areas_projection_matches_orm(auth_client, db_session):
+    """El listado por proyección devuelve lo mismo que serializar las instancias ORM."""
+    from src.backend.api.schemas.dim import AreaResponse
+    from src.backend.models.dim import Area, ZonaArea
+    from src.backend.repositories.dim import AreaRepository
+
+    areas = [Area(codigo=f"PRJ-{n}", nombre=f"Área proyección {n}", planta_id=1) for n in range(3)]
+    db_session.add_all(areas)
+    db_session.flush()
+    db_session.add_all([ZonaArea(area_id=areas[0].area_id, nombre="Pared"),
+                        ZonaArea(area_id=areas[0].area_id, nombre="Piso", activo=False),
+                        ZonaArea(area_id=areas[2].area_id, nombre="Techo")])
+    db_session.commit()
+
+    try:
+        data = auth_client.get("/api/ubicaciones/areas").json()
+        db_session.expire_all()
+        propias = [a for a in data if (a["codigo"] or "").startswith("PRJ-")]
+        esperado = [AreaResponse.model_validate(a).model_dump(mode="json")
+                    for a in AreaRepository().get_all(db_session, limit=5000) if a in areas]
+        assert propias == esperado
+        assert [len(a["zonas"]) for a in propias] == [2, 0, 1]
+
+        ids, cursor = [], ""
+        while cursor is not None:
+            body = auth_client.get("/api/ubicaciones/areas", params={"limit": 2, "cursor": cursor}).json()
+            ids.extend(a["area_id"] for a in body["items"])
+            cursor = body["next_cursor"]
+        assert ids == sorted(a["area_id"] for a in data)
+    finally:
+        db_session.query(ZonaArea).filter(ZonaArea.area_id.in_([a.area_id for a in areas])).delete()
+        db_session.query(Area).filter(Area.codigo.like("PRJ-%")).delete(synchronize_session=False)
+        db_session.commit()
@@ -54,3 +54,16 @@ def test_get_catalogs_includes_tipos_solicitud(auth_client, seed_data):
     data = response.json()
     assert "tipos_solicitud" in data
     assert len(data["tipos_solicitud"]) >= 9
+
+def test_get_catalogs_cached_until_catalog_write(auth_client, seed_data):
+    """El catálogo se sirve con ETag y se invalida al crear un tipo de solicitud"""
+    first = auth_client.get("/api/master/catalogos")
+    etag = first.headers["ETag"]
+    assert auth_client.get("/api/master/catalogos", headers={"If-None-Match": etag}).status_code == status.HTTP_304_NOT_MODIFIED
+
+    payload = {"codigo": "TIPO_CACHE", "descripcion": "Invalida cache", "activo": True}
+    assert auth_client.post("/api/master/tipos-solicitud", json=payload).status_code == status.HTTP_201_CREATED
+
+    response = auth_client.get("/api/master/catalogos", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert "TIPO_CACHE" in [t["codigo"] for t in response.json()["tipos_solicitud"]]
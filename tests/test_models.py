@@ -23,3 +23,33 @@ def test_base_metadata_count():
     """Verify that the number of tables in metadata is correct."""
     # Based on the previous analysis, there should be around 48 tables.
     assert len(Base.metadata.tables) >= 48
+
+def test_fk_and_filter_indexes_exist(engine):
+    """Índices de FKs y filtros frecuentes (migración c7e2a4f19d83)."""
+    inspector = inspect(engine)
+    expected = {
+        "analisis": ["muestra_id", "analisis_id"],
+        "resultado": ["analisis_id", "resultado_id"],
+        "envio_muestra": ["muestra_id", "envio_muestra_id"],
+        "recepcion": ["envio_muestra_id", "recepcion_id"],
+        "samplings": ["batch_id", "status"],
+        "audit_logs": ["tabla_nombre", "registro_id"],
+    }
+    for table, columns in expected.items():
+        indexed = [ix["column_names"] for ix in inspector.get_indexes(table)]
+        assert columns in indexed, f"Falta índice {columns} en {table}"
+
+def test_report_queries_use_indexes(engine):
+    """Las consultas por FK del reporte de análisis no recorren tablas completas."""
+    from scripts.index_advisor import full_scans, statement_aliases
+
+    statement = (
+        "SELECT analisis.analisis_id FROM analisis JOIN resultado AS r ON r.analisis_id = analisis.analisis_id "
+        "WHERE analisis.muestra_id IN (1, 2) ORDER BY analisis.muestra_id, analisis.analisis_id"
+    )
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}").fetchall()
+        assert full_scans(plan, statement_aliases(statement)) == []
+
+        plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN SELECT * FROM operario AS o WHERE o.apellido = 'x'").fetchall()
+        assert full_scans(plan, {"o": "operario"}) == ["operario"]
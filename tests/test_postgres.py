@@ -0,0 +1,77 @@
+"""
+Soporte PostgreSQL: opciones de motor, migraciones renderizadas para el
+dialecto y, si hay una base descartable en ``LIMS_TEST_POSTGRES_URL``,
+migraciones contra un servidor real.
+"""
+import io
+import os
+
+import pytest
+from alembic import command
+from alembic.config import Config
+
+from src.backend.database.db_manager import DB_POOL_SIZE, async_url, connect_args, engine_options
+
+PG_URL = os.getenv("LIMS_TEST_POSTGRES_URL")
+
+
+def _alembic_config(url: str, buffer=None) -> Config:
+    # Sin alembic.ini: no reconfigura el logging ni apunta a lab_dev.db
+    config = Config(output_buffer=buffer)
+    config.set_main_option("script_location", "alembic")
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def test_engine_options_by_dialect():
+    assert engine_options("sqlite:///./x.db") == {"connect_args": {"check_same_thread": False}}
+
+    options = engine_options("postgresql+psycopg2://lims:pw@db/lims")
+    assert options["pool_size"] == DB_POOL_SIZE and options["pool_pre_ping"]
+    assert "check_same_thread" not in options["connect_args"]
+    assert options["connect_args"]["application_name"] == "lims-backend"
+
+    assert "server_settings" in connect_args("postgresql+asyncpg://lims@db/lims")
+    assert async_url("postgresql://lims:pw@db/lims") == "postgresql+asyncpg://lims:pw@db/lims"
+    assert async_url("sqlite:///./lab.db") == "sqlite+aiosqlite:///./lab.db"
+
+
+def test_migrations_render_for_postgres():
+    buffer = io.StringIO()
+    command.upgrade(_alembic_config("postgresql://lims@localhost/lims", buffer), "head", sql=True)
+    sql = buffer.getvalue()
+    # Una base nueva queda completa solo con migraciones
+    for table in ("audit_logs", "documento", "uso_material_manufactura", "contador_dashboard"):
+        assert f"CREATE TABLE {table} " in sql
+    assert "CREATE INDEX idx_analisis_muestra ON analisis (muestra_id, analisis_id)" in sql
+    assert "_alembic_tmp" not in sql
+
+
+@pytest.mark.skipif(not PG_URL, reason="LIMS_TEST_POSTGRES_URL no configurada")
+def test_postgres_migrations_match_models():
+    from alembic.autogenerate import compare_metadata
+    from alembic.migration import MigrationContext
+    from sqlalchemy import MetaData, create_engine
+
+    from src.backend.models.base import Base
+    import src.backend.models  # noqa: F401
+    import src.backend.models.audit  # noqa: F401
+
+    config = _alembic_config(PG_URL)
+    engine = create_engine(PG_URL, **engine_options(PG_URL))
+    with engine.connect() as conn:
+        inicial = MigrationContext.configure(conn).get_current_revision()
+    try:
+        command.upgrade(config, "head")
+        with engine.connect() as conn:
+            assert compare_metadata(MigrationContext.configure(conn), Base.metadata) == []
+    finally:
+        if inicial is not None:
+            command.downgrade(config, inicial)
+        else:
+            # La migración base no es reversible en PostgreSQL (borra FKs sin nombre):
+            # una base que empezó vacía se deja vacía borrando lo creado
+            creadas = MetaData()
+            creadas.reflect(engine)
+            creadas.drop_all(engine)
+        engine.dispose()
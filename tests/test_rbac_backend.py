@@ -80,3 +80,93 @@ def test_supervisor_cannot_delete_producto(supervisor_client):
     # Delete usually requires admin
     response = supervisor_client.delete("/api/productos/1")
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+def test_principal_cache_hits_and_invalidation(db_session):
+    from tests.conftest import _create_test_user_with_role
+    from src.backend.api.security import create_access_token, get_current_user, get_user_roles
+    from src.backend.core.principal_cache import principal_cache
+    from src.backend.models.auth import Rol
+    from src.backend.repositories.auth import UsuarioRepository
+
+    user = _create_test_user_with_role(db_session, "operador")
+    token = create_access_token({"sub": str(user.usuario_id)})
+    principal_cache.invalidate()
+
+    misses, hits = principal_cache.misses, principal_cache.hits
+    first = get_current_user(token, db_session)
+    second = get_current_user(token, db_session)
+    assert second is first
+    assert principal_cache.misses == misses + 1
+    assert principal_cache.hits == hits + 1
+    assert get_user_roles(second) == ["operador"]
+
+    # sync_roles invalida la entrada: la próxima resolución ve los roles nuevos
+    supervisor = db_session.query(Rol).filter(Rol.nombre == "supervisor").first()
+    if not supervisor:
+        supervisor = Rol(nombre="supervisor")
+        db_session.add(supervisor)
+        db_session.commit()
+    repo = UsuarioRepository()
+    repo.sync_roles(db_session, user.usuario_id, [supervisor.rol_id])
+    assert get_user_roles(get_current_user(token, db_session)) == ["supervisor"]
+
+    operador = db_session.query(Rol).filter(Rol.nombre == "operador").first()
+    repo.sync_roles(db_session, user.usuario_id, [operador.rol_id])
+
+def test_principal_cache_invalidated_after_commit(db_session):
+    from tests.conftest import _create_test_user_with_role
+    from src.backend.api.security import create_access_token, get_current_user
+    from sqlalchemy import func
+    from src.backend.core.principal_cache import principal_cache
+    from src.backend.database.unit_of_work import unit_of_work
+    from src.backend.models.audit import AuditLog
+    from src.backend.repositories.auth import UsuarioRepository
+
+    ultimo_audit = db_session.query(func.max(AuditLog.audit_log_id)).scalar() or 0
+    user = _create_test_user_with_role(db_session, "operador")
+    token = create_access_token({"sub": str(user.usuario_id)})
+    get_current_user(token, db_session)
+    repo = UsuarioRepository()
+
+    # Revertida: el cache conserva la entrada
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db_session):
+            repo.update(db_session, repo.get(db_session, user.usuario_id), {"firma": "rollback"})
+            raise RuntimeError("abortar")
+    assert principal_cache.get(user.usuario_id) is not None
+
+    # Confirmada: la entrada sigue hasta el commit y se descarta después
+    with unit_of_work(db_session):
+        repo.update(db_session, repo.get(db_session, user.usuario_id), {"firma": "commit"})
+        assert principal_cache.get(user.usuario_id) is not None
+    assert principal_cache.get(user.usuario_id) is None
+    assert get_current_user(token, db_session).firma == "commit"
+
+    db_session.query(AuditLog).filter(AuditLog.audit_log_id > ultimo_audit).delete()
+    db_session.commit()
+
+
+def test_assign_role_invalidates_principal_cache(db_session, auth_client):
+    from tests.conftest import _create_test_user_with_role
+    from src.backend.api.security import create_access_token, get_current_user, get_user_roles
+    from src.backend.models.auth import Rol, UsuarioRol
+    from src.backend.repositories.auth import UsuarioRolRepository
+
+    user = _create_test_user_with_role(db_session, "operador")
+    token = create_access_token({"sub": str(user.usuario_id)})
+    assert get_user_roles(get_current_user(token, db_session)) == ["operador"]
+
+    supervisor = db_session.query(Rol).filter(Rol.nombre == "supervisor").first()
+    if not supervisor:
+        supervisor = Rol(nombre="supervisor")
+        db_session.add(supervisor)
+        db_session.commit()
+    response = auth_client.post("/api/auth/usuarios-roles", json={"usuario_id": user.usuario_id, "rol_id": supervisor.rol_id})
+    assert response.status_code == status.HTTP_201_CREATED
+    db_session.expire_all()
+    assert sorted(get_user_roles(get_current_user(token, db_session))) == ["operador", "supervisor"]
+
+    UsuarioRolRepository().delete(db_session, response.json()["usuario_rol_id"])
+    db_session.expire_all()
+    assert get_user_roles(get_current_user(token, db_session)) == ["operador"]
+    assert db_session.query(UsuarioRol).filter(UsuarioRol.usuario_id == user.usuario_id).count() == 1
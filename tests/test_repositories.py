@@ -51,3 +51,336 @@ def test_usuario_repository_delete(db_session):
     
     assert repo.delete(db_session, user_id) is True
     assert repo.get(db_session, user_id) is None
+
+def test_unit_of_work_single_commit_with_audit(db_session):
+    from sqlalchemy import event
+    from src.backend.database.unit_of_work import unit_of_work
+    from src.backend.models.audit import AuditLog
+
+    commits = []
+    def _count_commit(session):
+        commits.append(1)
+
+    event.listen(db_session, "after_commit", _count_commit)
+    repo = SistemaRepository()
+    try:
+        with unit_of_work(db_session):
+            s1 = repo.create(db_session, {"codigo": "UOW-1", "nombre": "UoW 1"})
+            s2 = repo.create(db_session, {"codigo": "UOW-2", "nombre": "UoW 2"})
+            repo.update(db_session, s1, {"nombre": "UoW 1 bis"})
+    finally:
+        event.remove(db_session, "after_commit", _count_commit)
+
+    assert len(commits) == 1
+    audits = db_session.query(AuditLog).filter(
+        AuditLog.tabla_nombre == "sistema",
+        AuditLog.registro_id.in_([s1.sistema_id, s2.sistema_id])
+    ).all()
+    assert sorted(a.operacion for a in audits) == ["INSERT", "INSERT", "UPDATE"]
+
+def test_unit_of_work_rollback_is_atomic(db_session):
+    from src.backend.database.unit_of_work import unit_of_work
+    from src.backend.models.audit import AuditLog
+
+    repo = SistemaRepository()
+    audits_antes = db_session.query(AuditLog).count()
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db_session):
+            repo.create(db_session, {"codigo": "UOW-ROLLBACK", "nombre": "No persiste"})
+            raise RuntimeError("fallo en medio del flujo")
+
+    assert db_session.query(Sistema).filter_by(codigo="UOW-ROLLBACK").first() is None
+    assert db_session.query(AuditLog).count() == audits_antes
+
+def test_bulk_create_returns_ids_and_batched_audit(db_session):
+    from src.backend.models.audit import AuditLog
+
+    repo = SistemaRepository()
+    rows = [{"codigo": f"BULK-{i}", "nombre": f"Bulk {i}"} for i in range(5)]
+    ids = repo.bulk_create(db_session, rows, usuario_id=None, batch_size=2)
+
+    assert len(ids) == 5
+    creados = {s.sistema_id: s.codigo for s in db_session.query(Sistema).filter(Sistema.sistema_id.in_(ids))}
+    assert [creados[i] for i in ids] == [r["codigo"] for r in rows]
+    audits = db_session.query(AuditLog).filter(
+        AuditLog.tabla_nombre == "sistema", AuditLog.registro_id.in_(ids)
+    ).all()
+    assert len(audits) == 5
+    assert all(a.operacion == "INSERT" for a in audits)
+
+def test_bulk_upsert_updates_existing_and_inserts_new(db_session):
+    from src.backend.models.audit import AuditLog
+
+    repo = SistemaRepository()
+    existente = repo.create(db_session, {"codigo": "UPS-1", "nombre": "Original"})
+    ids = repo.bulk_upsert(db_session, [
+        {"codigo": "UPS-1", "nombre": "Actualizado"},
+        {"codigo": "UPS-2", "nombre": "Nuevo"},
+    ], key="codigo")
+
+    assert ids[0] == existente.sistema_id
+    db_session.expire_all()
+    assert repo.get(db_session, existente.sistema_id).nombre == "Actualizado"
+    assert db_session.query(Sistema).filter_by(codigo="UPS-2").one().sistema_id == ids[1]
+    update_audit = db_session.query(AuditLog).filter_by(
+        tabla_nombre="sistema", registro_id=existente.sistema_id, operacion="UPDATE"
+    ).one()
+    assert update_audit.valor_anterior["nombre"] == "Original"
+    assert update_audit.valor_nuevo["nombre"] == "Actualizado"
+
+
+def test_bulk_upsert_on_conflict_is_one_statement_per_batch(engine, db_session):
+    from sqlalchemy import event
+    from src.backend.models.audit import AuditLog
+
+    repo = SistemaRepository()
+    existentes = repo.bulk_create(db_session, [{"codigo": f"UPB-{i}", "nombre": "Original"} for i in range(0, 500, 2)])
+    rows = [{"codigo": f"UPB-{i}", "nombre": f"Upsert {i}"} for i in range(500)]
+
+    upserts = []
+
+    def _contar(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO sistema") and "ON CONFLICT" in statement:
+            upserts.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _contar)
+    try:
+        ids = repo.bulk_upsert(db_session, rows, key="codigo")
+    finally:
+        event.remove(engine, "before_cursor_execute", _contar)
+
+    assert len(upserts) == 1
+    assert ids[0:500:2] == existentes
+    db_session.expire_all()
+    por_id = {s.sistema_id: s.codigo for s in db_session.query(Sistema).filter(Sistema.sistema_id.in_(ids))}
+    assert [por_id[i] for i in ids] == [row["codigo"] for row in rows]
+
+    db_session.query(AuditLog).filter(AuditLog.tabla_nombre == "sistema", AuditLog.registro_id.in_(ids)).delete()
+    db_session.query(Sistema).filter(Sistema.sistema_id.in_(ids)).delete()
+    db_session.commit()
+
+
+def test_bulk_upsert_collapses_repeated_keys_in_batch(engine, db_session):
+    from sqlalchemy import event
+    from src.backend.models.audit import AuditLog
+
+    repo = SistemaRepository()
+    existente = repo.create(db_session, {"codigo": "UPD-1", "nombre": "Original"})
+    rows = [
+        {"codigo": "UPD-1", "nombre": "Primero"},
+        {"codigo": "UPD-2", "nombre": "Nuevo"},
+        {"codigo": "UPD-1", "nombre": "Último"},
+        {"codigo": "UPD-2", "nombre": "Nuevo bis"},
+    ]
+
+    parametros = []
+
+    def _capturar(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO sistema") and "ON CONFLICT" in statement:
+            parametros.extend(p for p in parameters if isinstance(p, str) and p.startswith("UPD-"))
+
+    event.listen(engine, "before_cursor_execute", _capturar)
+    try:
+        ids = repo.bulk_upsert(db_session, rows, key="codigo")
+    finally:
+        event.remove(engine, "before_cursor_execute", _capturar)
+
+    # PostgreSQL rechaza un ON CONFLICT que toca la misma fila dos veces
+    assert sorted(parametros) == ["UPD-1", "UPD-2"]
+    assert ids[0] == ids[2] == existente.sistema_id
+    assert ids[1] == ids[3] != existente.sistema_id
+    db_session.expire_all()
+    assert repo.get(db_session, ids[0]).nombre == "Último"
+    assert repo.get(db_session, ids[1]).nombre == "Nuevo bis"
+
+    audits = db_session.query(AuditLog).filter(
+        AuditLog.tabla_nombre == "sistema", AuditLog.registro_id.in_(ids[:2]),
+        AuditLog.operacion.in_(["INSERT", "UPDATE"]),
+    ).all()
+    assert sorted((a.registro_id, a.operacion) for a in audits) == sorted([
+        (existente.sistema_id, "INSERT"), (existente.sistema_id, "UPDATE"), (ids[1], "INSERT"),
+    ])
+
+    db_session.query(AuditLog).filter(AuditLog.tabla_nombre == "sistema", AuditLog.registro_id.in_(ids[:2])).delete()
+    db_session.query(Sistema).filter(Sistema.sistema_id.in_(ids[:2])).delete()
+    db_session.commit()
+
+
+def _audit_events(tabla, n):
+    from datetime import datetime, timezone
+    return [
+        {"tabla_nombre": tabla, "registro_id": i, "operacion": "UPDATE",
+         "valor_anterior": {"v": i}, "valor_nuevo": {"v": i + 1},
+         "usuario_id": None, "fecha": datetime.now(timezone.utc)}
+        for i in range(n)
+    ]
+
+
+def test_audit_writer_persists_batches_in_order(engine, db_session, tmp_path):
+    from sqlalchemy.orm import sessionmaker
+    from src.backend.core.audit_writer import AuditWriter
+    from src.backend.models.audit import AuditLog
+
+    writer = AuditWriter(sessionmaker(bind=engine), journal_path=str(tmp_path / "audit.jsonl"),
+                         batch_size=50, flush_interval_ms=20, ack="db")
+    writer.start()
+    try:
+        writer.submit(_audit_events("writer_test", 120))
+        # ack=db: al retornar submit los eventos ya están en la base
+        ids = [r.registro_id for r in db_session.query(AuditLog)
+               .filter(AuditLog.tabla_nombre == "writer_test").order_by(AuditLog.audit_log_id)]
+        assert ids == list(range(120))
+    finally:
+        writer.stop()
+    assert list(tmp_path.iterdir()) == []
+    db_session.query(AuditLog).filter(AuditLog.tabla_nombre == "writer_test").delete()
+    db_session.commit()
+
+
+def _write_journal(path, events):
+    import json
+    with open(path, "w") as f:
+        for seq, event in enumerate(events, start=1):
+            f.write(json.dumps({**event, "seq": seq, "fecha": event["fecha"].isoformat()}) + "\n")
+
+
+def test_audit_writer_recovers_journal(engine, db_session, tmp_path):
+    from sqlalchemy.orm import sessionmaker
+    from src.backend.core.audit_writer import AuditWriter, _try_lock
+    from src.backend.models.audit import AuditLog
+
+    # Worker terminado: su journal no está bloqueado y se recupera desde el checkpoint
+    muerto = tmp_path / "audit.999999.jsonl"
+    _write_journal(muerto, _audit_events("writer_recover", 5))
+    with open(muerto, "a") as f:
+        f.write('{"tabla_nombre": "writer_rec')  # línea truncada por un crash
+    (tmp_path / "audit.999999.jsonl.ckpt").write_text("2")
+
+    # Worker vivo: mantiene el lock de su journal, recover() no lo toca
+    vivo = tmp_path / "audit.888888.jsonl"
+    _write_journal(vivo, _audit_events("writer_live", 2))
+    with open(vivo, "a") as lock:
+        assert _try_lock(lock)
+        writer = AuditWriter(sessionmaker(bind=engine), journal_path=str(tmp_path / "audit.jsonl"))
+        assert writer.recover() == 3
+        assert vivo.exists()
+
+    db_session.expire_all()
+    assert db_session.query(AuditLog).filter(AuditLog.tabla_nombre == "writer_recover").count() == 3
+    assert db_session.query(AuditLog).filter(AuditLog.tabla_nombre == "writer_live").count() == 0
+    assert not muerto.exists() and not (tmp_path / "audit.999999.jsonl.ckpt").exists()
+    db_session.query(AuditLog).filter(AuditLog.tabla_nombre == "writer_recover").delete()
+    db_session.commit()
+
+
+def test_audit_writer_journal_is_per_process(engine, tmp_path):
+    import os
+    from sqlalchemy.orm import sessionmaker
+    from src.backend.core.audit_writer import AuditWriter
+
+    writer = AuditWriter(sessionmaker(bind=engine), journal_path=str(tmp_path / "audit.jsonl"))
+    writer.start()
+    try:
+        assert writer.journal_path == str(tmp_path / f"audit.{os.getpid()}.jsonl")
+        # Un segundo escritor sobre el mismo journal (mismo pid) no puede tomarlo
+        otro = AuditWriter(sessionmaker(bind=engine), journal_path=str(tmp_path / "audit.jsonl"))
+        with pytest.raises(RuntimeError):
+            otro.start()
+    finally:
+        writer.stop()
+
+
+def test_async_audit_is_journaled_before_commit(engine, db_session, tmp_path, monkeypatch):
+    import json
+    import os
+    from sqlalchemy import event
+    from sqlalchemy.orm import sessionmaker
+    from src.backend.core.audit_writer import AuditWriter
+    from src.backend.database import unit_of_work as uow
+    from src.backend.models.audit import AuditLog
+
+    writer = AuditWriter(sessionmaker(bind=engine), journal_path=str(tmp_path / "audit.jsonl"),
+                         flush_interval_ms=20, ack="db")
+    writer.start()
+    journal = tmp_path / os.path.basename(writer.journal_path)
+    monkeypatch.setattr(uow, "get_audit_writer", lambda: writer)
+
+    en_journal = []
+
+    def _antes_del_commit(session):
+        en_journal.append([json.loads(l) for l in journal.read_text().splitlines()])
+
+    event.listen(db_session, "before_commit", _antes_del_commit)
+    try:
+        sistema = SistemaRepository().create(db_session, {"codigo": "AJ-1", "nombre": "Journal"})
+        # El evento ya estaba en disco cuando se confirmó el cambio
+        assert [(e["tabla_nombre"], e["registro_id"]) for e in en_journal[-1]] == [("sistema", sistema.sistema_id)]
+        assert db_session.query(AuditLog).filter(AuditLog.tabla_nombre == "sistema",
+                                                 AuditLog.registro_id == sistema.sistema_id).count() == 1
+
+        # Si el commit falla, el evento queda descartado en el journal
+        def _falla(session):
+            raise RuntimeError("commit fallido")
+
+        event.listen(db_session, "before_commit", _falla)
+        try:
+            with pytest.raises(RuntimeError):
+                SistemaRepository().create(db_session, {"codigo": "AJ-2", "nombre": "Journal"})
+        finally:
+            event.remove(db_session, "before_commit", _falla)
+        db_session.rollback()
+        assert json.loads(journal.read_text().splitlines()[-1]) == {"abort": [2]}
+    finally:
+        event.remove(db_session, "before_commit", _antes_del_commit)
+        writer.stop()
+
+    assert writer.recover() == 0
+    assert db_session.query(Sistema).filter(Sistema.codigo == "AJ-2").count() == 0
+    db_session.query(AuditLog).filter(AuditLog.tabla_nombre == "sistema",
+                                      AuditLog.registro_id == sistema.sistema_id).delete()
+    db_session.query(Sistema).filter(Sistema.sistema_id == sistema.sistema_id).delete()
+    db_session.commit()
+
+
+def test_async_audit_journal_failure_aborts_change(engine, db_session, tmp_path, monkeypatch):
+    from sqlalchemy.orm import sessionmaker
+    from src.backend.core.audit_writer import AuditWriter
+    from src.backend.database import unit_of_work as uow
+
+    writer = AuditWriter(sessionmaker(bind=engine), journal_path=str(tmp_path / "audit.jsonl"))
+
+    def _disco_lleno(events):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(writer, "journal", _disco_lleno)
+    monkeypatch.setattr(uow, "get_audit_writer", lambda: writer)
+
+    with pytest.raises(OSError):
+        SistemaRepository().create(db_session, {"codigo": "AJ-3", "nombre": "Sin journal"})
+    db_session.rollback()
+    assert db_session.query(Sistema).filter(Sistema.codigo == "AJ-3").count() == 0
+
+
+def test_get_page_walks_keyset_pages(db_session):
+    from src.backend.core.exceptions import InvalidCursorException
+    repo = SistemaRepository()
+    ids = repo.bulk_create(db_session, [{"codigo": f"KS-{i}", "nombre": f"Keyset {i % 2}"} for i in range(5)])
+
+    vistos, cursor = [], None
+    while True:
+        page, cursor = repo.get_page(db_session, cursor=cursor, limit=2, filters={"activo": True})
+        vistos.extend(s.sistema_id for s in page if s.sistema_id in ids)
+        if cursor is None:
+            break
+    assert vistos == sorted(ids)
+
+    # Orden por otra columna con la PK como desempate
+    page, cursor = repo.get_page(db_session, limit=100, order_by="nombre", descending=True)
+    propios = [(s.nombre, s.sistema_id) for s in page if s.sistema_id in ids]
+    assert propios == sorted(propios, key=lambda t: (t[0], t[1]), reverse=True)
+
+    with pytest.raises(InvalidCursorException):
+        repo.get_page(db_session, cursor="no-es-un-cursor")
+
+    db_session.query(Sistema).filter(Sistema.sistema_id.in_(ids)).delete()
+    db_session.commit()
@@ -22,3 +22,32 @@ def test_auth_service_create_usuario(db_session):
     assert len(audits) >= 1
     assert audits[-1].tabla_nombre == "usuario"
     assert audits[-1].usuario_id == admin.usuario_id
+
+
+def test_analysis_report_query_count_is_constant():
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from src.backend.models.base import Base
+    from src.backend.api.dependencies import get_analysis_service
+    from scripts.bench_analysis_report import seed_report_tree
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(1))
+    Session = sessionmaker(bind=engine)
+    service = get_analysis_service()
+
+    counts = []
+    for n_muestras, n_analisis in [(1, 1), (6, 4)]:
+        with Session() as db:
+            sol_id = seed_report_tree(db, n_muestras, n_analisis)
+        with Session() as db:
+            queries.clear()
+            report = service.get_analysis_report(db, sol_id)
+            counts.append(len(queries))
+            assert len(report["muestras"]) == n_muestras
+            assert len(report["resultados"]) == n_muestras * n_analisis
+            assert [r.analisis_id for r in report["resultados"]] == [a.analisis_id for a in report["analisis"]]
+
+    assert counts[0] == counts[1]